@@ -43,12 +43,14 @@ from library import (
 )
 from steps.cut import save_clip
 from steps.subtitle import build_srt_for_range
-from steps.render import render_vertical_with_captions
+from steps.render import is_proxy_render, promote_proxy_render, render_vertical_with_captions
+from steps.rendering import load_sprite_index, thumbnail_paths
 from layouts import LayoutNotFoundError, load_layout
 from helpers.description import maybe_append_website_link
 from common.caption_utils import prepare_hashtags
 from helpers.hashtags import generate_hashtag_strings
 from helpers.formatting import youtube_timestamp_url
+from helpers.whisper_models import warm_whisper_model
 from auth.accounts import (
     AccountCreateRequest,
     AccountResponse,
@@ -86,6 +88,22 @@ app.include_router(clips_router, prefix="/api")
 register_clip_legacy_routes(app)
 
 
+@app.on_event("startup")
+def _warm_whisper_model() -> None:
+    """Load the configured Whisper model in the background when enabled."""
+
+    if not pipeline_config.WHISPER_WARM_ON_START:
+        return
+
+    def _warm() -> None:
+        try:
+            warm_whisper_model(pipeline_config.WHISPER_MODEL)
+        except Exception:  # pragma: no cover - the first job loads it instead
+            logger.exception("Failed to warm Whisper model %s", pipeline_config.WHISPER_MODEL)
+
+    threading.Thread(target=_warm, name="whisper-warmup", daemon=True).start()
+
+
 _config_all = list(getattr(pipeline_config, "__all__", []))
 _CONFIG_DATACLASS_NAMES = {
     name for name in _config_all if is_dataclass(getattr(pipeline_config, name, None))
@@ -465,6 +483,7 @@ class ClipManifest(BaseModel):
     original_end_seconds: float = Field(..., ge=0)
     has_adjustments: bool = False
     layout_id: str | None = None
+    sprites_url: str | None = None
 
 
 class LibraryClipManifest(ClipManifest):
@@ -511,6 +530,9 @@ def _clip_to_payload(clip: ClipArtifact, request: Request, job_id: str) -> Dict[
         "original_end_seconds": clip.original_end_seconds,
         "has_adjustments": has_adjustments,
         "layout_id": clip.layout_id,
+        "sprites_url": str(
+            request.url_for("get_job_clip_sprites", job_id=job_id, clip_id=clip.clip_id)
+        ),
     }
 
 
@@ -867,7 +889,9 @@ def _apply_clip_adjustment(
     clips_dir = project_dir / "clips"
     subtitles_dir = project_dir / "subtitles"
     shorts_dir = project_dir / "shorts"
-    clips_dir.mkdir(parents=True, exist_ok=True)
+    save_intermediate = bool(pipeline_config.SAVE_INTERMEDIATE_CLIPS)
+    if save_intermediate:
+        clips_dir.mkdir(parents=True, exist_ok=True)
     subtitles_dir.mkdir(parents=True, exist_ok=True)
     shorts_dir.mkdir(parents=True, exist_ok=True)
 
@@ -876,18 +900,25 @@ def _apply_clip_adjustment(
     vertical_path = shorts_dir / f"{stem}.mp4"
     description_path = shorts_dir / f"{stem}.txt"
 
-    ok = save_clip(
-        source_video,
-        raw_clip_path,
-        start=start_seconds,
-        end=end_seconds,
-        reencode=True,
-    )
-    if not ok:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to cut clip with the requested boundaries.",
+    if save_intermediate:
+        ok = save_clip(
+            source_video,
+            raw_clip_path,
+            start=start_seconds,
+            end=end_seconds,
+            reencode=True,
         )
+        if not ok:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to cut clip with the requested boundaries.",
+            )
+        render_kwargs: dict[str, Any] = {}
+        render_source = raw_clip_path
+    else:
+        # Render the adjusted range straight from the project video.
+        render_kwargs = {"source_start": start_seconds, "source_end": end_seconds}
+        render_source = source_video
 
     try:
         build_srt_for_range(
@@ -909,12 +940,16 @@ def _apply_clip_adjustment(
     except LayoutNotFoundError:
         layout_definition = load_layout("default")
 
+    # Clips still under review stay proxies until they are promoted
+    render_kwargs["proxy"] = is_proxy_render(vertical_path)
+    render_kwargs["thumbnails"] = pipeline_config.RENDER_THUMBNAILS
     try:
         render_vertical_with_captions(
-            raw_clip_path,
+            render_source,
             subtitle_path,
             vertical_path,
             layout=layout_definition,
+            **render_kwargs,
         )
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Failed to render adjusted clip %s", stem, exc_info=exc)
@@ -1041,6 +1076,18 @@ def _generate_preview_clip(
             detail="Preview range must be greater than zero.",
         )
 
+    # The sprite index written by the renderer records the short's duration;
+    # a range spanning all of it is the short itself, so nothing is cut
+    sprite_index = load_sprite_index(short_video)
+    if sprite_index is not None:
+        try:
+            duration = float(sprite_index["duration"])
+        except (KeyError, TypeError, ValueError):
+            duration = math.nan
+        # Offsets are rounded to milliseconds; allow about a frame of slack
+        if start_value <= 0.05 and end_value >= duration - 0.05:
+            return short_video
+
     preview_dir = project_dir / "previews"
     preview_dir.mkdir(parents=True, exist_ok=True)
 
@@ -1312,14 +1359,8 @@ async def get_job_clip_video(job_id: str, clip_id: str) -> FileResponse:
     return FileResponse(path=video_path, media_type="video/mp4", filename=video_path.name)
 
 
-@app.get("/api/jobs/{job_id}/clips/{clip_id}/preview")
-async def get_job_clip_preview(
-    job_id: str,
-    clip_id: str,
-    start: float | None = Query(default=None, ge=0.0),
-    end: float | None = Query(default=None, ge=0.0),
-) -> FileResponse:
-    """Stream a lightweight preview of the clip derived from its rendered short."""
+def _job_clip(job_id: str, clip_id: str) -> tuple[Path, ClipArtifact]:
+    """Return the project directory and artifact for a job clip."""
 
     state = _get_job(job_id)
     if state is None:
@@ -1340,6 +1381,19 @@ async def get_job_clip_preview(
             clip_project_dir.relative_to(project_dir)
         except ValueError:
             project_dir = clip_project_dir
+    return project_dir, clip
+
+
+@app.get("/api/jobs/{job_id}/clips/{clip_id}/preview")
+async def get_job_clip_preview(
+    job_id: str,
+    clip_id: str,
+    start: float | None = Query(default=None, ge=0.0),
+    end: float | None = Query(default=None, ge=0.0),
+) -> FileResponse:
+    """Stream a lightweight preview of the clip derived from its rendered short."""
+
+    project_dir, clip = _job_clip(job_id, clip_id)
 
     clip_start = float(clip.start_seconds)
     clip_end = float(clip.end_seconds)
@@ -1368,6 +1422,44 @@ async def get_job_clip_preview(
     )
 
 
+def _clip_sprite_paths(project_dir: Path, short_path: Path) -> tuple[Dict[str, Any], Path]:
+    """Return the scrub sprite index and sheet captured when the short was rendered."""
+
+    short_video = _validate_short_path(project_dir, short_path)
+    index = load_sprite_index(short_video)
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scrub sprites not available")
+    return index, thumbnail_paths(short_video).sprite
+
+
+@app.get("/api/jobs/{job_id}/clips/{clip_id}/sprites")
+async def get_job_clip_sprites(job_id: str, clip_id: str, request: Request) -> Dict[str, Any]:
+    """Return the scrub sprite index for a job clip."""
+
+    project_dir, clip = _job_clip(job_id, clip_id)
+    index, _ = _clip_sprite_paths(project_dir, clip.video_path)
+    return {
+        **index,
+        "sprite_url": str(
+            request.url_for("get_job_clip_sprite_sheet", job_id=job_id, clip_id=clip_id)
+        ),
+    }
+
+
+@app.get("/api/jobs/{job_id}/clips/{clip_id}/sprites.jpg")
+async def get_job_clip_sprite_sheet(job_id: str, clip_id: str) -> FileResponse:
+    """Return the scrub sprite sheet for a job clip."""
+
+    project_dir, clip = _job_clip(job_id, clip_id)
+    _, sprite_path = _clip_sprite_paths(project_dir, clip.video_path)
+    return FileResponse(
+        path=sprite_path,
+        media_type="image/jpeg",
+        filename=sprite_path.name,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
 @app.get("/api/jobs/{job_id}/audio")
 async def get_job_audio(job_id: str) -> FileResponse:
     """Return the audio file generated for ``job_id`` if available."""
@@ -1448,6 +1540,17 @@ def _generate_clip_thumbnail(
     if thumbnail_path.exists():
         return thumbnail_path
 
+    # The renderer captures a poster frame at the middle of the short
+    sprite_index = load_sprite_index(short_video)
+    if sprite_index is not None:
+        try:
+            poster_time = float(sprite_index["poster_time"])
+            tolerance = float(sprite_index["interval"]) / 2.0
+        except (KeyError, TypeError, ValueError):
+            poster_time, tolerance = math.nan, 0.0
+        if abs(poster_time - midpoint) <= tolerance:
+            return thumbnail_paths(short_video).poster
+
     command = [
         "ffmpeg",
         "-y",
@@ -1576,6 +1679,17 @@ async def upload_job_clip(job_id: str, clip_id: str, payload: UploadClipRequest)
 
     desc_path = _resolve_description_path(video_path)
 
+    if is_proxy_render(video_path):
+        # Never publish a review proxy; render the final quality first
+        try:
+            await asyncio.to_thread(promote_proxy_render, video_path)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Failed to promote proxy for job %s clip %s", job_id, clip_id)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to render the final quality clip.",
+            ) from exc
+
     requested = payload.platforms
     if requested is None:
         platform_list = list(SUPPORTED_PLATFORMS)
@@ -0,0 +1,371 @@
+"""Benchmark the short renderer on synthetic clips.
+
+Source clips are generated locally with ffmpeg's ``testsrc2`` and ``sine``
+lavfi sources, and captions are synthetic SRT entries with a ``.words.json``
+sidecar so word highlighting is exercised. Every clip is rendered through
+each built-in layout and each render backend, one case per child process so
+peak RSS is measured per case. Run from the ``server`` directory::
+
+    python -m benchmarks.render --output results.json
+    python -m benchmarks.render --baseline benchmarks/render_baseline.json
+
+With ``--baseline`` the results are compared against a stored run and the
+command exits non-zero when a case regresses beyond the thresholds;
+``--write-baseline`` stores the current run instead. Baselines are machine
+specific, so none is committed; a missing ``--baseline`` file is an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default clip matrix: (width, height, seconds)
+DEFAULT_SOURCES: Tuple[Tuple[int, int, float], ...] = (
+    (1280, 720, 5.0),
+    (1920, 1080, 5.0),
+    (1920, 1080, 15.0),
+)
+DEFAULT_BACKENDS: Tuple[str, ...] = ("opencv", "ffmpeg")
+SOURCE_FPS = 30
+
+# Relative changes tolerated before a case counts as a regression
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "fps": 0.10,
+    "compose_ms_per_frame": 0.15,
+    "peak_rss_mb": 0.20,
+    "output_mb": 0.25,
+}
+# Metrics where a larger value is better
+_HIGHER_IS_BETTER = {"fps"}
+
+_WORDS = (
+    "this clip is a synthetic benchmark with steady captions so every layout "
+    "renders the same words at the same times across runs"
+).split()
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """A synthetic source clip."""
+
+    width: int
+    height: int
+    duration: float
+
+    @property
+    def name(self) -> str:
+        return f"{self.width}x{self.height}_{self.duration:g}s"
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One source rendered through one layout and backend."""
+
+    source: SourceSpec
+    layout: str
+    backend: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.source.name}/{self.layout}/{self.backend}"
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for a single :class:`BenchmarkCase`."""
+
+    key: str
+    source: str
+    layout: str
+    backend: str
+    engine: str
+    frames: int
+    seconds: float
+    fps: float
+    compose_ms_per_frame: Optional[float]
+    peak_rss_mb: float
+    encoder_peak_rss_mb: float
+    output_mb: float
+    # Total milliseconds per render stage from ``RenderProfiler``
+    stage_ms: Dict[str, float]
+
+
+def generate_source(spec: SourceSpec, directory: Path) -> Path:
+    """Write a test-pattern clip with a sine tone for ``spec``."""
+
+    path = directory / f"src_{spec.name}.mp4"
+    if path.exists():
+        return path
+    command = [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        f"testsrc2=size={spec.width}x{spec.height}:rate={SOURCE_FPS}:duration={spec.duration}",
+        "-f",
+        "lavfi",
+        "-i",
+        f"sine=frequency=440:sample_rate=48000:duration={spec.duration}",
+        "-c:v",
+        "libx264",
+        "-preset",
+        "veryfast",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-shortest",
+        str(path),
+    ]
+    subprocess.run(command, check=True)
+    return path
+
+
+def generate_captions(duration: float, directory: Path, *, words_per_caption: int = 4, word_seconds: float = 0.3) -> Path:
+    """Write synthetic SRT captions with word timings for ``duration`` seconds."""
+
+    def _stamp(seconds: float) -> str:
+        ms = int(round(seconds * 1000))
+        h, ms = divmod(ms, 3_600_000)
+        m, ms = divmod(ms, 60_000)
+        s, ms = divmod(ms, 1000)
+        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+    words = []
+    t = 0.0
+    idx = 0
+    while t + word_seconds <= duration:
+        words.append({"start": round(t, 3), "end": round(t + word_seconds, 3), "text": _WORDS[idx % len(_WORDS)]})
+        t += word_seconds
+        idx += 1
+
+    blocks = []
+    for n, start in enumerate(range(0, len(words), words_per_caption), start=1):
+        group = words[start:start + words_per_caption]
+        text = " ".join(word["text"] for word in group)
+        blocks.append(f"{n}\n{_stamp(group[0]['start'])} --> {_stamp(group[-1]['end'])}\n{text}\n")
+
+    path = directory / f"captions_{duration:g}s.srt"
+    path.write_text("\n".join(blocks), encoding="utf-8")
+    path.with_suffix(".words.json").write_text(json.dumps({"words": words}), encoding="utf-8")
+    return path
+
+
+def builtin_layouts() -> List[str]:
+    """Return the identifiers of the built-in layouts."""
+
+    from layouts import list_layouts
+
+    return [summary.id for summary in list_layouts() if summary.category == "builtin"]
+
+
+def _peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _run_case(case: BenchmarkCase, clip_path: Path, captions: Path, output: Path) -> BenchmarkResult:
+    """Render ``case`` and measure it; runs inside a fresh child process."""
+
+    from steps.render import render_vertical_with_captions
+    from steps.rendering import RenderProfiler
+
+    profiler = RenderProfiler()
+    started = time.perf_counter()
+    render_vertical_with_captions(
+        clip_path,
+        captions,
+        output,
+        layout=case.layout,
+        backend=case.backend,
+        thumbnails=False,
+        profiler=profiler,
+    )
+    seconds = time.perf_counter() - started
+
+    stages = profiler.summary()["stages"]
+    compose_frames = profiler.frames
+    compose_ns = sum(profiler.stage(name).total_ns for name in ("background", "video", "captions"))
+    frames = compose_frames or int(round(case.source.duration * SOURCE_FPS))
+    return BenchmarkResult(
+        key=case.key,
+        source=case.source.name,
+        layout=case.layout,
+        backend=case.backend,
+        # The ffmpeg backend falls back to OpenCV for layouts it cannot express
+        engine="opencv" if compose_frames else "ffmpeg",
+        frames=frames,
+        seconds=round(seconds, 3),
+        fps=round(frames / seconds, 2) if seconds > 0 else 0.0,
+        compose_ms_per_frame=round(compose_ns / 1e6 / compose_frames, 3) if compose_frames else None,
+        peak_rss_mb=_peak_rss_mb(resource.RUSAGE_SELF),
+        encoder_peak_rss_mb=_peak_rss_mb(resource.RUSAGE_CHILDREN),
+        output_mb=round(output.stat().st_size / (1024 * 1024), 3),
+        stage_ms={name: stage["total_ms"] for name, stage in stages.items()},
+    )
+
+
+def _case_worker(conn, case: BenchmarkCase, clip_path: Path, captions: Path, output: Path) -> None:
+    try:
+        conn.send(("ok", _run_case(case, clip_path, captions, output)))
+    except BaseException as exc:  # pragma: no cover - reported by the parent
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def run_benchmarks(
+    cases: Iterable[BenchmarkCase],
+    work_dir: Path,
+) -> Tuple[List[BenchmarkResult], Dict[str, str]]:
+    """Run every case in its own process; return results and per-case errors."""
+
+    ctx = mp.get_context("spawn")
+    results: List[BenchmarkResult] = []
+    errors: Dict[str, str] = {}
+    for case in cases:
+        clip_path = generate_source(case.source, work_dir)
+        captions = generate_captions(case.source.duration, work_dir)
+        output = work_dir / f"out_{case.key.replace('/', '_')}.mp4"
+        parent, child = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_case_worker, args=(child, case, clip_path, captions, output))
+        process.start()
+        child.close()
+        try:
+            status, payload = parent.recv()
+        except EOFError:
+            status, payload = "error", f"worker exited with code {process.exitcode}"
+        process.join()
+        if status == "ok":
+            results.append(payload)
+            print(f"[bench] {case.key}: {payload.fps:.1f} fps, {payload.peak_rss_mb:.0f} MB peak")
+        else:
+            errors[case.key] = payload
+            print(f"[bench] {case.key}: failed ({payload})")
+        output.unlink(missing_ok=True)
+    return results, errors
+
+
+def compare_to_baseline(
+    results: Sequence[dict],
+    baseline: Sequence[dict],
+    thresholds: Dict[str, float] = DEFAULT_THRESHOLDS,
+) -> List[dict]:
+    """Return the metrics in ``results`` that regressed against ``baseline``.
+
+    A metric regresses when it moves in the wrong direction by more than its
+    relative threshold. Cases missing from either side are ignored.
+    """
+
+    previous = {entry["key"]: entry for entry in baseline}
+    regressions: List[dict] = []
+    for entry in results:
+        before = previous.get(entry["key"])
+        if before is None:
+            continue
+        for metric, tolerance in thresholds.items():
+            old, new = before.get(metric), entry.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in _HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    {
+                        "key": entry["key"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 3),
+                        "threshold": tolerance,
+                    }
+                )
+    return regressions
+
+
+def _parse_source(value: str) -> SourceSpec:
+    try:
+        size, duration = value.split(":")
+        width, height = size.lower().split("x")
+        return SourceSpec(int(width), int(height), float(duration))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT:SECONDS, got {value!r}") from exc
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the short renderer on synthetic clips")
+    parser.add_argument("--source", action="append", type=_parse_source, help="WIDTHxHEIGHT:SECONDS (repeatable)")
+    parser.add_argument("--layout", action="append", help="layout id (default: every built-in layout)")
+    parser.add_argument("--backend", action="append", choices=DEFAULT_BACKENDS, help="render backend (repeatable)")
+    parser.add_argument("--output", type=Path, help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="compare against this results JSON")
+    parser.add_argument("--write-baseline", action="store_true", help="store the results as --baseline")
+    parser.add_argument("--work-dir", type=Path, help="keep generated clips here between runs")
+    args = parser.parse_args(argv)
+    if args.write_baseline and args.baseline is None:
+        parser.error("--write-baseline requires --baseline")
+    # Fail before rendering anything: a missing baseline must not pass silently
+    if args.baseline is not None and not args.write_baseline and not args.baseline.is_file():
+        parser.error(f"baseline {args.baseline} not found; create it with --write-baseline")
+
+    sources = args.source or [SourceSpec(*spec) for spec in DEFAULT_SOURCES]
+    layouts = args.layout or builtin_layouts()
+    backends = args.backend or list(DEFAULT_BACKENDS)
+    cases = [BenchmarkCase(source, layout, backend) for source in sources for layout in layouts for backend in backends]
+
+    if args.work_dir is not None:
+        args.work_dir.mkdir(parents=True, exist_ok=True)
+        results, errors = run_benchmarks(cases, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="render-bench-") as tmp:
+            results, errors = run_benchmarks(cases, Path(tmp))
+
+    report = {
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": mp.cpu_count()},
+        "results": [asdict(result) for result in results],
+        "errors": errors,
+    }
+
+    exit_code = 1 if errors else 0
+    if args.baseline is not None:
+        if args.write_baseline:
+            args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        else:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+            report["regressions"] = compare_to_baseline(report["results"], baseline.get("results", []))
+            for regression in report["regressions"]:
+                print(
+                    f"[bench] REGRESSION {regression['key']} {regression['metric']}: "
+                    f"{regression['baseline']} -> {regression['current']}"
+                )
+            if report["regressions"]:
+                exit_code = 1
+
+    payload = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
-from typing import Callable, List, Sequence, TypeVar
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple, TypeVar
 
 T = TypeVar("T")
 R = TypeVar("R")
@@ -59,4 +61,111 @@ def process_with_thread_pool(
     return results
 
 
-__all__ = ["process_with_thread_pool"]
+def process_as_completed(
+    items: Sequence[T],
+    func: Callable[[int, T], R],
+    *,
+    max_workers: int,
+    on_result: Callable[[int, T, R], None] | None = None,
+) -> List[R]:
+    """Run ``func`` over ``items`` with a bounded pool, reporting out of order.
+
+    Unlike :func:`process_with_thread_pool`, errors are not swallowed: the
+    first exception raised by ``func`` cancels every task that has not started
+    yet, waits for in-flight tasks to settle and is then re-raised. Each task
+    runs inside a copy of the caller's :mod:`contextvars` context so context
+    bound state (such as the active pipeline observer) is visible to workers.
+
+    Parameters
+    ----------
+    items:
+        Sequence of items to process.
+    func:
+        Callable invoked as ``func(index, item)`` with a 1-based ``index``.
+    max_workers:
+        Maximum number of worker threads. Values below one run serially.
+    on_result:
+        Optional callback invoked as ``on_result(index, item, result)`` from the
+        calling thread as soon as each task finishes.
+
+    Returns
+    -------
+    list
+        Results ordered like ``items``.
+    """
+    results: List[R | None] = [None] * len(items)
+    if not items:
+        return []
+    workers = max(1, min(int(max_workers), len(items)))
+    ex = ThreadPoolExecutor(max_workers=workers)
+    futures = {
+        ex.submit(contextvars.copy_context().run, func, i + 1, item): i
+        for i, item in enumerate(items)
+    }
+    try:
+        for fut in as_completed(futures):
+            i = futures[fut]
+            res = fut.result()
+            results[i] = res
+            if on_result:
+                on_result(i + 1, items[i], res)
+    except BaseException:
+        ex.shutdown(wait=True, cancel_futures=True)
+        raise
+    ex.shutdown(wait=True)
+    return results  # type: ignore[return-value]
+
+
+def imap_bounded(
+    items: Iterable[T],
+    func: Callable[[int, T], R],
+    *,
+    max_workers: int,
+) -> Iterator[Tuple[int, T, R]]:
+    """Yield ``(index, item, func(index, item))`` in input order from a thread pool.
+
+    ``items`` is consumed lazily and at most ``2 * max_workers`` tasks are
+    queued or running at once, so a slow or unbounded producer (such as a
+    generator that blocks until data arrives) is never drained ahead of the
+    workers. Queuing twice the worker count keeps every worker busy while the
+    oldest task is still being waited on. An exception raised by ``func`` is
+    re-raised when its result is due, after cancelling everything queued
+    behind it. Tasks run in a copy of the caller's :mod:`contextvars` context.
+
+    Parameters
+    ----------
+    items:
+        Iterable of items to process.
+    func:
+        Callable invoked as ``func(index, item)`` with a 1-based ``index``.
+    max_workers:
+        Maximum number of worker threads. Values below one run one at a time.
+    """
+    workers = max(1, int(max_workers))
+    source = iter(items)
+    pending: deque = deque()
+    ex = ThreadPoolExecutor(max_workers=workers)
+    try:
+        index = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                index += 1
+                fut = ex.submit(contextvars.copy_context().run, func, index, item)
+                pending.append((index, item, fut))
+            if not pending:
+                break
+            i, item, fut = pending.popleft()
+            yield i, item, fut.result()
+    except BaseException:
+        ex.shutdown(wait=True, cancel_futures=True)
+        raise
+    ex.shutdown(wait=True)
+
+
+__all__ = ["imap_bounded", "process_with_thread_pool", "process_as_completed"]
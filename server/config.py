@@ -29,6 +29,31 @@ CAPTION_HIGHLIGHT_BGR = (85, 255, 127)  # vibrant green highlight for active wor
 CAPTION_OUTLINE_BGR = (236, 236, 236)  # hex ececec
 # Constant frame-rate to avoid VFR issues on platforms like TikTok/Reels
 OUTPUT_FPS: float = 30.0
+# Frame encoder for rendered shorts: "ffmpeg" pipes frames into a single
+# libx264 encode with the audio mux; "opencv" uses cv2.VideoWriter plus a
+# separate ffmpeg re-encode/mux pass
+RENDER_ENCODER = os.environ.get("RENDER_ENCODER", "ffmpeg")
+# Compose engine for rendered shorts: "opencv" composes frames in Python;
+# "ffmpeg" compiles the layout into one filtergraph and lets ffmpeg decode,
+# compose, burn captions and encode in a single process (falling back to
+# OpenCV for layouts it cannot express)
+RENDER_BACKEND = os.environ.get("RENDER_BACKEND", "opencv")
+# Review proxies: while a job pauses for review, shorts are rendered at
+# RENDER_PROXY_SCALE of the layout size with ultrafast x264, and only clips
+# still present after review are promoted to a full-quality render
+RENDER_PROXY_FOR_REVIEW = os.environ.get("RENDER_PROXY_FOR_REVIEW", "true").lower() in ("1", "true", "yes", "y")
+RENDER_PROXY_SCALE: float = float(os.environ.get("RENDER_PROXY_SCALE", str(1 / 3)))
+RENDER_PROXY_PRESET = "ultrafast"
+RENDER_PROXY_CRF = 30
+# Poster frame and scrub sprite sheet (one tile every RENDER_SPRITE_INTERVAL
+# seconds, RENDER_SPRITE_TILE_WIDTH pixels wide) captured while the pipeline
+# renders shorts
+RENDER_THUMBNAILS = os.environ.get("RENDER_THUMBNAILS", "true").lower() in ("1", "true", "yes", "y")
+RENDER_SPRITE_INTERVAL: float = float(os.environ.get("RENDER_SPRITE_INTERVAL", "1.0"))
+RENDER_SPRITE_TILE_WIDTH: int = int(os.environ.get("RENDER_SPRITE_TILE_WIDTH", "160"))
+# Per-stage render timings reported with each step_7_render_* completion and
+# appended to <project>/render_metrics.jsonl
+RENDER_PROFILE = os.environ.get("RENDER_PROFILE", "true").lower() in ("1", "true", "yes", "y")
 
 # Layout storage root and default layout identifier
 
@@ -81,15 +106,38 @@ LOCAL_LLM_PROVIDER = os.environ.get(
     "lmstudio" if platform.system() == "Darwin" else "ollama",
 )
 LOCAL_LLM_MODEL = os.environ.get("LOCAL_LLM_MODEL", "google/gemma-3-4b")
+# Concurrent window requests while scanning for candidates; match the number
+# of requests the local LLM server runs in parallel (e.g. OLLAMA_NUM_PARALLEL)
+LLM_WINDOW_CONCURRENCY: int = int(os.environ.get("LLM_WINDOW_CONCURRENCY", "4"))
+# Disk cache of local LLM responses keyed by provider, model, prompt and
+# options, so reruns of a video skip requests that were already answered
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "y")
+_llm_cache_path_override = os.environ.get("LLM_CACHE_PATH")
+if _llm_cache_path_override:
+    LLM_CACHE_PATH = _resolve_path(_llm_cache_path_override)
+else:
+    LLM_CACHE_PATH = _default_out_root() / ".cache" / "llm_responses.sqlite3"
+# Least recently used responses are dropped beyond this size; 0 disables
+LLM_CACHE_MAX_MB: float = float(os.environ.get("LLM_CACHE_MAX_MB", "256"))
+# Responses older than this are dropped; 0 keeps them forever
+LLM_CACHE_MAX_AGE_DAYS: float = float(os.environ.get("LLM_CACHE_MAX_AGE_DAYS", "30"))
+# Requests sampled above this temperature (or without one) bypass the cache
+LLM_CACHE_MAX_TEMPERATURE: float = float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
 
 # Export silence-only "raw" clips for debugging comparisons
 EXPORT_RAW_CLIPS = False
 # Limit number of raw clips to avoid excessive disk use
 RAW_LIMIT = 10
+# Keep re-encoded per-clip intermediates in ``clips/``. When disabled, shorts
+# render directly from the project video range in a single decode/encode pass.
+SAVE_INTERMEDIATE_CLIPS = os.environ.get("SAVE_INTERMEDIATE_CLIPS", "false").lower() in ("1", "true", "yes", "y")
 
 # Silence detection thresholds
 SILENCE_DETECTION_NOISE = "-30dB"
 SILENCE_DETECTION_MIN_DURATION = 0.075
+# 0 tests each sample like ffmpeg silencedetect; > 0 compares the RMS level of
+# windows this many seconds long instead
+SILENCE_DETECTION_WINDOW = 0.0
 
 # ---------------------------------------
 # Transcript acquisition settings
@@ -101,6 +149,36 @@ WHISPER_MODEL = os.environ.get(
     "WHISPER_MODEL",
     "large-v3-turbo",  # (tiny, tiny.en, base, base.en, small, small.en, distil-small.en, medium, medium.en, distil-medium.en, large-v1, large-v2, large-v3, large, distil-large-v2, distil-large-v3, large-v3-turbo, or turbo)
 )
+WHISPER_DEVICE = os.environ.get("WHISPER_DEVICE", "auto")
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "default")
+# Concurrent transcribe() calls one loaded model serves in parallel
+WHISPER_NUM_WORKERS: int = int(os.environ.get("WHISPER_NUM_WORKERS", "1"))
+# Loaded models are shared across jobs; idle ones are dropped after
+# WHISPER_MODEL_IDLE_TTL seconds, or least-recently-used first when more than
+# WHISPER_MODEL_MAX_LOADED are loaded or they exceed WHISPER_MODEL_MEMORY_CAP_MB
+# (0 disables any of these limits)
+WHISPER_MODEL_IDLE_TTL: float = float(os.environ.get("WHISPER_MODEL_IDLE_TTL", "900"))
+WHISPER_MODEL_MAX_LOADED: int = int(os.environ.get("WHISPER_MODEL_MAX_LOADED", "2"))
+WHISPER_MODEL_MEMORY_CAP_MB: float = float(os.environ.get("WHISPER_MODEL_MEMORY_CAP_MB", "0"))
+# Transcribe long audio in TRANSCRIBE_WORKERS processes, split at silences into
+# shards of about TRANSCRIBE_SHARD_SECONDS; each worker runs
+# TRANSCRIBE_THREADS_PER_WORKER CPU threads (0 divides the cores evenly)
+TRANSCRIBE_WORKERS: int = int(os.environ.get("TRANSCRIBE_WORKERS", "1"))
+TRANSCRIBE_SHARD_SECONDS: float = float(os.environ.get("TRANSCRIBE_SHARD_SECONDS", "600"))
+TRANSCRIBE_THREADS_PER_WORKER: int = int(os.environ.get("TRANSCRIBE_THREADS_PER_WORKER", "0"))
+# Two-tier transcription: when TRANSCRIBE_FAST_MODEL is set, step 3 runs it
+# (with TRANSCRIBE_FAST_COMPUTE_TYPE, no word timestamps) over the whole audio
+# and only the chosen clip ranges, padded by TRANSCRIBE_REFINE_PADDING seconds,
+# are re-transcribed with WHISPER_MODEL and word timestamps after step 6
+TRANSCRIBE_FAST_MODEL = os.environ.get("TRANSCRIBE_FAST_MODEL", "")
+TRANSCRIBE_FAST_COMPUTE_TYPE = os.environ.get("TRANSCRIBE_FAST_COMPUTE_TYPE", "int8")
+TRANSCRIBE_REFINE_PADDING: float = float(os.environ.get("TRANSCRIBE_REFINE_PADDING", "2.0"))
+# Step 2 decodes the audio once into a 16 kHz mono PCM cache that transcription
+# and silence detection read. The mp3 is only needed for the job's audio
+# download; with AUDIO_KEEP_MP3 off the cache is decoded straight from the video
+AUDIO_KEEP_MP3 = os.environ.get("AUDIO_KEEP_MP3", "true").lower() in ("1", "true", "yes", "y")
+# Load WHISPER_MODEL when the API server starts instead of on the first job
+WHISPER_WARM_ON_START = os.environ.get("WHISPER_WARM_ON_START", "false").lower() in ("1", "true", "yes", "y")
 
 # ---------------------------------------
 # Clip selection
@@ -152,6 +230,8 @@ WINDOW_CONTEXT_PERCENTAGE = 0.11  # fraction of window length used as context on
 RATING_MIN = 0.0
 RATING_MAX = 10.0
 MIN_EXTENSION_MARGIN = 0.3
+# Number of clips cut/subtitled/rendered concurrently during step 7
+CLIP_PRODUCTION_MAX_WORKERS = int(os.environ.get("CLIP_PRODUCTION_MAX_WORKERS", "2"))
 
 # Step control
 # Allows skipping the first N pipeline steps by setting START_AT_STEP
@@ -206,6 +286,16 @@ __all__ = [
     "CAPTION_USE_COLORS",
     "CAPTION_FILL_BGR",
     "CAPTION_OUTLINE_BGR",
+    "RENDER_BACKEND",
+    "RENDER_PROFILE",
+    "RENDER_PROXY_CRF",
+    "RENDER_PROXY_FOR_REVIEW",
+    "RENDER_PROXY_PRESET",
+    "RENDER_PROXY_SCALE",
+    "RENDER_SPRITE_INTERVAL",
+    "RENDER_SPRITE_TILE_WIDTH",
+    "RENDER_THUMBNAILS",
+    "RENDER_ENCODER",
     "SNAP_TO_SILENCE",
     "SNAP_TO_DIALOG",
     "SNAP_TO_SENTENCE",
@@ -213,12 +303,34 @@ __all__ = [
     "DETECT_DIALOG_WITH_LLM",
     "LOCAL_LLM_PROVIDER",
     "LOCAL_LLM_MODEL",
+    "LLM_WINDOW_CONCURRENCY",
+    "LLM_CACHE_ENABLED",
+    "LLM_CACHE_PATH",
+    "LLM_CACHE_MAX_MB",
+    "LLM_CACHE_MAX_AGE_DAYS",
+    "LLM_CACHE_MAX_TEMPERATURE",
     "EXPORT_RAW_CLIPS",
     "RAW_LIMIT",
+    "SAVE_INTERMEDIATE_CLIPS",
     "SILENCE_DETECTION_NOISE",
     "SILENCE_DETECTION_MIN_DURATION",
+    "SILENCE_DETECTION_WINDOW",
     "TRANSCRIPT_SOURCE",
     "WHISPER_MODEL",
+    "WHISPER_DEVICE",
+    "WHISPER_COMPUTE_TYPE",
+    "WHISPER_NUM_WORKERS",
+    "WHISPER_MODEL_IDLE_TTL",
+    "WHISPER_MODEL_MAX_LOADED",
+    "WHISPER_MODEL_MEMORY_CAP_MB",
+    "WHISPER_WARM_ON_START",
+    "TRANSCRIBE_WORKERS",
+    "TRANSCRIBE_SHARD_SECONDS",
+    "TRANSCRIBE_THREADS_PER_WORKER",
+    "TRANSCRIBE_FAST_MODEL",
+    "TRANSCRIBE_FAST_COMPUTE_TYPE",
+    "TRANSCRIBE_REFINE_PADDING",
+    "AUDIO_KEEP_MP3",
     "CLIP_TYPE",
     "ENFORCE_NON_OVERLAP",
     "MIN_DURATION_SECONDS",
@@ -238,6 +350,7 @@ __all__ = [
     "RATING_MIN",
     "RATING_MAX",
     "MIN_EXTENSION_MARGIN",
+    "CLIP_PRODUCTION_MAX_WORKERS",
     "START_AT_STEP",
     "CLEANUP_NON_SHORTS",
     "TOKENS_DIR",
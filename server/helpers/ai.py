@@ -1,13 +1,25 @@
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Pattern
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 import requests
 from requests.exceptions import HTTPError, RequestException
 
-from config import LLM_API_TIMEOUT, LOCAL_LLM_PROVIDER
+from config import (
+    LLM_API_TIMEOUT,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_AGE_DAYS,
+    LLM_CACHE_MAX_MB,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_PATH,
+    LOCAL_LLM_PROVIDER,
+)
 
 # Default URLs for local model servers. Can be overridden via environment.
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
@@ -231,14 +243,274 @@ def _ensure_list_of_dicts(items: List[Any]) -> List[Dict[str, Any]]:
     return out
 
 
+# SQLite schema of the response cache
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+# Puts between eviction passes
+_EVICT_EVERY = 32
+
+
+class LLMResponseCache:
+    """SQLite store of raw LLM responses keyed by the request content.
+
+    The key hashes the provider, model, prompt, response format and options,
+    so any change to the prompt or sampling settings is a miss. Only
+    requests with a ``temperature`` of at most ``max_temperature`` are
+    cached; hotter sampling is meant to vary between calls. Entries older
+    than ``max_age`` seconds are dropped, then least recently used ones
+    while the stored responses exceed ``max_bytes``; ``0`` disables either
+    limit. Errors from the database are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+        max_age: float = LLM_CACHE_MAX_AGE_DAYS * 86400,
+        max_temperature: float = LLM_CACHE_MAX_TEMPERATURE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.max_age = float(max_age)
+        self.max_temperature = float(max_temperature)
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts = 0
+
+    @staticmethod
+    def key(
+        provider: str,
+        model: str,
+        prompt: str,
+        *,
+        json_format: bool,
+        options: Optional[dict],
+    ) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        blob = json.dumps(
+            [provider.lower(), model, prompt_hash, bool(json_format), options or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def cacheable(self, options: Optional[dict]) -> bool:
+        """Whether a request with ``options`` is deterministic enough to cache."""
+
+        temperature = (options or {}).get("temperature")
+        try:
+            return temperature is not None and float(temperature) <= self.max_temperature
+        except (TypeError, ValueError):
+            return False
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            try:
+                # Nothing stored yet; the file is created by the first put
+                if self._conn is None and not self.path.exists():
+                    row = None
+                else:
+                    row = self._lookup(key)
+            except sqlite3.Error as e:
+                print(f"[llm-cache] read failed: {e}")
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, provider: str, model: str, response: str) -> None:
+        with self._lock:
+            try:
+                now = self._clock()
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider.lower(), model, response, len(response.encode("utf-8")), now, now),
+                )
+                self._conn.commit()
+                self._puts += 1
+                if self._puts % _EVICT_EVERY == 1:
+                    self._evict_locked()
+            except sqlite3.Error as e:
+                print(f"[llm-cache] write failed: {e}")
+
+    def evict(self) -> int:
+        """Drop expired and over-size entries; return how many were dropped."""
+
+        with self._lock:
+            try:
+                return self._evict_locked()
+            except sqlite3.Error as e:
+                print(f"[llm-cache] eviction failed: {e}")
+                return 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counts of this process plus the stored entries and bytes."""
+
+        with self._lock:
+            try:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            except sqlite3.Error:
+                entries, size = 0, 0
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by the window threads under ``_lock``; WAL lets jobs in
+            # other processes read while one writes
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_CACHE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _lookup(self, key: str) -> Optional[tuple]:
+        row = self._connect().execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = self._clock()
+        if row is not None and self.max_age > 0 and now - row[1] > self.max_age:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+        elif row is not None:
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return row
+
+    def _evict_locked(self) -> int:
+        conn = self._connect()
+        dropped = 0
+        if self.max_age > 0:
+            dropped += conn.execute(
+                "DELETE FROM responses WHERE created < ?", (self._clock() - self.max_age,)
+            ).rowcount
+        if self.max_bytes > 0:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                stale: List[str] = []
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    stale.append(key)
+                    total -= size
+                conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+                dropped += len(stale)
+        conn.commit()
+        return dropped
+
+
+_LLM_CACHE: Optional[LLMResponseCache] = None
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or ``None`` when disabled."""
+
+    global _LLM_CACHE
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _LLM_CACHE_LOCK:
+        if _LLM_CACHE is None:
+            _LLM_CACHE = LLMResponseCache(LLM_CACHE_PATH)
+        return _LLM_CACHE
+
+
+def _cached_generate(
+    provider: str,
+    model: str,
+    prompt: str,
+    *,
+    json_format: bool,
+    options: Optional[dict],
+    cache: bool,
+    fetch: Callable[[], str],
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Return the cached response for the request or ``fetch()`` and store it.
+
+    A fetched response is stored only if ``validate`` accepts it; exceptions
+    from ``validate`` propagate, so a response the caller cannot parse is
+    never replayed from the cache.
+    """
+
+    store = get_llm_cache() if cache else None
+    if store is None or not store.cacheable(options):
+        return fetch()
+    key = store.key(provider, model, prompt, json_format=json_format, options=options)
+    cached = store.get(key)
+    if cached is not None:
+        return cached
+    raw = fetch()
+    # Empty answers are usually a server hiccup; ask again next time
+    if raw and (validate is None or validate(raw)):
+        store.put(key, provider, model, raw)
+    return raw
+
+
 def ollama_generate(
     model: str,
     prompt: str,
     json_format: bool = True,
     options: Optional[dict] = None,
     timeout: int = LLM_API_TIMEOUT,
+    *,
+    cache: bool = True,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Call Ollama's /api/generate endpoint and return the raw response string.
+
+    ``validate`` decides whether a fresh response may be cached.
+    """
+    return _cached_generate(
+        "ollama",
+        model,
+        prompt,
+        json_format=json_format,
+        options=options,
+        cache=cache,
+        fetch=lambda: _ollama_request(model, prompt, json_format, options, timeout),
+        validate=validate,
+    )
+
+
+def _ollama_request(
+    model: str,
+    prompt: str,
+    json_format: bool,
+    options: Optional[dict],
+    timeout: int,
 ) -> str:
-    """Call Ollama's /api/generate endpoint and return the raw response string."""
     payload = {
         "model": model,
         "prompt": prompt,
@@ -267,6 +539,12 @@ def ollama_call_json(
     extract_re: re.Pattern[str] = DEFAULT_JSON_EXTRACT,
 ) -> List[Dict]:
     """Call Ollama and return parsed JSON array with robust fallback."""
+    parsed: List[List[Dict]] = []
+
+    def validate(raw: str) -> bool:
+        parsed.append(_parse_ollama_json(raw, extract_re))
+        return True
+
     try:
         raw = ollama_generate(
             model=model,
@@ -274,10 +552,16 @@ def ollama_call_json(
             json_format=True,
             options=options,
             timeout=timeout,
+            validate=validate,
         )
-        raw = _normalize_quotes(_strip_control_chars(raw))
     except RequestException as e:
         raise RuntimeError(f"Ollama request failed: {e}")
+    # ``validate`` only runs for responses that may be stored
+    return parsed[0] if parsed else _parse_ollama_json(raw, extract_re)
+
+
+def _parse_ollama_json(raw: str, extract_re: re.Pattern[str]) -> List[Dict]:
+    raw = _normalize_quotes(_strip_control_chars(raw))
     try:
         parsed = json.loads(raw)
         if isinstance(parsed, list):
@@ -303,8 +587,33 @@ def lmstudio_generate(
     json_format: bool = True,
     options: Optional[dict] = None,
     timeout: int = LLM_API_TIMEOUT,
+    *,
+    cache: bool = True,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """Call LM Studio's OpenAI compatible endpoint and return raw content.
+
+    ``validate`` decides whether a fresh response may be cached.
+    """
+    return _cached_generate(
+        "lmstudio",
+        model,
+        prompt,
+        json_format=json_format,
+        options=options,
+        cache=cache,
+        fetch=lambda: _lmstudio_request(model, prompt, json_format, options, timeout),
+        validate=validate,
+    )
+
+
+def _lmstudio_request(
+    model: str,
+    prompt: str,
+    json_format: bool,
+    options: Optional[dict],
+    timeout: int,
 ) -> str:
-    """Call LM Studio's OpenAI compatible endpoint and return raw content."""
     payload: Dict[str, Any] = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
@@ -342,6 +651,12 @@ def lmstudio_call_json(
 ) -> List[Dict]:
     """Call LM Studio and return parsed JSON array with robust fallback."""
 
+    results: List[Tuple[List[Dict], bool]] = []
+
+    def validate(raw: str) -> bool:
+        results.append(_parse_lmstudio_json(raw, model, extract_re))
+        return results[-1][1]
+
     try:
         raw = lmstudio_generate(
             model=model,
@@ -349,18 +664,29 @@ def lmstudio_call_json(
             json_format=True,
             options=options,
             timeout=timeout,
+            validate=validate,
         )
-        raw = _normalize_quotes(raw)
     except RequestException as e:
         raise RuntimeError(f"LM Studio request failed: {e}")
 
+    # ``validate`` only runs for responses that may be stored
+    items, _ = results[0] if results else _parse_lmstudio_json(raw, model, extract_re)
+    return items
+
+
+def _parse_lmstudio_json(
+    raw: str, model: str, extract_re: re.Pattern[str]
+) -> Tuple[List[Dict], bool]:
+    """Parse LM Studio output; the flag is False for the bare-token fallback."""
+
+    raw = _normalize_quotes(raw)
     try:
         coerced = coerce_json_array(raw, extract_re)
         parsed = json.loads(coerced)
     except Exception as e:
         tokens = re.findall(r"[0-9A-Za-z]+", raw)
         if tokens:
-            return _ensure_list_of_dicts(tokens)
+            return _ensure_list_of_dicts(tokens), False
         head = raw[:300]
         raise ValueError(
             f"LM Studio model '{model}' did not return JSON array. Raw head: {head}"
@@ -383,8 +709,7 @@ def lmstudio_call_json(
     else:
         items = [parsed]
 
-    items = _ensure_list_of_dicts(items)
-    return items
+    return _ensure_list_of_dicts(items), True
 
 
 def local_llm_generate(
@@ -393,8 +718,13 @@ def local_llm_generate(
     *,
     options: Optional[dict] = None,
     timeout: int = LLM_API_TIMEOUT,
+    cache: bool = True,
 ) -> str:
-    """Call the configured local LLM provider and return raw text."""
+    """Call the configured local LLM provider and return raw text.
+
+    Pass ``cache=False`` for requests that must reach the server, such as
+    connectivity checks.
+    """
     if LOCAL_LLM_PROVIDER.lower() == "lmstudio":
         return lmstudio_generate(
             model=model,
@@ -402,6 +732,7 @@ def local_llm_generate(
             json_format=False,
             options=options,
             timeout=timeout,
+            cache=cache,
         )
     return ollama_generate(
         model=model,
@@ -409,6 +740,7 @@ def local_llm_generate(
         json_format=False,
         options=options,
         timeout=timeout,
+        cache=cache,
     )
 
 
@@ -453,7 +785,9 @@ def retry(fn: Callable[[], Any], *, attempts: int = 3, backoff: float = 1.5):
 
 
 __all__ = [
+    "LLMResponseCache",
     "coerce_json_array",
+    "get_llm_cache",
     "ollama_generate",
     "ollama_call_json",
     "lmstudio_generate",
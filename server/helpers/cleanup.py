@@ -75,7 +75,7 @@ def reset_project_for_restart(project_dir: Path, base_name: str, start_step: int
 
     step_targets: dict[int, list[Path]] = {
         1: [project_dir / f"{base_name}.mp4"],
-        2: [project_dir / f"{base_name}.mp3"],
+        2: [project_dir / f"{base_name}.mp3", project_dir / f"{base_name}.pcm"],
         3: [project_dir / f"{base_name}.txt"],
         4: [project_dir / "silences.json"],
         5: [project_dir / "dialog_ranges.json", project_dir / "segments.json"],
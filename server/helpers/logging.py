@@ -41,6 +41,7 @@ def run_step(
     *args: Any,
     step_id: str | None = None,
     observer: PipelineObserver | None = None,
+    completed_data: Callable[[T], dict[str, Any] | None] | None = None,
     **kwargs: Any,
 ) -> T:
     """Run ``func`` as a pipeline step with colored logging and timing.
@@ -51,6 +52,9 @@ def run_step(
         Descriptive name for the step to display in the logs.
     func:
         Callable to execute.
+    completed_data:
+        Optional callable given the result; the mapping it returns is added
+        to the ``STEP_COMPLETED`` event data.
     *args, **kwargs:
         Arguments forwarded to ``func``.
 
@@ -97,12 +101,15 @@ def run_step(
             f"{Fore.GREEN}  ↳ completed in {Fore.MAGENTA}{elapsed:.2f}s{Style.RESET_ALL}"
         )
         if obs:
+            data: dict[str, Any] = {"elapsed_seconds": elapsed}
+            if completed_data is not None:
+                data.update(completed_data(result) or {})
             obs.handle_event(
                 PipelineEvent(
                     type=PipelineEventType.STEP_COMPLETED,
                     message=name,
                     step=step_id or name,
-                    data={"elapsed_seconds": elapsed},
+                    data=data,
                 )
             )
         return result
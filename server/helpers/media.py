@@ -6,9 +6,20 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+from .pcm import is_pcm_path, pcm_duration
+
 
 def probe_media_duration(path: str | Path) -> Optional[float]:
-    """Return the duration of ``path`` in seconds using ``ffprobe`` when available."""
+    """Return the duration of ``path`` in seconds using ``ffprobe`` when available.
+
+    PCM caches (see :mod:`helpers.pcm`) are sized from the file instead.
+    """
+
+    if is_pcm_path(path):
+        try:
+            return pcm_duration(path)
+        except OSError:
+            return None
 
     try:
         result = subprocess.run(
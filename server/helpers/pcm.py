@@ -0,0 +1,110 @@
+"""Decoded 16 kHz mono PCM cache shared by the audio steps.
+
+Step 2 decodes the source audio once into ``<base>.pcm``: raw little-endian
+signed 16-bit samples with no header. That is what Whisper resamples to
+anyway, so transcription, silence detection and any other analysis read
+samples from a memory map instead of each decoding the mp3 again. The
+duration follows from the file size, so no ``ffprobe`` call is needed.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+PCM_SUFFIX = ".pcm"
+_BYTES_PER_SAMPLE = 2
+
+
+def is_pcm_path(path: str | Path) -> bool:
+    return Path(path).suffix == PCM_SUFFIX
+
+
+def ffmpeg_input_args(path: str | Path) -> List[str]:
+    """``ffmpeg`` arguments that open ``path``, raw PCM caches included."""
+
+    if is_pcm_path(path):
+        return ["-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", str(path)]
+    return ["-i", str(path)]
+
+
+def decode_to_pcm(source: str | Path, pcm_path: str | Path) -> Path:
+    """Decode the audio of ``source`` (audio or video) into ``pcm_path``."""
+
+    pcm_path = Path(pcm_path)
+    pcm_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pcm_path.with_name(pcm_path.name + ".part")
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "error",
+        "-y",
+        *ffmpeg_input_args(source),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        str(tmp_path),
+    ]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    # Readers never see a half-written cache
+    os.replace(tmp_path, pcm_path)
+    return pcm_path
+
+
+def ensure_pcm(source: str | Path, pcm_path: str | Path) -> Path:
+    """Return ``pcm_path``, decoding ``source`` into it unless already cached."""
+
+    pcm_path = Path(pcm_path)
+    if pcm_path.exists() and pcm_path.stat().st_size > 0:
+        return pcm_path
+    return decode_to_pcm(source, pcm_path)
+
+
+def pcm_duration(pcm_path: str | Path) -> float:
+    """Duration in seconds of the PCM cache at ``pcm_path``."""
+
+    return os.path.getsize(pcm_path) / (_BYTES_PER_SAMPLE * SAMPLE_RATE)
+
+
+def load_pcm(pcm_path: str | Path) -> np.ndarray:
+    """Memory-map the int16 samples of ``pcm_path`` (read-only)."""
+
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.int16)
+    return np.memmap(pcm_path, dtype="<i2", mode="r")
+
+
+def pcm_samples(pcm_path: str | Path, start: float = 0.0, end: float | None = None) -> np.ndarray:
+    """Float32 samples in ``[-1, 1)`` for ``[start, end)`` seconds of ``pcm_path``."""
+
+    samples = load_pcm(pcm_path)
+    lo = max(0, int(round(start * SAMPLE_RATE)))
+    hi = len(samples) if end is None else min(len(samples), int(round(end * SAMPLE_RATE)))
+    return samples[lo:hi].astype(np.float32) / 32768.0
+
+
+__all__ = [
+    "PCM_SUFFIX",
+    "SAMPLE_RATE",
+    "decode_to_pcm",
+    "ensure_pcm",
+    "ffmpeg_input_args",
+    "is_pcm_path",
+    "load_pcm",
+    "pcm_duration",
+    "pcm_samples",
+]
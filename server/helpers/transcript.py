@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 
 _QUOTE_MAP: Dict[str, str] = {
@@ -37,33 +38,166 @@ def _normalize_words(words: Iterable[dict]) -> List[dict]:
     return normalized
 
 
-def write_transcript_txt(result: dict, out_path: str) -> None:
-    """Write segments and timing from transcribe_audio result to a .txt and JSON file."""
+def _serialize_segment(seg: dict) -> dict:
+    """Return the normalized transcript entry written for ``seg``."""
 
-    segments = result.get("segments", [])
-    timing = result.get("timing", {})
-    path = Path(out_path)
-    with path.open("w", encoding="utf-8") as f:
-        serializable_segments: List[dict] = []
-        for seg in segments:
-            start = float(seg.get("start", 0.0))
-            end = float(seg.get("end", 0.0))
-            text = normalize_quotes((seg.get("text", "") or "").replace("\n", " ").strip())
-            f.write(f"[{start:.2f} -> {end:.2f}] {text}\n")
-            words = _normalize_words(seg.get("words", []) or [])
-            serializable_segments.append(
-                {
-                    "start": start,
-                    "end": end,
-                    "text": text,
-                    "words": words,
-                }
-            )
+    return {
+        "start": float(seg.get("start", 0.0)),
+        "end": float(seg.get("end", 0.0)),
+        "text": normalize_quotes((seg.get("text", "") or "").replace("\n", " ").strip()),
+        "words": _normalize_words(seg.get("words", []) or []),
+    }
+
+
+class TranscriptWriter:
+    """Append finalized segments to a transcript ``.txt`` as they arrive.
+
+    Each :meth:`append` writes and flushes one ``[start -> end] text`` line, so
+    readers such as :func:`steps.candidates.helpers.parse_transcript` see the
+    transcript grow while transcription runs. :meth:`close` adds the timing
+    footer and writes the ``.json`` companion with word timings.
+    """
+
+    def __init__(self, out_path: str | Path) -> None:
+        self.path = Path(out_path)
+        self.segments: List[dict] = []
+        self._fh = self.path.open("w", encoding="utf-8")
+
+    def append(self, seg: dict) -> dict:
+        entry = _serialize_segment(seg)
+        self._fh.write(f"[{entry['start']:.2f} -> {entry['end']:.2f}] {entry['text']}\n")
+        self._fh.flush()
+        self.segments.append(entry)
+        return entry
+
+    def close(self, timing: dict | None = None, *, extra: dict | None = None) -> None:
+        """Finish the ``.txt`` and write the ``.json``; ``extra`` keys go into the latter."""
+
+        timing = timing or {}
+        f = self._fh
         f.write("\n# TIMING\n")
         f.write(f"start_time: {timing.get('start_time', 0.0):.2f} seconds\n")
         f.write(f"stop_time: {timing.get('stop_time', 0.0):.2f} seconds\n")
         f.write(f"total_time: {timing.get('total_time', 0.0):.2f} seconds\n")
+        f.close()
+
+        json_path = self.path.with_suffix(".json")
+        payload = {"segments": self.segments, "timing": timing, **(extra or {})}
+        json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def abort(self) -> None:
+        """Close the partial transcript without marking it complete."""
+
+        self._fh.close()
+
+
+def load_transcript_json(transcript_path: str | Path) -> dict:
+    """Return the ``.json`` companion of ``transcript_path`` (empty when missing)."""
+
+    json_path = Path(transcript_path).with_suffix(".json")
+    try:
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_transcript_txt(result: dict, out_path: str) -> None:
+    """Write segments and timing from transcribe_audio result to a .txt and JSON file."""
+
+    writer = TranscriptWriter(out_path)
+    try:
+        for seg in result.get("segments", []):
+            writer.append(seg)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close(result.get("timing", {}))
+
+
+class TranscriptStream:
+    """Transcript segments published while transcription is still running.
+
+    The producer calls :meth:`publish` for each finalized segment, in time
+    order, then :meth:`close` (or :meth:`fail`). Consumers on other threads
+    iterate the stream, or call :meth:`wait_until` before reading ``items``,
+    which grows as ``(start, end, text)`` tuples matching what
+    :func:`steps.candidates.helpers.parse_transcript` reads back from the
+    ``.txt``.
+    """
+
+    def __init__(self, *, duration: float | None = None) -> None:
+        self.duration = duration
+        self.segments: List[dict] = []
+        self.items: List[Tuple[float, float, str]] = []
+        self.covered_until = 0.0
+        # Start of the latest segment; segments arrive in start order
+        self.started_until = 0.0
+        self.closed = False
+        self.error: BaseException | None = None
+        self._cond = threading.Condition()
+
+    def publish(self, seg: dict) -> None:
+        entry = _serialize_segment(seg)
+        with self._cond:
+            self.segments.append(entry)
+            # Times as written to (and parsed back from) the transcript .txt
+            start, end = round(entry["start"], 2), round(entry["end"], 2)
+            if entry["text"]:
+                self.items.append((start, end, entry["text"]))
+            self.covered_until = max(self.covered_until, end)
+            self.started_until = max(self.started_until, start)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def fail(self, exc: BaseException) -> None:
+        with self._cond:
+            self.error = exc
+            self.closed = True
+            self._cond.notify_all()
+
+    def wait_until(self, t: float, timeout: float | None = None) -> bool:
+        """Block until the transcript covers time ``t`` or the stream closes.
+
+        Returns ``True`` if ``t`` is covered. Re-raises the producer's error.
+        """
+
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.closed or (self.items and self.covered_until >= t),
+                timeout=timeout,
+            )
+            if self.error is not None:
+                raise self.error
+            return bool(self.items) and self.covered_until >= t
+
+    def wait_past(self, t: float, timeout: float | None = None) -> bool:
+        """Block until a segment starting at or after ``t`` is published.
+
+        Every segment starting before ``t`` is in ``items`` by then, even when
+        an earlier, longer segment already covers ``t``. Returns ``False``
+        if the stream closed (or ``timeout`` passed) first.
+        """
+
+        with self._cond:
+            self._cond.wait_for(lambda: self.closed or self.started_until >= t, timeout=timeout)
+            if self.error is not None:
+                raise self.error
+            return self.started_until >= t
 
-    json_path = path.with_suffix(".json")
-    payload = {"segments": serializable_segments, "timing": timing}
-    json_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    def __iter__(self) -> Iterator[dict]:
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self.closed or len(self.segments) > index)
+                if self.error is not None:
+                    raise self.error
+                batch = self.segments[index:]
+            if not batch:
+                return
+            index += len(batch)
+            yield from batch
@@ -0,0 +1,254 @@
+"""Process-wide registry of loaded faster-whisper models.
+
+Loading Whisper weights takes seconds and hundreds of MB, so models are kept
+in memory keyed by ``(size, device, compute_type)`` and shared by every job
+in the process. CTranslate2 models accept concurrent ``transcribe`` calls
+(``num_workers`` sets how many run in parallel), so one instance serves all
+callers.
+
+Models are borrowed with :meth:`WhisperModelRegistry.lease`; a model is never
+evicted while leased. Idle models are dropped once unused for ``idle_ttl``
+seconds, and least-recently-used idle models are dropped first when more than
+``max_models`` are loaded or their estimated resident memory exceeds
+``memory_cap_mb``; ``0`` disables any of these limits. Models loaded with :meth:`~WhisperModelRegistry.warm` are
+exempt from the idle TTL but not from the caps.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import (
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_DEVICE,
+    WHISPER_MODEL_IDLE_TTL,
+    WHISPER_MODEL_MAX_LOADED,
+    WHISPER_MODEL_MEMORY_CAP_MB,
+    WHISPER_NUM_WORKERS,
+)
+
+ModelKey = Tuple[str, str, str]
+ModelLoader = Callable[[str, str, str], Any]
+
+
+def _load_whisper_model(size: str, device: str, compute_type: str) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(size, device=device, compute_type=compute_type, num_workers=WHISPER_NUM_WORKERS)
+
+
+def _resident_mb() -> float:
+    """Current resident set size of this process in MB (0 when unknown)."""
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+@dataclass
+class _Entry:
+    model: Any = None
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+    leases: int = 0
+    last_used: float = 0.0
+    memory_mb: float = 0.0
+    pinned: bool = False
+
+
+class WhisperModelRegistry:
+    """Thread-safe cache of loaded Whisper models with idle and memory eviction."""
+
+    def __init__(
+        self,
+        *,
+        loader: ModelLoader = _load_whisper_model,
+        idle_ttl: float = WHISPER_MODEL_IDLE_TTL,
+        max_models: int = WHISPER_MODEL_MAX_LOADED,
+        memory_cap_mb: float = WHISPER_MODEL_MEMORY_CAP_MB,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loader = loader
+        self.idle_ttl = float(idle_ttl)
+        self.max_models = int(max_models)
+        self.memory_cap_mb = float(memory_cap_mb)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[ModelKey, _Entry] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    @staticmethod
+    def key(size: str, device: str | None = None, compute_type: str | None = None) -> ModelKey:
+        return (size, device or WHISPER_DEVICE, compute_type or WHISPER_COMPUTE_TYPE)
+
+    @contextmanager
+    def lease(
+        self,
+        size: str,
+        device: str | None = None,
+        compute_type: str | None = None,
+    ) -> Iterator[Any]:
+        """Borrow the model for ``size``, loading it on first use."""
+
+        key = self.key(size, device, compute_type)
+        entry = self._acquire(key)
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = self._clock()
+            self._evict()
+
+    def warm(self, size: str, device: str | None = None, compute_type: str | None = None) -> None:
+        """Load ``size`` now and keep it loaded regardless of the idle TTL."""
+
+        with self.lease(size, device, compute_type):
+            with self._lock:
+                entry = self._entries.get(self.key(size, device, compute_type))
+                if entry is not None:
+                    entry.pinned = True
+
+    def loaded(self) -> List[ModelKey]:
+        """Keys of the models currently in memory."""
+
+        with self._lock:
+            return [key for key, entry in self._entries.items() if entry.ready.is_set() and entry.error is None]
+
+    def evict_idle(self) -> int:
+        """Drop idle models past their TTL or over a cap; return how many were dropped."""
+
+        return self._evict()
+
+    def clear(self) -> None:
+        """Drop every model that is not leased."""
+
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if entry.leases == 0 and entry.ready.is_set()]
+            dropped = [self._entries.pop(key) for key in idle]
+        self._release(dropped)
+
+    def _acquire(self, key: ModelKey) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry()
+            entry.leases += 1
+            entry.last_used = self._clock()
+
+        if owner:
+            # Only the first caller loads; others wait for it below
+            before = _resident_mb()
+            try:
+                entry.model = self._loader(*key)
+            except BaseException as exc:
+                entry.error = exc
+                with self._lock:
+                    self._entries.pop(key, None)
+            entry.memory_mb = max(0.0, _resident_mb() - before)
+            entry.ready.set()
+            if entry.error is None:
+                print(f"[whisper] loaded {key[0]} ({key[1]}, {key[2]}) ~{entry.memory_mb:.0f} MB")
+                self._evict()
+                self._start_reaper()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            with self._lock:
+                entry.leases -= 1
+            raise entry.error
+        return entry
+
+    def _evict(self) -> int:
+        now = self._clock()
+        dropped: List[_Entry] = []
+        with self._lock:
+            idle = sorted(
+                (
+                    (key, entry)
+                    for key, entry in self._entries.items()
+                    if entry.leases == 0 and entry.ready.is_set()
+                ),
+                key=lambda item: item[1].last_used,
+            )
+            for key, entry in idle:
+                if self.idle_ttl > 0 and not entry.pinned and now - entry.last_used >= self.idle_ttl:
+                    dropped.append(self._entries.pop(key))
+            # Least recently used idle models go first when over a cap
+            for key, entry in idle:
+                if key not in self._entries:
+                    continue
+                over_count = self.max_models > 0 and len(self._entries) > self.max_models
+                total_mb = sum(e.memory_mb for e in self._entries.values())
+                over_memory = self.memory_cap_mb > 0 and total_mb > self.memory_cap_mb
+                if not (over_count or over_memory):
+                    break
+                dropped.append(self._entries.pop(key))
+        self._release(dropped)
+        return len(dropped)
+
+    def _release(self, entries: List[_Entry]) -> None:
+        if not entries:
+            return
+        for entry in entries:
+            entry.model = None
+        print(f"[whisper] evicted {len(entries)} idle model(s)")
+        gc.collect()
+
+    def _start_reaper(self) -> None:
+        if self.idle_ttl <= 0:
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap, name="whisper-model-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        # Wakes a few times per TTL and exits once nothing is loaded
+        while True:
+            self._wake.wait(max(1.0, self.idle_ttl / 4))
+            self._evict()
+            with self._lock:
+                if not self._entries:
+                    self._reaper = None
+                    return
+
+
+_REGISTRY: Optional[WhisperModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry() -> WhisperModelRegistry:
+    """Return the process-wide registry, creating it on first use."""
+
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = WhisperModelRegistry()
+        return _REGISTRY
+
+
+def warm_whisper_model(size: str, device: str | None = None, compute_type: str | None = None) -> None:
+    """Load ``size`` into the process-wide registry ahead of the first job."""
+
+    get_model_registry().warm(size, device, compute_type)
+
+
+__all__ = [
+    "WhisperModelRegistry",
+    "get_model_registry",
+    "warm_whisper_model",
+]
@@ -7,12 +7,13 @@ import os
 import shutil
 import zipfile
 from typing import Any, Callable, Literal, TypeVar
-from threading import Event
+from threading import Event, Lock
 
 import config
 
 from interfaces.progress import PipelineEvent, PipelineEventType, PipelineObserver
 from steps.transcribe import transcribe_audio
+from steps.transcribe_refine import FAST_TIER, refine_transcript_ranges
 from steps.download import (
     download_transcript,
     download_video,
@@ -34,9 +35,10 @@ from steps.segment import (
 
     write_segments_json,
 )
-from steps.cut import save_clip_from_candidate
+from steps.cut import clip_stem, resolve_candidate_range, save_clip_from_candidate
 from steps.subtitle import build_srt_for_range
-from steps.render import render_vertical_with_captions
+from steps.render import is_proxy_render, promote_proxy_render, render_vertical_with_captions
+from steps.rendering import RenderProfiler, append_render_metrics
 from layouts import LayoutNotFoundError, load_layout
 from library import write_adjustment_metadata
 from steps.silence import (
@@ -57,6 +59,9 @@ from config import (
     SILENCE_DETECTION_NOISE,
     SILENCE_DETECTION_MIN_DURATION,
     TRANSCRIPT_SOURCE,
+    AUDIO_KEEP_MP3,
+    TRANSCRIBE_FAST_COMPUTE_TYPE,
+    TRANSCRIBE_FAST_MODEL,
     WHISPER_MODEL,
     FORCE_REBUILD,
     FORCE_REBUILD_SEGMENTS,
@@ -65,6 +70,9 @@ from config import (
     CLEANUP_NON_SHORTS,
     START_AT_STEP,
     RENDER_LAYOUT,
+    RENDER_PROXY_FOR_REVIEW,
+    RENDER_PROFILE,
+    RENDER_THUMBNAILS,
 )
 from auth.accounts import ensure_account_available
 
@@ -76,7 +84,8 @@ from pathlib import Path
 
 from helpers.audio import ensure_audio
 from helpers.media import probe_media_duration
-from helpers.transcript import write_transcript_txt
+from helpers.pcm import ensure_pcm
+from helpers.transcript import TranscriptWriter
 from helpers.transcript_quality import score_transcript_quality
 from helpers.formatting import (
     Fore,
@@ -90,6 +99,7 @@ from helpers.description import maybe_append_website_link
 from steps.candidates import ClipCandidate
 from helpers.cleanup import cleanup_project_dir, reset_project_for_restart
 from common.caption_utils import prepare_hashtags
+from common.thread_pool import process_as_completed
 from helpers.hashtags import generate_hashtag_strings
 
 
@@ -132,6 +142,43 @@ def _build_subtitle_archive(subtitles_dir: Path, project_dir: Path, base_name: s
 TStepResult = TypeVar("TStepResult")
 
 
+def _run_profiled_render(
+    run_pipeline_step: Callable[..., Path],
+    title: str,
+    render: Callable[[], Path],
+    *,
+    step_key: str,
+    profiler: RenderProfiler | None,
+    metrics_path: Path,
+    record: dict[str, Any],
+    lock: Lock,
+) -> Path:
+    """Run a step 7 render and append its stage timings to ``metrics_path``.
+
+    The metrics are written whether or not an observer is attached; the
+    profile is also added to the step's completion event.
+    """
+
+    result = run_pipeline_step(
+        title,
+        render,
+        step_key=step_key,
+        completed_data=(lambda _: {"render_profile": profiler.summary()}) if profiler is not None else None,
+    )
+    if profiler is not None:
+        with lock:
+            append_render_metrics(
+                metrics_path,
+                {
+                    **record,
+                    "step": step_key,
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                    **profiler.summary(),
+                },
+            )
+    return result
+
+
 class PipelineCancelledError(Exception):
     """Raised when a cancellation signal is received during pipeline execution."""
 
@@ -258,11 +305,18 @@ def process_video(
         func: Callable[[], TStepResult],
         *,
         step_key: str,
+        completed_data: Callable[[TStepResult], dict[str, Any] | None] | None = None,
     ) -> TStepResult:
         ensure_not_cancelled()
         step_timers[step_key] = time.perf_counter()
         try:
-            result = run_step(title, func, step_id=step_key, observer=observer)
+            result = run_step(
+                title,
+                func,
+                step_id=step_key,
+                observer=observer,
+                completed_data=completed_data,
+            )
             ensure_not_cancelled()
             return result
         finally:
@@ -455,9 +509,25 @@ def process_video(
         # STEP 2: Acquire Audio
         # ----------------------
         audio_output_path = project_dir / f"{non_suffix_filename}.mp3"
+        # Decoded once here; transcription and silence detection read it
+        pcm_output_path = project_dir / f"{non_suffix_filename}.pcm"
+
+        def decode_pcm(source: Path) -> None:
+            try:
+                ensure_pcm(source, pcm_output_path)
+            except Exception as exc:
+                emit_log(
+                    f"{Fore.YELLOW}STEP 2: PCM decode failed, steps will read {source}: {exc}{Style.RESET_ALL}",
+                    level="warning",
+                )
 
         def step_audio() -> bool:
-            return ensure_audio(
+            video_ready = video_output_path.exists() and video_output_path.stat().st_size > 0
+            if not AUDIO_KEEP_MP3 and video_ready and not audio_output_path.exists():
+                ensure_pcm(video_output_path, pcm_output_path)
+                notify_progress("step_2_audio", 1.0, message="Audio decoded from video")
+                return True
+            audio_ready = ensure_audio(
                 yt_url,
                 str(audio_output_path),
                 str(video_output_path),
@@ -473,6 +543,9 @@ def process_video(
                 ),
                 allow_remote_download=not is_local_source,
             )
+            if audio_ready:
+                decode_pcm(audio_output_path)
+            return audio_ready
 
         if should_run(2):
             audio_ok = run_pipeline_step(
@@ -490,7 +563,7 @@ def process_video(
                     f"Failed to acquire audio for video {yt_url}",
                 )
         else:
-            audio_ok = audio_output_path.exists()
+            audio_ok = audio_output_path.exists() or pcm_output_path.exists()
             emit_log(
                 f"{Fore.YELLOW}Skipping STEP 2: assuming audio exists at {audio_output_path}{Style.RESET_ALL}",
                 level="warning",
@@ -502,6 +575,9 @@ def process_video(
                     message="Audio already available",
                 )
 
+        # Later steps read the PCM cache whenever step 2 produced one
+        audio_input_path = pcm_output_path if pcm_output_path.exists() else audio_output_path
+
         # ----------------------
         # STEP 3: Get Text (Transcript or Transcription)
         # ----------------------
@@ -526,17 +602,35 @@ def process_video(
                 )
             return success
 
+        # Silences found while planning sharded transcription; step 4 reuses them
+        transcribe_silences: list[list[tuple[float, float]]] = []
+
         def run_transcribe(step_key: str) -> bool:
-            result = transcribe_audio(
-                str(audio_output_path),
-                model_size=WHISPER_MODEL,
-                progress_callback=lambda fraction: notify_progress(
-                    step_key,
-                    fraction,
-                    message=f"Transcribing audio {fraction * 100:.0f}%",
-                ),
+            # Segments are appended to the .txt as Whisper finalizes them
+            writer = TranscriptWriter(transcript_output_path)
+            # Fast tier: rough text only; chosen clips are refined after step 6
+            fast = bool(TRANSCRIBE_FAST_MODEL)
+            try:
+                result = transcribe_audio(
+                    str(audio_input_path),
+                    model_size=TRANSCRIBE_FAST_MODEL if fast else WHISPER_MODEL,
+                    progress_callback=lambda fraction: notify_progress(
+                        step_key,
+                        fraction,
+                        message=f"Transcribing audio {fraction * 100:.0f}%",
+                    ),
+                    on_segment=writer.append,
+                    compute_type=TRANSCRIBE_FAST_COMPUTE_TYPE if fast else None,
+                    word_timestamps=not fast,
+                    on_silences=transcribe_silences.append,
+                )
+            except BaseException:
+                writer.abort()
+                raise
+            writer.close(
+                result["timing"],
+                extra={"tier": FAST_TIER, "model": TRANSCRIBE_FAST_MODEL} if fast else None,
             )
-            write_transcript_txt(result, str(transcript_output_path))
             return True
 
         allow_transcript_download = not is_local_source
@@ -654,15 +748,21 @@ def process_video(
         # ----------------------
         silences_path = project_dir / "silences.json"
         audio_duration_hint = (
-            probe_media_duration(audio_output_path)
-            if audio_output_path.exists()
+            probe_media_duration(audio_input_path)
+            if audio_input_path.exists()
             else None
         )
 
         def step_silences() -> list[tuple[float, float]]:
+            if audio_ok and transcribe_silences:
+                silences = transcribe_silences[-1]
+                write_silences_json(silences, silences_path)
+                emit_log(f"STEP 4: Reusing {len(silences)} silences found during transcription")
+                notify_progress("step_4_silences", 1.0, message="Silence detection complete")
+                return silences
             silences = (
                 detect_silences(
-                    str(audio_output_path),
+                    str(audio_input_path),
                     noise=SILENCE_DETECTION_NOISE,
                     min_duration=SILENCE_DETECTION_MIN_DURATION,
                     progress_callback=lambda fraction, timestamp: notify_progress(
@@ -866,8 +966,11 @@ def process_video(
         raw_clips_dir = project_dir / "clips_raw"
         subtitles_dir = project_dir / "subtitles"
         shorts_dir = project_dir / "shorts"
+        render_metrics_path = project_dir / "render_metrics.jsonl"
 
-        clips_dir.mkdir(parents=True, exist_ok=True)
+        save_intermediate_clips = bool(config.SAVE_INTERMEDIATE_CLIPS)
+        if save_intermediate_clips:
+            clips_dir.mkdir(parents=True, exist_ok=True)
         if EXPORT_RAW_CLIPS:
             raw_clips_dir.mkdir(parents=True, exist_ok=True)
         subtitles_dir.mkdir(parents=True, exist_ok=True)
@@ -1011,7 +1114,10 @@ def process_video(
                 refined_candidates = load_candidates_json(candidates_path)
             else:
                 refined_candidates = []
-                for clip_file in sorted(clips_dir.glob("clip_*.mp4")):
+                clip_files = sorted(clips_dir.glob("clip_*.mp4")) or sorted(
+                    shorts_dir.glob("clip_*.mp4")
+                )
+                for clip_file in clip_files:
                     match = re.search(r"clip_(\d+\.\d+)-(\d+\.\d+)_", clip_file.name)
                     if match:
                         refined_candidates.append(
@@ -1044,6 +1150,28 @@ def process_video(
                     )
                 )
 
+        if TRANSCRIBE_FAST_MODEL and refined_candidates and audio_input_path.exists():
+            # Word-accurate text only for the ranges that will be rendered
+            def step_refine_transcript() -> list[tuple[float, float]]:
+                return refine_transcript_ranges(
+                    transcript_output_path,
+                    audio_input_path,
+                    [(c.start, c.end) for c in refined_candidates],
+                    model_size=WHISPER_MODEL,
+                    progress_callback=lambda fraction: notify_progress(
+                        "step_6_refine_transcript",
+                        fraction,
+                        message=f"Refining clip transcripts {fraction * 100:.0f}%",
+                    ),
+                )
+
+            refined_ranges = run_pipeline_step(
+                f"STEP 6T: Re-transcribing {len(refined_candidates)} clip ranges with {WHISPER_MODEL}",
+                step_refine_transcript,
+                step_key="step_6_refine_transcript",
+            )
+            emit_log(f"STEP 6T: Refined {len(refined_ranges)} transcript range(s)")
+
         total_candidates = len(refined_candidates)
 
         produce_step_id = "step_7_produce"
@@ -1117,10 +1245,40 @@ def process_video(
                     )
                 )
 
-        produced_count = 0
+        # Clips are produced concurrently, so completion counters are tracked per
+        # stage rather than derived from the candidate index.
+        stage_lock = Lock()
+        stage_completed: dict[str, int] = {
+            "step_7_cut": 0,
+            "step_7_subtitles": 0,
+            "step_7_render": 0,
+            "step_7_descriptions": 0,
+            produce_step_id: 0,
+        }
+
+        # Clips awaiting review render as cheap proxies; only the ones still
+        # present after the review are promoted to full quality.
+        render_proxies = bool(
+            pause_for_review and review_gate is not None and RENDER_PROXY_FOR_REVIEW
+        )
+        proxy_outputs: list[Path] = []
+
+        def advance_stage(step_id: str, describe: Callable[[int], str]) -> None:
+            if not total_candidates:
+                return
+            with stage_lock:
+                stage_completed[step_id] += 1
+                completed = stage_completed[step_id]
+                notify_progress(
+                    step_id,
+                    completed / total_candidates,
+                    message=describe(completed),
+                    extra={"completed": completed, "total": total_candidates},
+                )
 
-        for idx, candidate in enumerate(refined_candidates, start=1):
+        def produce_clip(idx: int, candidate: ClipCandidate) -> bool:
             ensure_not_cancelled()
+
             def step_cut() -> Path | None:
                 return save_clip_from_candidate(
                     video_output_path,
@@ -1129,7 +1287,12 @@ def process_video(
                     reencode=True,
                 )
 
-            if should_run(6):
+            # By default shorts render straight from the project video range;
+            # intermediate re-encoded clips are only cut when requested.
+            render_source = video_output_path
+            render_start: float | None = None
+            render_end: float | None = None
+            if save_intermediate_clips and should_run(6):
                 clip_path = run_pipeline_step(
                     f"STEP 7.{idx}: Cutting clip -> {clips_dir}",
                     step_cut,
@@ -1144,27 +1307,35 @@ def process_video(
                         "Clip cutting failed",
                         f"Failed to cut clip {idx} for video {yt_url}",
                     )
-                    continue
-            else:
+                    return False
+                render_source = clip_path
+                clip_name = clip_path.stem
+            elif save_intermediate_clips:
                 clip_path = clips_dir / (
-                    f"clip_{candidate.start:.2f}-{candidate.end:.2f}_r{candidate.rating:.1f}.mp4"
+                    f"{clip_stem(candidate.start, candidate.end, candidate.rating)}.mp4"
                 )
                 if not clip_path.exists():
                     emit_log(
                         f"{Fore.RED}STEP 7.{idx}: Expected clip not found -> {clip_path}{Style.RESET_ALL}",
                         level="error",
                     )
-                    continue
+                    return False
+                render_source = clip_path
+                clip_name = clip_path.stem
+            else:
+                render_start, render_end = resolve_candidate_range(candidate)
+                clip_name = clip_stem(render_start, render_end, candidate.rating)
 
-            if total_candidates:
-                notify_progress(
-                    "step_7_cut",
-                    idx / total_candidates,
-                    message=f"Cut {idx} of {total_candidates} clips",
-                    extra={"completed": idx, "total": total_candidates},
-                )
+            advance_stage(
+                "step_7_cut",
+                lambda completed: (
+                    f"Cut {completed} of {total_candidates} clips"
+                    if save_intermediate_clips
+                    else f"Prepared {completed} of {total_candidates} clip ranges"
+                ),
+            )
 
-            srt_path = subtitles_dir / f"{clip_path.stem}.srt"
+            srt_path = subtitles_dir / f"{clip_name}.srt"
 
             def step_subtitles() -> Path:
                 return build_srt_for_range(
@@ -1185,35 +1356,46 @@ def process_video(
                     f"{Fore.YELLOW}Skipping STEP 7.{idx}: assuming subtitles exist at {srt_path}{Style.RESET_ALL}",
                     level="warning",
                 )
-            if total_candidates:
-                notify_progress(
-                    "step_7_subtitles",
-                    idx / total_candidates,
-                    message=f"Subtitles generated for clip {idx}/{total_candidates}",
-                    extra={"completed": idx, "total": total_candidates},
-                )
+            advance_stage(
+                "step_7_subtitles",
+                lambda completed: f"Subtitles generated for clip {completed}/{total_candidates}",
+            )
 
-            vertical_output = shorts_dir / f"{clip_path.stem}.mp4"
+            vertical_output = shorts_dir / f"{clip_name}.mp4"
+            render_profiler = RenderProfiler() if RENDER_PROFILE else None
 
             def step_render() -> Path:
                 return render_vertical_with_captions(
-                    clip_path,
+                    render_source,
                     srt_path,
                     vertical_output,
                     layout=active_layout_definition,
+                    source_start=render_start,
+                    source_end=render_end,
+                    proxy=render_proxies,
+                    thumbnails=RENDER_THUMBNAILS,
+                    profiler=render_profiler,
                 )
 
             if should_run(8):
-                run_pipeline_step(
+                _run_profiled_render(
+                    run_pipeline_step,
                     f"STEP 7.{idx}: Rendering vertical video with captions -> {vertical_output}",
                     step_render,
                     step_key=f"step_7_render_{idx}",
+                    profiler=render_profiler,
+                    metrics_path=render_metrics_path,
+                    record={"clip": clip_name, "proxy": render_proxies},
+                    lock=stage_lock,
                 )
             else:
                 emit_log(
                     f"{Fore.YELLOW}Skipping STEP 7.{idx}: assuming video exists at {vertical_output}{Style.RESET_ALL}",
                     level="warning",
                 )
+            if render_proxies and vertical_output.exists():
+                with stage_lock:
+                    proxy_outputs.append(vertical_output)
             if vertical_output.exists():
                 write_adjustment_metadata(
                     vertical_output,
@@ -1223,15 +1405,12 @@ def process_video(
                     original_end_seconds=float(candidate.end),
                     layout_id=active_layout_definition.id,
                 )
-            if total_candidates:
-                notify_progress(
-                    "step_7_render",
-                    idx / total_candidates,
-                    message=f"Rendered {idx} of {total_candidates} clips",
-                    extra={"completed": idx, "total": total_candidates},
-                )
+            advance_stage(
+                "step_7_render",
+                lambda completed: f"Rendered {completed} of {total_candidates} clips",
+            )
 
-            description_path = shorts_dir / f"{clip_path.stem}.txt"
+            description_path = shorts_dir / f"{clip_name}.txt"
 
             def step_description() -> Path:
                 tags = generate_hashtag_strings(
@@ -1281,22 +1460,14 @@ def process_video(
                     f"{Fore.YELLOW}Skipping STEP 7.{idx}: assuming description exists at {description_path}{Style.RESET_ALL}",
                     level="warning",
                 )
-            if total_candidates:
-                notify_progress(
-                    "step_7_descriptions",
-                    idx / total_candidates,
-                    message=f"Descriptions prepared for {idx} of {total_candidates} clips",
-                    extra={"completed": idx, "total": total_candidates},
-                )
-
-            if total_candidates:
-                produced_count += 1
-                notify_progress(
-                    produce_step_id,
-                    produced_count / total_candidates,
-                    message=f"Produced {produced_count} of {total_candidates} clips",
-                    extra={"completed": produced_count, "total": total_candidates},
-                )
+            advance_stage(
+                "step_7_descriptions",
+                lambda completed: f"Descriptions prepared for {completed} of {total_candidates} clips",
+            )
+            advance_stage(
+                produce_step_id,
+                lambda completed: f"Produced {completed} of {total_candidates} clips",
+            )
 
             if observer:
                 try:
@@ -1344,6 +1515,19 @@ def process_video(
                         },
                     )
                 )
+            return True
+
+        clip_workers = max(1, int(config.CLIP_PRODUCTION_MAX_WORKERS or 1))
+        if total_candidates > 1 and clip_workers > 1:
+            emit_log(
+                f"[Pipeline] Producing clips with {min(clip_workers, total_candidates)} workers"
+            )
+        process_as_completed(
+            refined_candidates,
+            produce_clip,
+            max_workers=clip_workers,
+        )
+        produced_count = stage_completed[produce_step_id]
 
         if pause_for_review and total_candidates and review_gate is not None:
             emit_log(
@@ -1361,6 +1545,21 @@ def process_video(
             review_gate()
             ensure_not_cancelled()
             emit_log("Resuming pipeline after manual review.", level="info")
+
+            # Deleted clips took their proxy state with them; adjusted clips
+            # carry the state of their latest proxy render.
+            approved = [path for path in proxy_outputs if is_proxy_render(path)]
+            if approved:
+                emit_log(f"Promoting {len(approved)} reviewed clips to full quality.")
+
+                def promote_clip(idx: int, short_path: Path) -> Path:
+                    return run_pipeline_step(
+                        f"STEP 7.{idx}: Rendering final quality -> {short_path}",
+                        lambda: promote_proxy_render(short_path),
+                        step_key=f"step_7_promote_{idx}",
+                    )
+
+                process_as_completed(approved, promote_clip, max_workers=clip_workers)
         else:
             ensure_not_cancelled()
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 import json
 import re
 from pathlib import Path
@@ -18,6 +18,18 @@ from config import (
 )
 from custom_types.tone import ToneStrategy
 from ..silence import snap_start_to_silence, snap_end_to_silence
+from ..timeline_index import TimelineIndex
+
+# Interval lists the snapping helpers accept; a ``TimelineIndex`` built once
+# per project answers each lookup with a binary search instead of a scan.
+Ranges = List[Tuple[float, float]] | TimelineIndex
+Items = List[Tuple[float, float, str]] | TimelineIndex
+Words = List[dict] | TimelineIndex
+
+
+def _containing(index: TimelineIndex, t: float) -> Optional[Sequence]:
+    idx = index.containing(t)
+    return None if idx is None else index.items[idx]
 
 def _elog(msg: str) -> None:
     if DEBUG_ENFORCE:
@@ -142,7 +154,7 @@ def parse_ffmpeg_silences(log_text: str) -> List[Tuple[float, float]]:
 def snap_to_silence(
     start: float,
     end: float,
-    silences: List[Tuple[float, float]],
+    silences: Ranges,
     *,
     pre_leadin: float = 0.25,
     post_tail: float = 0.45,
@@ -184,14 +196,19 @@ def snap_to_silence(
 # Word-boundary utility (optional if you have word timestamps)
 # -----------------------------
 
-def snap_to_word_boundaries(start: float, end: float, words: List[dict]) -> Tuple[float, float]:
+def snap_to_word_boundaries(start: float, end: float, words: Words) -> Tuple[float, float]:
     """Clamp to the first/last word overlapping [start,end]. words = [{start,end,text}, ...]."""
     if not words:
         return start, end
-    # first word whose end >= start
-    s_idx = next((i for i, w in enumerate(words) if float(w.get("end", 0)) >= start), None)
-    # last word whose start <= end
-    e_idx = next((i for i in range(len(words) - 1, -1, -1) if float(words[i].get("start", inf)) <= end), None)
+    if isinstance(words, TimelineIndex):
+        s_idx = words.first_ending_at_or_after(start)
+        e_idx = words.last_starting_at_or_before(end)
+        words = words.items
+    else:
+        # first word whose end >= start
+        s_idx = next((i for i, w in enumerate(words) if float(w.get("end", 0)) >= start), None)
+        # last word whose start <= end
+        e_idx = next((i for i in range(len(words) - 1, -1, -1) if float(words[i].get("start", inf)) <= end), None)
     if s_idx is None or e_idx is None or e_idx < s_idx:
         return start, end
     s = float(words[s_idx].get("start", start))
@@ -206,17 +223,23 @@ def snap_to_word_boundaries(start: float, end: float, words: List[dict]) -> Tupl
 # -----------------------------
 
 def snap_start_to_dialog_start(
-    start: float, ranges: List[Tuple[float, float]]
+    start: float, ranges: Ranges
 ) -> float:
     """Snap ``start`` to the beginning of the dialog range containing it."""
+    if isinstance(ranges, TimelineIndex):
+        found = _containing(ranges, start)
+        return start if found is None else found[0]
     for s, e in ranges:
         if s <= start <= e:
             return s
     return start
 
 
-def snap_end_to_dialog_end(end: float, ranges: List[Tuple[float, float]]) -> float:
+def snap_end_to_dialog_end(end: float, ranges: Ranges) -> float:
     """Snap ``end`` to the conclusion of the dialog range containing it."""
+    if isinstance(ranges, TimelineIndex):
+        found = _containing(ranges, end)
+        return end if found is None else found[1]
     for s, e in ranges:
         if s <= end <= e:
             return e
@@ -241,7 +264,7 @@ def duration_score(
 
 
 def _extend_to_quote_end(
-    end: float, quote: str, items: List[Tuple[float, float, str]], *, gap: float = 0.6
+    end: float, quote: str, items: Items, *, gap: float = 0.6
 ) -> float:
     """Extend ``end`` forward through contiguous repeats of ``quote``.
 
@@ -252,26 +275,38 @@ def _extend_to_quote_end(
     """
     if not quote:
         return end
-    for idx, (s, e, txt) in enumerate(items):
-        if s <= end <= e:
-            last_end = e
-            for nxt_s, nxt_e, nxt_txt in items[idx + 1 :]:
-                if nxt_txt != quote or nxt_s - last_end > gap:
-                    break
-                last_end = nxt_e
-            return max(end, last_end)
-    return end
+    idx = _containing_position(items, end)
+    if idx is None:
+        return end
+    entries = items.items if isinstance(items, TimelineIndex) else items
+    last_end = entries[idx][1]
+    for nxt in range(idx + 1, len(entries)):
+        nxt_s, nxt_e, nxt_txt = entries[nxt]
+        if nxt_txt != quote or nxt_s - last_end > gap:
+            break
+        last_end = nxt_e
+    return max(end, last_end)
+
+
+def _containing_position(items: Items, t: float) -> Optional[int]:
+    """Position in ``items`` of the first entry with ``start <= t <= end``."""
+    if isinstance(items, TimelineIndex):
+        return items.containing(t)
+    for idx, (s, e, _) in enumerate(items):
+        if s <= t <= e:
+            return idx
+    return None
 
 
 def refine_clip_window(
     start: float,
     end: float,
-    items: List[Tuple[float, float, str]],
+    items: Items,
     *,
     strategy: ToneStrategy,
-    words: Optional[List[dict]] = None,
-    silences: Optional[List[Tuple[float, float]]] = None,
-    dialog_ranges: Optional[List[Tuple[float, float]]] = None,
+    words: Optional[Words] = None,
+    silences: Optional[Ranges] = None,
+    dialog_ranges: Optional[Ranges] = None,
     pre_leadin: float = 0.25,
     post_tail: float = 0.45,
     max_extension: float = MAX_DURATION_SECONDS,
@@ -288,6 +323,9 @@ def refine_clip_window(
 
     ``quote`` extension is attempted first but only applied if it keeps the
     duration within the maximum.
+
+    Any of ``items``, ``words``, ``silences`` and ``dialog_ranges`` may be a
+    :class:`TimelineIndex`; callers refining many clips should pass indexes.
     """
     # Start with original bounds
     s = start
@@ -346,7 +384,7 @@ def refine_clip_window(
 
 def _snap_end_to_segment_end(
     end_time: float,
-    items: List[Tuple[float, float, str]],
+    items: Items,
     *,
     max_extension: float = MAX_DURATION_SECONDS,
 ) -> float:
@@ -357,33 +395,38 @@ def _snap_end_to_segment_end(
     character).  Iteration stops if adding the next segment would extend the
     clip beyond ``max_extension`` seconds from the original ``end_time``.
     """
-    for idx, (s, e, _) in enumerate(items):
-        if s <= end_time <= e:
-            end = e
+    idx = _containing_position(items, end_time)
+    if idx is None:
+        return end_time
+    entries = items.items if isinstance(items, TimelineIndex) else items
+    end = entries[idx][1]
+    if end - end_time >= max_extension:
+        return end_time + max_extension
+    for nxt in range(idx + 1, len(entries)):
+        nxt_s, nxt_e, nxt_txt = entries[nxt]
+        gap = nxt_s - end
+        if gap > 0.6:
+            break
+        if nxt_e - end_time > max_extension:
+            break
+        first = nxt_txt.lstrip()[:1]
+        if first and first.islower():
+            end = nxt_e
             if end - end_time >= max_extension:
                 return end_time + max_extension
-            for nxt_s, nxt_e, nxt_txt in items[idx + 1 :]:
-                gap = nxt_s - end
-                if gap > 0.6:
-                    break
-                if nxt_e - end_time > max_extension:
-                    break
-                first = nxt_txt.lstrip()[:1]
-                if first and first.islower():
-                    end = nxt_e
-                    if end - end_time >= max_extension:
-                        return end_time + max_extension
-                    continue
-                break
-            return end
-    return end_time
+            continue
+        break
+    return end
 
 
 def _snap_start_to_segment_start(
-    start_time: float, items: List[Tuple[float, float, str]]
+    start_time: float, items: Items
 ) -> float:
     """If start_time lands inside a spoken segment, snap to that segment's start so we don't cut mid-line.
     If it lands in silence between segments, return unchanged."""
+    if isinstance(items, TimelineIndex):
+        found = _containing(items, start_time)
+        return start_time if found is None else found[0]
     for s, e, _ in items:
         if s <= start_time <= e:
             return s
@@ -391,9 +434,12 @@ def _snap_start_to_segment_start(
 
 
 def _snap_end_to_sentence_end(
-    time: float, segments: List[Tuple[float, float, str]]
+    time: float, segments: Items
 ) -> float:
     """Snap ``time`` to the end of the sentence/beat containing it."""
+    if isinstance(segments, TimelineIndex):
+        found = _containing(segments, time)
+        return time if found is None else found[1]
     for s, e, _ in segments:
         if s <= time <= e:
             return e
@@ -401,9 +447,12 @@ def _snap_end_to_sentence_end(
 
 
 def _snap_start_to_sentence_start(
-    time: float, segments: List[Tuple[float, float, str]]
+    time: float, segments: Items
 ) -> float:
     """Snap ``time`` to the beginning of the sentence/beat containing it."""
+    if isinstance(segments, TimelineIndex):
+        found = _containing(segments, time)
+        return time if found is None else found[0]
     for s, e, _ in segments:
         if s <= time <= e:
             return s
@@ -615,6 +664,12 @@ def _enforce_non_overlap(
             if (c.end - c.start) >= min_duration_seconds and c.rating >= min_rating
         ]
 
+    # Built once here rather than scanned per candidate
+    item_index = TimelineIndex.of(items)
+    word_index = TimelineIndex.of(words)
+    silence_index = TimelineIndex.of(silences)
+    dialog_index = TimelineIndex.of(dialog_ranges)
+
     adjusted: List[ClipCandidate] = []
     for c in candidates:
         if c.rating < min_rating:
@@ -625,11 +680,11 @@ def _enforce_non_overlap(
         s, e = refine_clip_window(
             c.start,
             c.end,
-            items,
+            item_index,
             strategy=strategy,
-            words=words,
-            silences=silences,
-            dialog_ranges=dialog_ranges,
+            words=word_index,
+            silences=silence_index,
+            dialog_ranges=dialog_index,
             max_extension=headroom,
             quote=c.quote,
         )
@@ -759,6 +814,7 @@ __all__ = [
     "load_candidates_json",
     "parse_transcript",
     "parse_ffmpeg_silences",
+    "TimelineIndex",
     "snap_to_silence",
     "snap_start_to_dialog_start",
     "snap_end_to_dialog_end",
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import math
 import time
 from pathlib import Path
-from typing import Any, Callable, List, Tuple
+from typing import Any, Callable, Iterator, List, Tuple
 from datetime import datetime
 from tqdm import tqdm
 
@@ -13,10 +14,13 @@ from config import (
     WINDOW_SIZE_SECONDS,
     MIN_DURATION_SECONDS,
     LOCAL_LLM_MODEL,
+    LLM_WINDOW_CONCURRENCY,
 )
 
+from common.thread_pool import imap_bounded
 from custom_types.tone import ToneStrategy
 from custom_types.ETone import Tone
+from helpers.transcript import TranscriptStream
 
 from . import ClipCandidate, _filter_promotional_candidates
 from .helpers import (
@@ -37,8 +41,11 @@ from .prompts import (
     HEALTH_PROMPT_DESC,
     build_window_prompt,
 )
+from .windowing import TranscriptWindows
 
-_TOTAL_LLM_SECONDS = 0.0
+# Summed latency of every window request; requests overlap, so this exceeds
+# the wall time spent scanning
+_TOTAL_LLM_REQUEST_SECONDS = 0.0
 
 def _log(msg: str) -> None:
     print(msg)
@@ -70,25 +77,51 @@ STRATEGY_REGISTRY: dict[Tone, ToneStrategy] = {
 
 
 def _window_items(
-    items: List[Tuple[float, float, str]],
+    items: List[Tuple[float, float, str]] | TranscriptWindows,
     window: float = WINDOW_SIZE_SECONDS,
     overlap: float = WINDOW_OVERLAP_SECONDS,
 ) -> List[Tuple[float, float, List[Tuple[float, float, str]]]]:
     """Return sliding windows across transcript items."""
-    if not items:
-        return []
-    start = items[0][0]
-    end = items[-1][1]
+    if not isinstance(items, TranscriptWindows):
+        items = TranscriptWindows(items)
+    return list(items.windows(window, overlap))
+
+
+def _stream_windows(
+    stream: TranscriptStream,
+    window: float = WINDOW_SIZE_SECONDS,
+    overlap: float = WINDOW_OVERLAP_SECONDS,
+    context: float = 0.0,
+    timeline: TranscriptWindows | None = None,
+) -> Iterator[Tuple[float, float, List[Tuple[float, float, str]]]]:
+    """Yield the windows of :func:`_window_items` as ``stream`` covers them.
+
+    Each window is yielded once a segment starting after its end plus
+    ``context`` seconds is published (or the stream closes), so callers can
+    process it while transcription is still running. ``timeline`` is kept in
+    sync with the stream and holds every item overlapping the window and its
+    context when the window is yielded.
+    """
+    timeline = TranscriptWindows() if timeline is None else timeline
+    if not stream.wait_until(0.0):
+        return
+    timeline.sync(stream.items)
+    start = timeline.items[0][0]
     step = window - overlap
-    windows: List[Tuple[float, float, List[Tuple[float, float, str]]]] = []
     t = start
-    while t < end:
+    while True:
         w_end = t + window
-        win = [it for it in items if it[1] > t and it[0] < w_end]
+        # Every item that can overlap the window or its context is published
+        stream.wait_past(w_end + context)
+        # Read before syncing so a closed stream is synced in full
+        closed = stream.closed
+        timeline.sync(stream.items)
+        if closed and t >= timeline.items[-1][1]:
+            return
+        win = timeline.overlapping(t, w_end)
         if win:
-            windows.append((t, w_end, win))
+            yield (t, w_end, win)
         t += step
-    return windows
 
 
 ProgressCallback = Callable[[int, int], None]
@@ -105,9 +138,14 @@ def find_candidates_by_tone(
     dialog_ranges: Any | None = None,
     silences: Any | None = None,
     progress_callback: ProgressCallback | None = None,
+    transcript_stream: TranscriptStream | None = None,
     **_: Any,
 ) -> List[ClipCandidate] | tuple[List[ClipCandidate], List[ClipCandidate], List[ClipCandidate]]:
-    """Generic windowed candidate finder parameterized by ``Tone``."""
+    """Generic windowed candidate finder parameterized by ``Tone``.
+
+    With ``transcript_stream`` the windows are scanned as transcription
+    publishes them instead of reading ``transcript_path`` up front.
+    """
 
     from . import local_llm_call_json
 
@@ -115,9 +153,20 @@ def find_candidates_by_tone(
     min_rating = pipeline_config.DEFAULT_MIN_RATING if min_rating is None else min_rating
     min_words = strategy.min_words if min_words is None else min_words
 
-    items = parse_transcript(transcript_path)
-    windows = _window_items(items)
-    total_windows = len(windows)
+    context = WINDOW_SIZE_SECONDS * WINDOW_CONTEXT_PERCENTAGE
+    if transcript_stream is not None:
+        items = transcript_stream.items
+        timeline = TranscriptWindows()
+        windows = _stream_windows(transcript_stream, context=context, timeline=timeline)
+        # Estimated from the media duration; 0 when unknown
+        step = WINDOW_SIZE_SECONDS - WINDOW_OVERLAP_SECONDS
+        duration = transcript_stream.duration or 0.0
+        total_windows = math.ceil(duration / step) if duration and step > 0 else 0
+    else:
+        items = parse_transcript(transcript_path)
+        timeline = TranscriptWindows(items)
+        windows = _window_items(timeline)
+        total_windows = len(windows)
 
     _log(
         f"Run started {datetime.utcnow().isoformat()}Z | tone={tone.name} | windows={total_windows} | min_rating={min_rating}"
@@ -127,19 +176,12 @@ def find_candidates_by_tone(
         progress_callback(0, total_windows)
 
     all_candidates: List[ClipCandidate] = []
-    context = WINDOW_SIZE_SECONDS * WINDOW_CONTEXT_PERCENTAGE
 
-    global _TOTAL_LLM_SECONDS
-    for index, (win_start, win_end, win_items) in enumerate(
-        tqdm(windows, total=total_windows, desc="[Tone] windows", unit="window"),
-        start=1,
-    ):
-        ctx_items = [
-            it
-            for it in items
-            if it[1] > win_start - context and it[0] < win_end + context
-        ]
-        text = "\n".join(f"[{s:.2f}-{e:.2f}] {t}" for s, e, t in ctx_items)
+    def scan_window(
+        _index: int, window: Tuple[float, float, List[Tuple[float, float, str]]]
+    ) -> Tuple[List[Any] | None, float]:
+        win_start, win_end, _win_items = window
+        text = timeline.text(win_start - context, win_end + context)
         prompt = build_window_prompt(
             strategy.prompt_desc,
             text,
@@ -150,12 +192,28 @@ def find_candidates_by_tone(
                 model=LOCAL_LLM_MODEL, prompt=prompt, options={"temperature": 0.2}
             )
         except Exception as e:
-            continue
-        elapsed = time.perf_counter() - start_t
-        _TOTAL_LLM_SECONDS += elapsed
+            # One failed window must not sink the scan
+            _log(f"Window {win_start:.2f}-{win_end:.2f} failed: {e}")
+            return None, time.perf_counter() - start_t
+        return arr, time.perf_counter() - start_t
+
+    global _TOTAL_LLM_REQUEST_SECONDS
+    scanned = 0
+    scan_started = time.perf_counter()
+    # Requests overlap up to LLM_WINDOW_CONCURRENCY; results arrive in window order
+    for index, _window, (arr, elapsed) in tqdm(
+        imap_bounded(windows, scan_window, max_workers=LLM_WINDOW_CONCURRENCY),
+        total=total_windows or None,
+        desc="[Tone] windows",
+        unit="window",
+    ):
+        scanned = index
+        _TOTAL_LLM_REQUEST_SECONDS += elapsed
 
         if progress_callback is not None:
-            progress_callback(index, total_windows)
+            progress_callback(index, max(index, total_windows))
+        if arr is None:
+            continue
         for it in arr:
             start_val = _to_float(_get_field(it, "start"))
             end_val = _to_float(_get_field(it, "end"))
@@ -171,6 +229,8 @@ def find_candidates_by_tone(
                 ClipCandidate(start=start_val, end=end_val, rating=rating, reason=reason, quote=quote)
             )
 
+    scan_seconds = time.perf_counter() - scan_started
+
     filtered = [c for c in all_candidates if c.rating >= min_rating]
     filtered = _filter_promotional_candidates(filtered, items)
     merged = _merge_adjacent_candidates(filtered, merge_overlaps=True)
@@ -191,9 +251,11 @@ def find_candidates_by_tone(
         )
 
     _log(
-        f"Run summary | tone={tone.name} | all_candidates={len(all_candidates)} | rated_ge_min={len(filtered)} | merged={len(merged)} | final={len(final)} | total_llm_seconds={_TOTAL_LLM_SECONDS:.2f}"
+        f"Run summary | tone={tone.name} | all_candidates={len(all_candidates)} | rated_ge_min={len(filtered)} | merged={len(merged)} | final={len(final)} | scan_seconds={scan_seconds:.2f} | llm_request_seconds={_TOTAL_LLM_REQUEST_SECONDS:.2f}"
     )
 
+    if transcript_stream is not None:
+        total_windows = scanned
     if progress_callback is not None:
         progress_callback(total_windows, total_windows)
 
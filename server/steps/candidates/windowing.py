@@ -0,0 +1,111 @@
+"""Sliding windows and prompt context over transcript items.
+
+The tone scan asks, for every window, which transcript items overlap it and
+what the prompt text of the surrounding context is. Filtering the whole
+transcript for each window costs O(windows x items). :class:`TranscriptWindows`
+keeps the starts and the running maximum of the ends in start order and
+formats every line once, so each query is two binary searches plus a slice
+the size of its answer.
+
+Items passed to the constructor are sorted by start (stably, so transcripts
+already in order keep their order). The index can grow with
+:meth:`TranscriptWindows.sync`, which lets the streaming scan follow a
+transcript that is still being produced; appended items must not start
+before the last one.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Sequence, Tuple
+
+Item = Tuple[float, float, str]
+Window = Tuple[float, float, List[Item]]
+
+
+def format_line(item: Item) -> str:
+    """Prompt line for one transcript item."""
+
+    s, e, t = item
+    return f"[{s:.2f}-{e:.2f}] {t}"
+
+
+class TranscriptWindows:
+    """Start-ordered transcript items with O(log n) overlap lookups.
+
+    ``reach[i]`` is the largest end among items ``0..i``; it never decreases,
+    so the first item that can still overlap a range is a binary search even
+    when segments overlap each other.
+    """
+
+    __slots__ = ("items", "starts", "ends", "reach", "lines")
+
+    def __init__(self, items: Sequence[Item] = ()) -> None:
+        self.items: List[Item] = []
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.reach: List[float] = []
+        self.lines: List[str] = []
+        self.extend(sorted(items, key=lambda item: float(item[0])))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def extend(self, items: Sequence[Item]) -> None:
+        """Append ``items``, which must continue the start order."""
+
+        for item in items:
+            start, end = float(item[0]), float(item[1])
+            if self.starts and start < self.starts[-1]:
+                raise ValueError(f"transcript item at {start:.2f}s arrived after {self.starts[-1]:.2f}s")
+            self.starts.append(start)
+            self.ends.append(end)
+            self.reach.append(max(end, self.reach[-1]) if self.reach else end)
+            self.lines.append(format_line(item))
+            # Appended last: readers on other threads only look below len(items)
+            self.items.append(item)
+
+    def sync(self, items: Sequence[Item]) -> None:
+        """Append the entries of the growing list ``items`` not seen yet."""
+
+        self.extend(items[len(self.items) :])
+
+    def _overlapping(self, start: float, end: float) -> List[int]:
+        count = len(self.items)
+        lo = bisect_right(self.reach, start, 0, count)
+        hi = bisect_left(self.starts, end, lo, count)
+        ends = self.ends
+        return [i for i in range(lo, hi) if ends[i] > start]
+
+    def overlapping(self, start: float, end: float) -> List[Item]:
+        """Items with ``item_end > start`` and ``item_start < end``."""
+
+        items = self.items
+        return [items[i] for i in self._overlapping(start, end)]
+
+    def text(self, start: float, end: float) -> str:
+        """Prompt text of the items overlapping ``(start, end)``."""
+
+        lines = self.lines
+        return "\n".join(lines[i] for i in self._overlapping(start, end))
+
+    def windows(self, window: float, overlap: float) -> Iterator[Window]:
+        """Sliding ``window``-second windows stepping by ``window - overlap``.
+
+        Empty windows are skipped.
+        """
+
+        if not self.items:
+            return
+        step = window - overlap
+        t = self.items[0][0]
+        end = self.items[-1][1]
+        while t < end:
+            w_end = t + window
+            win = self.overlapping(t, w_end)
+            if win:
+                yield (t, w_end, win)
+            t += step
+
+
+__all__ = ["TranscriptWindows", "format_line"]
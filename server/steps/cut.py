@@ -92,16 +92,18 @@ def save_clip(
 
 
 
-def save_clip_from_candidate(
-    video_path: str | Path,
-    output_dir: str | Path,
+def clip_stem(start: float, end: float, rating: float) -> str:
+    """Return the canonical ``clip_<start>-<end>_r<rating>`` name for a clip."""
+    return f"clip_{start:.2f}-{end:.2f}_r{rating:.1f}"
+
+
+def resolve_candidate_range(
     candidate: ClipCandidate,
     *,
     transcript_path: str | Path | None = None,
-    reencode: bool = False,
     max_duration_seconds: float = MAX_DURATION_SECONDS,
-) -> Path | None:
-    """Convenience wrapper that names the clip using timestamps and rating.
+) -> tuple[float, float]:
+    """Snap and truncate ``candidate`` in place and return its final range.
 
     If ``transcript_path`` is provided, the candidate start/end are snapped to
     natural sentence boundaries so the clip ends on a pause or completed
@@ -120,8 +122,28 @@ def save_clip_from_candidate(
 
     candidate.start = start
     candidate.end = end
+    return start, end
+
 
-    out = Path(output_dir) / f"clip_{start:.2f}-{end:.2f}_r{candidate.rating:.1f}.mp4"
+def save_clip_from_candidate(
+    video_path: str | Path,
+    output_dir: str | Path,
+    candidate: ClipCandidate,
+    *,
+    transcript_path: str | Path | None = None,
+    reencode: bool = False,
+    max_duration_seconds: float = MAX_DURATION_SECONDS,
+) -> Path | None:
+    """Convenience wrapper that names the clip using timestamps and rating.
+
+    The range is resolved with :func:`resolve_candidate_range`.
+    """
+    start, end = resolve_candidate_range(
+        candidate,
+        transcript_path=transcript_path,
+        max_duration_seconds=max_duration_seconds,
+    )
+
+    out = Path(output_dir) / f"{clip_stem(start, end, candidate.rating)}.mp4"
     ok = save_clip(video_path, out, start=start, end=end, reencode=reencode)
     return out if ok else None
-
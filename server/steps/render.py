@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List, Tuple, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import cv2
 cv2.ocl.setUseOpenCL(True)
@@ -19,6 +19,7 @@ import json
 import subprocess
 import os
 import shutil
+import time
 
 # --- Diagnostics: show whether OpenCL/FFMPEG are available (once per import) ---
 def _log_build_info_once():
@@ -47,7 +48,14 @@ from config import (
     CAPTION_USE_COLORS,
     OUTPUT_FPS,
     VIDEO_ZOOM_RATIO,
+    RENDER_BACKEND,
+    RENDER_ENCODER,
     RENDER_LAYOUT,
+    RENDER_PROXY_CRF,
+    RENDER_PROXY_PRESET,
+    RENDER_PROXY_SCALE,
+    RENDER_SPRITE_INTERVAL,
+    RENDER_SPRITE_TILE_WIDTH,
 )
 from layouts import (
     LayoutCanvas,
@@ -57,20 +65,33 @@ from layouts import (
     load_layout,
     prepare_layout,
 )
+from .rendering import (
+    CaptionEntry,
+    CaptionRasterizer,
+    CaptionStyle,
+    CaptionTimeline,
+    CaptionWord,
+    FrameBufferPool,
+    FrameCompositor,
+    RenderProfiler,
+    ThumbnailCollector,
+    assign_words_to_entries,
+    build_static_layers,
+    encode_output_args,
+    UnsupportedLayoutError,
+    move_thumbnails,
+    open_ffmpeg_writer,
+    parse_color_hex,
+    remove_thumbnails,
+    render_with_filtergraph,
+    run_render_stages,
+    split_long_captions,
+    wrap_caption_text,
+)
+from .subtitle import write_ass_subtitles
 
-@dataclass
-class CaptionWord:
-    start: float
-    end: float
-    text: str
-
-
-@dataclass
-class CaptionEntry:
-    start: float
-    end: float
-    text: str
-    words: List[CaptionWord]
+_CAPTION_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_CAPTION_LINE_TYPE = cv2.LINE_AA
 
 
 def _open_writer(path, fps, size):
@@ -98,142 +119,812 @@ def _open_writer(path, fps, size):
 
 
 
-def render_vertical_with_captions(
-    clip_path: str | Path,
-    captions: Optional[Union[List[Tuple[float, float, str]], List[dict], str, Path]] = None,
-    output_path: str | Path = None,
+# Sidecar recording how a proxy short was rendered so it can be promoted
+RENDER_STATE_SUFFIX = ".render.json"
+
+
+def _proxy_size(value: int) -> int:
+    # yuv420p needs even dimensions
+    return max(2, int(round(value * RENDER_PROXY_SCALE / 2)) * 2)
+
+
+def _save_render_state(output: Path, state: Optional[dict]) -> None:
+    """Record the arguments of a proxy render, or drop stale state after a full one."""
+
+    state_path = output.with_suffix(RENDER_STATE_SUFFIX)
+    if state is None:
+        state_path.unlink(missing_ok=True)
+        return
+    state_path.write_text(json.dumps({**state, "proxy": True}, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def load_render_state(short_path: str | Path) -> Optional[dict]:
+    """Return the saved proxy render arguments for ``short_path``, if any."""
+
+    state_path = Path(short_path).with_suffix(RENDER_STATE_SUFFIX)
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(state, dict) or not state.get("proxy") or not state.get("clip_path"):
+        return None
+    return state
+
+
+def is_proxy_render(short_path: str | Path) -> bool:
+    """Whether ``short_path`` is a review proxy awaiting promotion."""
+
+    return load_render_state(short_path) is not None
+
+
+def promote_proxy_render(
+    short_path: str | Path,
     *,
-    frame_width: int | None = None,
-    frame_height: int | None = None,
-    bottom_safe_ratio: float = 0.14,
     layout: LayoutDefinition | str | None = None,
-    font_scale: float = CAPTION_FONT_SCALE,  # baseline; may shrink to keep captions below FG
-    thickness: int = 2,
-    outline: int = 4,
-    line_spacing: int = 10,
-    max_lines: int = CAPTION_MAX_LINES,
-    wrap_width_px_ratio: float = 0.86,  # caption max width as ratio of frame_width
-    blur_ksize: int = 31,               # must be odd; background blur amount
-    use_caption_colors: bool = CAPTION_USE_COLORS,
-    fill_bgr: Tuple[int, int, int] = CAPTION_FILL_BGR,
-    outline_bgr: Tuple[int, int, int] = CAPTION_OUTLINE_BGR,
-    # NEW performance toggles
-    use_cuda: bool = True,
-    use_opencl: bool = True,
-    cache_text_layout: bool = True,
-    # audio handling (no ffmpeg for *rendering*; mux is optional)
-    mux_audio: bool = True,
+    **render_kwargs,
 ) -> Path:
-    """Render a vertical video with burned-in captions without using ffmpeg.
+    """Re-render the proxy at ``short_path`` at full quality in place.
+
+    The source, caption file, layout, source range and thumbnail setting
+    saved by the proxy render are reused, so the promoted short matches what
+    was reviewed.
+    ``layout`` overrides the saved layout id; ``render_kwargs`` are passed to
+    :func:`render_vertical_with_captions`. The proxy is only replaced once the
+    full render succeeds.
+    """
 
-    The original clip is resized and placed with blurred background and captions.
+    short_path = Path(short_path)
+    state = load_render_state(short_path)
+    if state is None:
+        raise ValueError(f"{short_path} is not a proxy render")
+    render_kwargs.setdefault("thumbnails", state.get("thumbnails", False))
+    staging = short_path.with_suffix(".promote.mp4")
+    try:
+        render_vertical_with_captions(
+            state["clip_path"],
+            state.get("captions"),
+            staging,
+            layout=layout if layout is not None else state.get("layout_id"),
+            frame_width=state.get("frame_width"),
+            frame_height=state.get("frame_height"),
+            source_start=state.get("source_start"),
+            source_end=state.get("source_end"),
+            mux_audio=state.get("mux_audio", True),
+            **render_kwargs,
+        )
+        staging.replace(short_path)
+        move_thumbnails(staging, short_path)
+    finally:
+        staging.unlink(missing_ok=True)
+        remove_thumbnails(staging)
+    _save_render_state(short_path, None)
+    return short_path
+
+
+# -----------------------------
+# Caption sources
+# -----------------------------
+
+_SRT_TIME = re.compile(r"^(\d{2}):(\d{2}):(\d{2}),(\d{3})\s+-->\s+(\d{2}):(\d{2}):(\d{2}),(\d{3})$")
+
+CaptionSource = Optional[Union[List[Tuple[float, float, str]], List[dict], str, Path]]
+
+
+def _hmsms_to_sec(h: str, m: str, s: str, ms: str) -> float:
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
+
+
+def _parse_srt_text(s: str) -> List[Tuple[float, float, str]]:
+    chunks = re.split(r"\r?\n\r?\n+", s.strip())
+    out: List[Tuple[float, float, str]] = []
+    for ch in chunks:
+        lines = [ln for ln in ch.splitlines() if ln.strip() != ""]
+        if not lines:
+            continue
+        # allow optional numeric index on first line
+        idx = 0
+        if lines and lines[0].strip().isdigit():
+            idx = 1
+        if idx >= len(lines):
+            continue
+        m = _SRT_TIME.match(lines[idx].strip())
+        if not m:
+            # not a timed block
+            continue
+        sh, sm, ss, sms, eh, em, es, ems = m.groups()
+        start = _hmsms_to_sec(sh, sm, ss, sms)
+        end = _hmsms_to_sec(eh, em, es, ems)
+        text = " ".join(ln.strip() for ln in lines[idx+1:]).strip()
+        if end > start and text:
+            out.append((start, end, text))
+    return out
+
+
+def _load_captions_from_path(p: Path) -> List[Tuple[float, float, str]]:
+    if not p.exists():
+        return []
+    suf = p.suffix.lower()
+    try:
+        data = p.read_text(encoding="utf-8")
+    except Exception:
+        data = p.read_text(errors="ignore")
+    if suf == ".srt":
+        return _parse_srt_text(data)
+    if suf == ".json":
+        try:
+            obj = json.loads(data)
+            # expect list of dicts or tuples
+            if isinstance(obj, list):
+                tmp: List[Tuple[float, float, str]] = []
+                for it in obj:
+                    if isinstance(it, dict):
+                        s = float(it.get("start", 0.0))
+                        e = float(it.get("end", it.get("stop", s)))
+                        txt = str(it.get("text", it.get("content", "")))
+                        if e > s and txt:
+                            tmp.append((s, e, txt))
+                    elif isinstance(it, (list, tuple)) and len(it) >= 3:
+                        s, e, txt = it[0], it[1], str(it[2])
+                        if float(e) > float(s) and txt:
+                            tmp.append((float(s), float(e), txt))
+                return tmp
+        except Exception:
+            return []
+    # unknown extension
+    return []
+
+
+def _load_caption_words(source: CaptionSource) -> List[CaptionWord]:
+    if isinstance(source, (str, Path)):
+        json_path = Path(source).with_suffix(".words.json")
+        if json_path.exists():
+            try:
+                data = json.loads(json_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                return []
+            words: List[CaptionWord] = []
+            for item in data.get("words", []) or []:
+                try:
+                    start = float(item.get("start"))
+                    end = float(item.get("end"))
+                except (TypeError, ValueError):
+                    continue
+                text = str(item.get("text") or item.get("word") or "").strip()
+                if not text or end <= start:
+                    continue
+                words.append(CaptionWord(start=start, end=end, text=text))
+            words.sort(key=lambda w: w.start)
+            return words
+    return []
+
+
+def _normalize_caps(caps: CaptionSource) -> List[CaptionEntry]:
+    entries: List[CaptionEntry] = []
+    if caps is None:
+        return entries
+    if isinstance(caps, (str, Path)):
+        loaded = _load_captions_from_path(Path(caps))
+    else:
+        loaded = []
+        for it in caps:
+            if isinstance(it, dict):
+                s = float(it.get("start", 0.0))
+                e = float(it.get("end", it.get("stop", s)))
+                txt = str(it.get("text", it.get("content", "")))
+            else:
+                s, e, txt = it  # type: ignore[misc]
+            if e > s and txt:
+                loaded.append((float(s), float(e), txt))
+    loaded.sort(key=lambda x: x[0])
+    for s, e, txt in loaded:
+        entries.append(CaptionEntry(start=float(s), end=float(e), text=str(txt), words=[]))
+    return entries
+
+
+def _load_caption_entries(captions: CaptionSource) -> List[CaptionEntry]:
+    """Parse ``captions`` and attach word timings from a ``.words.json`` sidecar."""
+
+    caption_entries = _normalize_caps(captions)
+    caption_words = _load_caption_words(captions)
+
+    if isinstance(captions, (str, Path)) and not caption_entries:
+        print(f"WARN: No captions parsed from {captions}. Proceeding without text.")
+
+    assign_words_to_entries(caption_entries, caption_words)
+    return caption_entries
+
+
+# -----------------------------
+# Render targets
+# -----------------------------
+
+@dataclass
+class RenderVariant:
+    """One output of :func:`render_variants_with_captions`.
+
+    ``layout`` is a layout definition or id (``None`` for the configured
+    default); ``frame_width``/``frame_height`` override its canvas size.
     """
-    clip_path = Path(clip_path)
-    output = Path(output_path) if output_path is not None else Path(clip_path).with_name(Path(clip_path).stem + "_vertical.mp4")
-    output.parent.mkdir(parents=True, exist_ok=True)
 
-    temp_video = output.with_suffix('.temp.mp4')
+    output_path: str | Path
+    layout: LayoutDefinition | str | None = None
+    frame_width: int | None = None
+    frame_height: int | None = None
+    proxy: bool = False
+
+
+@dataclass(frozen=True)
+class _RenderStyle:
+    """Caption and background settings shared by every output of a render."""
+
+    font_scale: float
+    thickness: int
+    outline: int
+    line_spacing: int
+    blur_ksize: int
+    bottom_safe_ratio: float
+    wrap_width_px_ratio: float
+    fill_color: Tuple[int, int, int]
+    highlight_color: Tuple[int, int, int]
+    outline_color: Tuple[int, int, int]
+    base_caption_color: Tuple[int, int, int] = (255, 255, 255)
+
+    @classmethod
+    def from_options(
+        cls,
+        *,
+        font_scale: float,
+        thickness: int,
+        outline: int,
+        line_spacing: int,
+        blur_ksize: int,
+        bottom_safe_ratio: float,
+        wrap_width_px_ratio: float,
+        use_caption_colors: bool,
+        fill_bgr: Tuple[int, int, int],
+        outline_bgr: Tuple[int, int, int],
+    ) -> "_RenderStyle":
+        fill_color = fill_bgr if use_caption_colors else (255, 255, 255)
+        return cls(
+            font_scale=font_scale,
+            thickness=thickness,
+            outline=outline,
+            line_spacing=line_spacing,
+            blur_ksize=blur_ksize,
+            bottom_safe_ratio=bottom_safe_ratio,
+            wrap_width_px_ratio=wrap_width_px_ratio,
+            fill_color=fill_color,
+            highlight_color=CAPTION_HIGHLIGHT_BGR if use_caption_colors else fill_color,
+            outline_color=outline_bgr if use_caption_colors else (0, 0, 0),
+        )
+
+    def scaled(self, factor: float) -> "_RenderStyle":
+        """Return the style with everything drawn in pixels scaled by ``factor``."""
+
+        return replace(
+            self,
+            font_scale=self.font_scale * factor,
+            thickness=max(1, round(self.thickness * factor)),
+            outline=max(1, round(self.outline * factor)),
+            line_spacing=max(1, round(self.line_spacing * factor)),
+            blur_ksize=max(3, round(self.blur_ksize * factor)) | 1,
+        )
 
-    fill_color = fill_bgr if use_caption_colors else (255, 255, 255)
-    highlight_color = CAPTION_HIGHLIGHT_BGR if use_caption_colors else fill_color
-    base_caption_color = (255, 255, 255)
-    outline_color = outline_bgr if use_caption_colors else (0, 0, 0)
 
+def _resolve_layout(layout: LayoutDefinition | str | None) -> LayoutDefinition:
     if layout is None:
         try:
-            layout_definition = load_layout(RENDER_LAYOUT)
+            return load_layout(RENDER_LAYOUT)
         except LayoutNotFoundError:
-            layout_definition = load_layout("default")
-    elif isinstance(layout, str):
+            return load_layout("default")
+    if isinstance(layout, str):
         try:
-            layout_definition = load_layout(layout)
+            return load_layout(layout)
         except LayoutNotFoundError:
-            layout_definition = load_layout(RENDER_LAYOUT)
-    else:
-        layout_definition = layout
-
-    prepared_layout = prepare_layout(layout_definition)
-
-    if frame_width is None:
-        frame_width = prepared_layout.width
-    if frame_height is None:
-        frame_height = prepared_layout.height
-
-    if frame_width != prepared_layout.width or frame_height != prepared_layout.height:
-        adjusted = replace(
-            layout_definition,
-            canvas=LayoutCanvas(
-                width=frame_width,
-                height=frame_height,
-                background=layout_definition.canvas.background,
-            ),
-        )
-        prepared_layout = prepare_layout(adjusted)
-        layout_definition = adjusted
-
-    frame_width = int(frame_width)
-    frame_height = int(frame_height)
-
-    caption_rect = prepared_layout.caption_rect
-    caption_align = prepared_layout.caption_align or "center"
-    caption_max_lines = 1
-    if prepared_layout.caption_wrap_width is not None:
-        caption_wrap_pixels = int(prepared_layout.caption_wrap_width * frame_width)
-    elif caption_rect is not None:
-        caption_wrap_pixels = caption_rect.width
-    else:
-        caption_wrap_pixels = int(frame_width * wrap_width_px_ratio)
-
-    background_spec = layout_definition.canvas.background
-    background_image = None
-    background_mode = background_spec.mode or "cover"
-    if background_spec.kind == "image" and background_spec.source:
-        image_path = Path(background_spec.source)
-        if not image_path.is_absolute() and layout_definition.source_path:
-            image_path = (layout_definition.source_path.parent / background_spec.source).resolve()
-        if image_path.exists():
-            background_image = cv2.imread(str(image_path))
-
-    def _parse_color_hex(value: str | None, fallback: Tuple[int, int, int] = (0, 0, 0)) -> Tuple[int, int, int]:
-        if not value:
-            return fallback
-        value = value.strip().lstrip('#')
-        if len(value) == 3:
-            value = ''.join(ch * 2 for ch in value)
-        if len(value) != 6:
-            return fallback
-        try:
-            r = int(value[0:2], 16)
-            g = int(value[2:4], 16)
-            b = int(value[4:6], 16)
-        except ValueError:
-            return fallback
-        return (b, g, r)
-
-    def _resize_background_image(image: np.ndarray) -> np.ndarray:
-        src_h, src_w = image.shape[:2]
-        if src_h <= 0 or src_w <= 0:
-            return np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
-        scale_w = frame_width / src_w
-        scale_h = frame_height / src_h
-        if background_mode == "contain":
-            scale = min(scale_w, scale_h)
-            new_w = max(1, int(src_w * scale))
-            new_h = max(1, int(src_h * scale))
-            resized = cv2.resize(image, (new_w, new_h))
-            canvas = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
-            offset_x = max(0, (frame_width - new_w) // 2)
-            offset_y = max(0, (frame_height - new_h) // 2)
-            canvas[offset_y:offset_y + new_h, offset_x:offset_x + new_w] = resized
-            return canvas
-        scale = max(scale_w, scale_h)
+            return load_layout(RENDER_LAYOUT)
+    return layout
+
+
+def _resize_background_image(image: np.ndarray, frame_width: int, frame_height: int, mode: str) -> np.ndarray:
+    src_h, src_w = image.shape[:2]
+    if src_h <= 0 or src_w <= 0:
+        return np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
+    scale_w = frame_width / src_w
+    scale_h = frame_height / src_h
+    if mode == "contain":
+        scale = min(scale_w, scale_h)
         new_w = max(1, int(src_w * scale))
         new_h = max(1, int(src_h * scale))
         resized = cv2.resize(image, (new_w, new_h))
-        x0 = max(0, (new_w - frame_width) // 2)
-        y0 = max(0, (new_h - frame_height) // 2)
-        return resized[y0:y0 + frame_height, x0:x0 + frame_width]
+        canvas = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
+        offset_x = max(0, (frame_width - new_w) // 2)
+        offset_y = max(0, (frame_height - new_h) // 2)
+        canvas[offset_y:offset_y + new_h, offset_x:offset_x + new_w] = resized
+        return canvas
+    scale = max(scale_w, scale_h)
+    new_w = max(1, int(src_w * scale))
+    new_h = max(1, int(src_h * scale))
+    resized = cv2.resize(image, (new_w, new_h))
+    x0 = max(0, (new_w - frame_width) // 2)
+    y0 = max(0, (new_h - frame_height) // 2)
+    return resized[y0:y0 + frame_height, x0:x0 + frame_width]
+
+
+class _SourceClip:
+    """The decoded source of a render, optionally limited to a time range."""
+
+    def __init__(
+        self,
+        clip_path: Path,
+        *,
+        source_start: float | None,
+        source_end: float | None,
+        mux_audio: bool,
+    ) -> None:
+        cap = cv2.VideoCapture(str(clip_path), cv2.CAP_FFMPEG)
+        if not cap.isOpened():
+            cap.release()
+            cap = cv2.VideoCapture(str(clip_path), cv2.CAP_ANY)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open video: {clip_path}")
+
+        # Match source FPS to avoid playback speed changes; fall back to default
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if not fps or np.isnan(fps) or fps <= 0:
+            fps = OUTPUT_FPS
+
+        range_start = max(0.0, float(source_start)) if source_start is not None else None
+        range_end = float(source_end) if source_end is not None else None
+        if range_start is not None and range_end is not None and range_end <= range_start:
+            cap.release()
+            raise ValueError("source_end must be greater than source_start")
+        if range_start:
+            # OpenCV's FFMPEG backend seeks to the preceding keyframe and decodes
+            # forward, so the next read() returns the frame at ``range_start``.
+            cap.set(cv2.CAP_PROP_POS_MSEC, range_start * 1000.0)
+
+        self.path = clip_path
+        self.cap = cap
+        self.fps = fps
+        self.frame_duration = 1.0 / fps
+        self.time_tolerance = max(self.frame_duration / 2.0, 1e-3)
+        self.range_start = range_start
+        self.range_end = range_end
+        self.audio_start = range_start or None
+        self.audio_duration = (range_end - (range_start or 0.0)) if range_end is not None else None
+        self.mux_audio = mux_audio
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Expected length of the decoded range, if the container reports it."""
+
+        frames = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        total = frames / self.fps if frames and frames > 0 else None
+        start = self.range_start or 0.0
+        end = self.range_end if total is None else min(self.range_end or total, total)
+        if end is None or end <= start:
+            return None
+        return end - start
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+
+    def read(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        # Decode into a recycled frame buffer instead of a fresh array
+        while True:
+            ret, frame = self.cap.read(buffer)
+            if not ret:
+                return None
+            if self.range_start is not None or self.range_end is not None:
+                pts = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if self.range_start is not None and pts < self.range_start - self.time_tolerance:
+                    continue
+                if self.range_end is not None and pts >= self.range_end - self.time_tolerance:
+                    return None
+            return frame
 
+    def release(self) -> None:
+        self.cap.release()
+
+
+class _RenderTarget:
+    """Everything needed to compose and encode one output of a render.
+
+    Each target owns its prepared layout, caption sprites, compositor and
+    writer; the decoded frame and the caption timeline come from the render.
+    """
+
+    def __init__(
+        self,
+        variant: RenderVariant,
+        style: _RenderStyle,
+        *,
+        render_state: dict,
+        use_cuda: bool,
+        prefetch_frames: int,
+        profiler: Optional[RenderProfiler] = None,
+    ) -> None:
+        self.output = Path(variant.output_path)
+        self.profiler = profiler
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self.temp_video = self.output.with_suffix('.temp.mp4')
+        self.proxy = variant.proxy
+        self.render_state = {
+            **render_state,
+            "layout_id": variant.layout if isinstance(variant.layout, str) else getattr(variant.layout, "id", None),
+            "frame_width": variant.frame_width,
+            "frame_height": variant.frame_height,
+        }
+        self.encode_preset: Optional[str] = None
+        self.encode_crf: Optional[int] = None
+        if self.proxy:
+            self.encode_preset, self.encode_crf = RENDER_PROXY_PRESET, RENDER_PROXY_CRF
+
+        layout_definition = _resolve_layout(variant.layout)
+        prepared_layout = prepare_layout(layout_definition)
+
+        frame_width = variant.frame_width
+        frame_height = variant.frame_height
+        if frame_width is None:
+            frame_width = prepared_layout.width
+        if frame_height is None:
+            frame_height = prepared_layout.height
+
+        canvas_background = layout_definition.canvas.background
+        if self.proxy:
+            # Everything drawn in pixels shrinks with the canvas
+            frame_width = _proxy_size(frame_width)
+            frame_height = _proxy_size(frame_height)
+            style = style.scaled(RENDER_PROXY_SCALE)
+            if canvas_background.radius:
+                canvas_background = replace(
+                    canvas_background,
+                    radius=max(3, round(canvas_background.radius * RENDER_PROXY_SCALE)) | 1,
+                )
+
+        if (
+            frame_width != prepared_layout.width
+            or frame_height != prepared_layout.height
+            or canvas_background is not layout_definition.canvas.background
+        ):
+            adjusted = replace(
+                layout_definition,
+                canvas=LayoutCanvas(
+                    width=frame_width,
+                    height=frame_height,
+                    background=canvas_background,
+                ),
+            )
+            prepared_layout = prepare_layout(adjusted)
+            layout_definition = adjusted
+
+        self.style = style
+        self.frame_width = frame_width = int(frame_width)
+        self.frame_height = frame_height = int(frame_height)
+
+        caption_rect = prepared_layout.caption_rect
+        self.caption_align = prepared_layout.caption_align or "center"
+        self.caption_max_lines = 1
+        if prepared_layout.caption_wrap_width is not None:
+            self.caption_wrap_pixels = int(prepared_layout.caption_wrap_width * frame_width)
+        elif caption_rect is not None:
+            self.caption_wrap_pixels = caption_rect.width
+        else:
+            self.caption_wrap_pixels = int(frame_width * style.wrap_width_px_ratio)
+        self.caption_rect = caption_rect or PixelRect(
+            int(frame_width * 0.08),
+            int(frame_height * 0.75),
+            int(frame_width * 0.84),
+            int(frame_height * 0.2),
+        ).clamp(frame_width, frame_height)
+
+        self.background = background_spec = layout_definition.canvas.background
+        background_image = None
+        if background_spec.kind == "image" and background_spec.source:
+            image_path = Path(background_spec.source)
+            if not image_path.is_absolute() and layout_definition.source_path:
+                image_path = (layout_definition.source_path.parent / background_spec.source).resolve()
+            if image_path.exists():
+                background_image = cv2.imread(str(image_path))
+
+        # Prepare a reusable Gaussian filter on GPU if available
+        gpu_gauss = None
+        if use_cuda:
+            try:
+                k = style.blur_ksize if style.blur_ksize % 2 == 1 else style.blur_ksize + 1
+                gpu_gauss = cv2.cuda.createGaussianFilter(cv2.CV_8UC3, cv2.CV_8UC3, (k, k), 0)
+            except Exception:
+                gpu_gauss = None
+
+        # --- Static layers: shapes, texts and color/image backgrounds are composed once ---
+        self.static_layers = build_static_layers(
+            prepared_layout,
+            font_scale=style.font_scale,
+            thickness=style.thickness,
+            outline=style.outline,
+            fill_color=style.fill_color,
+            outline_color=style.outline_color,
+            font=_CAPTION_FONT,
+            line_type=_CAPTION_LINE_TYPE,
+        )
+        static_background: Optional[np.ndarray] = None
+        if background_spec.kind == "color":
+            color = parse_color_hex(background_spec.color, (16, 16, 16))
+            static_background = np.full((frame_height, frame_width, 3), color, dtype=np.uint8)
+        elif background_spec.kind != "blur" and background_image is not None:
+            static_background = np.ascontiguousarray(
+                _resize_background_image(background_image, frame_width, frame_height, background_spec.mode or "cover")
+            )
+        if static_background is not None and self.static_layers.underlay is not None:
+            self.static_layers.underlay.blend_into(static_background)
+        self.static_background = static_background
+
+        # Background, video regions and static layers are composed into reused buffers
+        self.compositor = FrameCompositor(
+            prepared_layout,
+            self.static_layers,
+            background=background_spec,
+            static_background=static_background,
+            blur_ksize=style.blur_ksize,
+            gpu_gauss=gpu_gauss,
+            # Canvases stay in flight between the compose and encode threads
+            pool=FrameBufferPool(frame_width, frame_height, depth=max(1, prefetch_frames) + 2),
+            profiler=profiler,
+        )
+        self._caption_timer = profiler.stage("captions") if profiler is not None else None
+        self._thumbnail_timer = profiler.stage("thumbnails") if profiler is not None else None
+
+        self.caption_entries: List[CaptionEntry] = []
+        self.caption_timeline: Optional[CaptionTimeline] = None
+        self.caption_rasterizer: Optional[CaptionRasterizer] = None
+        self.writer = None
+        self.piped = False
+        self.thumbnails: Optional[ThumbnailCollector] = None
+
+    @property
+    def caption_key(self) -> Tuple[int, float, int, int]:
+        """Settings that decide how captions are split into entries."""
+
+        return (
+            self.caption_wrap_pixels,
+            self.style.font_scale,
+            self.style.thickness + self.style.outline,
+            self.caption_max_lines,
+        )
+
+    def prepare_captions(self, entries: List[CaptionEntry], timeline: Optional[CaptionTimeline], tolerance: float) -> CaptionTimeline:
+        """Set up caption sprites, reusing ``timeline`` when another target has the same wrap."""
+
+        if timeline is None:
+            # Long captions become consecutive entries of at most ``caption_max_lines`` lines
+            split = split_long_captions(
+                entries,
+                self.caption_max_lines,
+                lambda text: wrap_caption_text(
+                    text,
+                    self.caption_wrap_pixels,
+                    font=_CAPTION_FONT,
+                    font_scale=self.style.font_scale,
+                    thickness=self.style.thickness + self.style.outline,
+                ),
+            )
+            timeline = CaptionTimeline(split, tolerance=tolerance)
+        self.caption_timeline = timeline
+        self.caption_entries = timeline.entries
+
+        # --- Caption sprites: each (entry, highlighted word) is rasterized once ---
+        style = self.style
+        self.caption_rasterizer = CaptionRasterizer(
+            CaptionStyle(
+                font_scale=style.font_scale,
+                thickness=style.thickness,
+                outline=style.outline,
+                base_color=style.base_caption_color,
+                highlight_color=style.highlight_color,
+                outline_color=style.outline_color,
+                font=_CAPTION_FONT,
+                line_type=_CAPTION_LINE_TYPE,
+            ),
+            frame_size=(self.frame_width, self.frame_height),
+            caption_rect=self.caption_rect,
+            wrap_pixels=self.caption_wrap_pixels,
+            bottom_safe_ratio=style.bottom_safe_ratio,
+            align=self.caption_align,
+        )
+        return timeline
+
+    def render_with_ffmpeg_backend(self, source: _SourceClip) -> Path:
+        """Hand decode, compose, captions and encode to a single ffmpeg process."""
+
+        style = self.style
+        # Frames never reach Python here, so no thumbnails are captured
+        remove_thumbnails(self.output)
+        ass_path: Optional[Path] = None
+        if self.caption_entries:
+            ass_path = write_ass_subtitles(
+                self.caption_entries,
+                self.output.with_suffix(".captions.ass"),
+                width=self.frame_width,
+                height=self.frame_height,
+                caption_rect=self.caption_rect,
+                wrap_pixels=self.caption_wrap_pixels,
+                font_scale=style.font_scale,
+                thickness=style.thickness,
+                outline=style.outline,
+                fill_bgr=style.base_caption_color,
+                highlight_bgr=style.highlight_color,
+                outline_bgr=style.outline_color,
+                max_lines=self.caption_max_lines,
+                bottom_safe_ratio=style.bottom_safe_ratio,
+                align=self.caption_align,
+                tolerance=source.time_tolerance,
+            )
+        started = time.perf_counter_ns()
+        try:
+            rendered = render_with_filtergraph(
+                source.path,
+                self.output,
+                self.static_layers,
+                canvas_size=(self.frame_width, self.frame_height),
+                source_size=source.size,
+                fps=source.fps,
+                background=self.background,
+                static_background=self.static_background,
+                blur_ksize=style.blur_ksize,
+                subtitles=ass_path,
+                source_start=source.range_start,
+                source_end=source.range_end,
+                mux_audio=source.mux_audio,
+                preset=self.encode_preset,
+                crf=self.encode_crf,
+            )
+        finally:
+            if ass_path is not None:
+                ass_path.unlink(missing_ok=True)
+        if self.profiler is not None:
+            self.profiler.stage("filtergraph").add(time.perf_counter_ns() - started)
+        _save_render_state(rendered, self.render_state if self.proxy else None)
+        return rendered
+
+    def open_writer(self, source: _SourceClip, encoder: str, *, thumbnails: bool) -> None:
+        size = (self.frame_width, self.frame_height)
+        if thumbnails:
+            self.thumbnails = ThumbnailCollector(
+                size,
+                source.fps,
+                duration=source.duration,
+                interval=RENDER_SPRITE_INTERVAL,
+                tile_width=RENDER_SPRITE_TILE_WIDTH,
+            )
+        if encoder == "ffmpeg":
+            self.writer = open_ffmpeg_writer(
+                self.output,
+                source.fps,
+                size,
+                audio_source=source.path if source.mux_audio else None,
+                audio_start=source.audio_start,
+                audio_duration=source.audio_duration,
+                preset=self.encode_preset,
+                crf=self.encode_crf,
+            )
+            self.piped = self.writer is not None
+            if not self.piped:
+                print("[render] ffmpeg pipe unavailable; falling back to OpenCV VideoWriter")
+
+        # Prefer H.264 writer; fall back to mp4v if unavailable
+        if self.writer is None:
+            self.writer = _open_writer(self.temp_video, source.fps, size)
+        if self.writer is None:
+            raise RuntimeError("Cannot create VideoWriter (failed all backends/fourcc).")
+
+    def compose(self, frame_idx: int, frame: np.ndarray, t: float) -> np.ndarray:
+        canvas = self.compositor.compose(frame)
+        timed = self._caption_timer is not None
+        started = time.perf_counter_ns() if timed else 0
+
+        # --- Captions ---
+        current = self.caption_timeline.lookup(t)
+        if current is not None:
+            entry_idx, tokens, highlight_index = current
+            sprite = self.caption_rasterizer.sprite(entry_idx, tokens, highlight_index)
+            if sprite is not None:
+                sprite.blend_into(canvas)
+        if timed:
+            now = time.perf_counter_ns()
+            self._caption_timer.add(now - started)
+            started = now
+        if self.thumbnails is not None:
+            self.thumbnails.add(frame_idx, canvas)
+            if timed:
+                self._thumbnail_timer.add(time.perf_counter_ns() - started)
+        return canvas
+
+    def abort(self) -> None:
+        writer, self.writer = self.writer, None
+        if writer is None:
+            return
+        if self.piped:
+            writer.abort()
+        else:
+            writer.release()
+
+    def finish(self, source: _SourceClip) -> Path:
+        """Finalise the encode, muxing audio in a second pass if frames were not piped."""
+
+        writer, self.writer = self.writer, None
+        started = time.perf_counter_ns()
+        # Waits for a piped ffmpeg to finish encoding and muxing
+        writer.release()
+        if self.profiler is not None:
+            self.profiler.stage("finalize").add(time.perf_counter_ns() - started)
+        output = self.output
+
+        if self.piped:
+            # Encode and audio mux already happened inside the piped ffmpeg process
+            self._finish_sidecars()
+            return output
+
+        temp_video = self.temp_video
+        # --- Optional: Mux original audio (disabled if ffmpeg not present or mux_audio=False) ---
+        if source.mux_audio and shutil.which("ffmpeg") is not None:
+            audio_range: List[str] = []
+            if source.audio_start:
+                audio_range += ["-ss", f"{source.audio_start:.3f}"]
+            if source.audio_duration:
+                audio_range += ["-t", f"{source.audio_duration:.3f}"]
+            mux_cmd = [
+                "ffmpeg", "-y",
+                "-i", str(temp_video),          # video (from OpenCV)
+                *audio_range,
+                "-i", str(source.path),         # original (for audio track)
+                "-map", "0:v:0", "-map", "1:a:0?",
+                # Re-encode video to H.264 + yuv420p at source FPS and AAC audio, faststart
+                *encode_output_args(source.fps, audio=True, preset=self.encode_preset, crf=self.encode_crf),
+                str(output),
+            ]
+            started = time.perf_counter_ns()
+            try:
+                res = subprocess.run(mux_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+                try:
+                    if temp_video.exists():
+                        os.remove(temp_video)
+                except OSError:
+                    pass
+            except subprocess.CalledProcessError as e:
+                # Fall back: just move the video-only file to the final path if mux fails
+                try:
+                    if temp_video.exists():
+                        temp_video.replace(output)
+                except Exception:
+                    pass
+                print("WARN: Audio mux/transcode failed; wrote video-only. STDERR head:\n" + (e.stderr.decode(errors='ignore')[:800] if e.stderr else ""))
+            if self.profiler is not None:
+                self.profiler.stage("mux").add(time.perf_counter_ns() - started)
+        else:
+            # No mux: write video-only as final
+            if temp_video.exists():
+                try:
+                    temp_video.replace(output)
+                except Exception:
+                    pass
+
+        self._finish_sidecars()
+        return output
+
+    def _finish_sidecars(self) -> None:
+        # Written after the short so they are never older than it
+        if self.thumbnails is not None:
+            self.thumbnails.write(self.output)
+        else:
+            remove_thumbnails(self.output)
+        _save_render_state(self.output, self.render_state if self.proxy else None)
+
+
+def _probe_cuda(use_cuda: bool, use_opencl: bool) -> bool:
     # --- HW accel probes ---
     if use_opencl:
         try:
@@ -246,630 +937,294 @@ def render_vertical_with_captions(
             use_cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
         except Exception:
             use_cuda = False
+    return use_cuda
 
-    # Prepare a reusable Gaussian filter on GPU if available
-    gpu_gauss = None
-    if use_cuda:
-        try:
-            k = blur_ksize if blur_ksize % 2 == 1 else blur_ksize + 1
-            gpu_gauss = cv2.cuda.createGaussianFilter(cv2.CV_8UC3, cv2.CV_8UC3, (k, k), 0)
-        except Exception:
-            gpu_gauss = None
-            use_cuda = False
-
-    _SRT_TIME = re.compile(r"^(\d{2}):(\d{2}):(\d{2}),(\d{3})\s+-->\s+(\d{2}):(\d{2}):(\d{2}),(\d{3})$")
-
-    def _hmsms_to_sec(h: str, m: str, s: str, ms: str) -> float:
-        return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
-
-    def _parse_srt_text(s: str) -> List[Tuple[float, float, str]]:
-        chunks = re.split(r"\r?\n\r?\n+", s.strip())
-        out: List[Tuple[float, float, str]] = []
-        for ch in chunks:
-            lines = [ln for ln in ch.splitlines() if ln.strip() != ""]
-            if not lines:
-                continue
-            # allow optional numeric index on first line
-            idx = 0
-            if lines and lines[0].strip().isdigit():
-                idx = 1
-            if idx >= len(lines):
-                continue
-            m = _SRT_TIME.match(lines[idx].strip())
-            if not m:
-                # not a timed block
-                continue
-            sh, sm, ss, sms, eh, em, es, ems = m.groups()
-            start = _hmsms_to_sec(sh, sm, ss, sms)
-            end = _hmsms_to_sec(eh, em, es, ems)
-            text = " ".join(ln.strip() for ln in lines[idx+1:]).strip()
-            if end > start and text:
-                out.append((start, end, text))
-        return out
-
-    def _load_captions_from_path(p: Path) -> List[Tuple[float, float, str]]:
-        if not p.exists():
-            return []
-        suf = p.suffix.lower()
-        try:
-            data = p.read_text(encoding="utf-8")
-        except Exception:
-            data = p.read_text(errors="ignore")
-        if suf == ".srt":
-            return _parse_srt_text(data)
-        if suf == ".json":
-            try:
-                obj = json.loads(data)
-                # expect list of dicts or tuples
-                if isinstance(obj, list):
-                    tmp: List[Tuple[float, float, str]] = []
-                    for it in obj:
-                        if isinstance(it, dict):
-                            s = float(it.get("start", 0.0))
-                            e = float(it.get("end", it.get("stop", s)))
-                            txt = str(it.get("text", it.get("content", "")))
-                            if e > s and txt:
-                                tmp.append((s, e, txt))
-                        elif isinstance(it, (list, tuple)) and len(it) >= 3:
-                            s, e, txt = it[0], it[1], str(it[2])
-                            if float(e) > float(s) and txt:
-                                tmp.append((float(s), float(e), txt))
-                    return tmp
-            except Exception:
-                return []
-        # unknown extension
-        return []
-
-    def _load_caption_words(source: Optional[Union[List[dict], str, Path]]) -> List[CaptionWord]:
-        if isinstance(source, (str, Path)):
-            json_path = Path(source).with_suffix(".words.json")
-            if json_path.exists():
-                try:
-                    data = json.loads(json_path.read_text(encoding="utf-8"))
-                except (OSError, json.JSONDecodeError):
-                    return []
-                words: List[CaptionWord] = []
-                for item in data.get("words", []) or []:
-                    try:
-                        start = float(item.get("start"))
-                        end = float(item.get("end"))
-                    except (TypeError, ValueError):
-                        continue
-                    text = str(item.get("text") or item.get("word") or "").strip()
-                    if not text or end <= start:
-                        continue
-                    words.append(CaptionWord(start=start, end=end, text=text))
-                words.sort(key=lambda w: w.start)
-                return words
-        return []
-
-    def _normalize_caps(
-        caps: Optional[Union[List[Tuple[float, float, str]], List[dict], str, Path]]
-    ) -> List[CaptionEntry]:
-        entries: List[CaptionEntry] = []
-        if caps is None:
-            return entries
-        if isinstance(caps, (str, Path)):
-            loaded = _load_captions_from_path(Path(caps))
-        else:
-            loaded = []
-            for it in caps:
-                if isinstance(it, dict):
-                    s = float(it.get("start", 0.0))
-                    e = float(it.get("end", it.get("stop", s)))
-                    txt = str(it.get("text", it.get("content", "")))
-                else:
-                    s, e, txt = it  # type: ignore[misc]
-                if e > s and txt:
-                    loaded.append((float(s), float(e), txt))
-        loaded.sort(key=lambda x: x[0])
-        for s, e, txt in loaded:
-            entries.append(CaptionEntry(start=float(s), end=float(e), text=str(txt), words=[]))
-        return entries
 
-    caption_entries = _normalize_caps(captions)
-    caption_words = _load_caption_words(captions)
+def _render_targets(
+    clip_path: Path,
+    captions: CaptionSource,
+    variants: Sequence[RenderVariant],
+    style: _RenderStyle,
+    *,
+    use_cuda: bool,
+    use_opencl: bool,
+    mux_audio: bool,
+    encoder: str,
+    backend: str,
+    source_start: float | None,
+    source_end: float | None,
+    prefetch_frames: int,
+    thumbnails: bool,
+    profiler: Optional[RenderProfiler],
+) -> List[Path]:
+    """Render every variant from a single decode of ``clip_path``."""
+
+    render_state = {
+        "clip_path": str(clip_path),
+        "captions": str(captions) if isinstance(captions, (str, Path)) else captions,
+        "source_start": source_start,
+        "source_end": source_end,
+        "mux_audio": mux_audio,
+        "thumbnails": thumbnails,
+    }
+    use_cuda = _probe_cuda(use_cuda, use_opencl)
+    targets = [
+        _RenderTarget(
+            variant,
+            style,
+            render_state=render_state,
+            use_cuda=use_cuda,
+            prefetch_frames=prefetch_frames,
+            profiler=profiler,
+        )
+        for variant in variants
+    ]
 
-    if isinstance(captions, (str, Path)) and not caption_entries:
-        print(f"WARN: No captions parsed from {captions}. Proceeding without text.")
+    caption_entries = _load_caption_entries(captions)
+    source = _SourceClip(clip_path, source_start=source_start, source_end=source_end, mux_audio=mux_audio)
 
-    def _assign_words_to_entries(entries: List[CaptionEntry], words: List[CaptionWord]) -> None:
-        if not words:
-            return
-        for entry in entries:
-            entry.words = [
-                CaptionWord(start=w.start, end=w.end, text=w.text)
-                for w in words
-                if not (w.end <= entry.start or w.start >= entry.end)
-            ]
+    # Targets that wrap captions the same way share one timeline
+    timelines: Dict[Tuple[int, float, int, int], CaptionTimeline] = {}
+    for target in targets:
+        key = target.caption_key
+        timelines[key] = target.prepare_captions(caption_entries, timelines.get(key), source.time_tolerance)
 
-    _assign_words_to_entries(caption_entries, caption_words)
-
-    def _ensure_entry_words(entry: CaptionEntry) -> List[CaptionWord]:
-        if entry.words:
-            return entry.words
-        tokens = entry.text.replace("\n", " ").split()
-        if not tokens:
-            entry.words = []
-            return entry.words
-        duration = max(entry.end - entry.start, 0.01)
-        step = max(duration / max(len(tokens), 1), 0.01)
-        cur = entry.start
-        fallback: List[CaptionWord] = []
-        for idx, token in enumerate(tokens):
-            token = token.strip()
-            if not token:
-                continue
-            nxt = cur + step
-            if idx == len(tokens) - 1:
-                nxt = max(nxt, entry.end)
-            fallback.append(CaptionWord(start=cur, end=nxt, text=token))
-            cur = nxt
-        if fallback and fallback[-1].end < entry.end:
-            fallback[-1].end = entry.end
-        entry.words = fallback
-        return entry.words
-
-    def _current_caption_entry(t: float) -> Optional[CaptionEntry]:
-        for entry in caption_entries:
-            if (entry.start - time_tolerance) <= t <= (entry.end + time_tolerance):
-                return entry
-        return None
-
-    cap = cv2.VideoCapture(str(clip_path), cv2.CAP_FFMPEG)
-    if not cap.isOpened():
-        cap.release()
-        cap = cv2.VideoCapture(str(clip_path), cv2.CAP_ANY)
-    if not cap.isOpened():
-        raise RuntimeError(f"Cannot open video: {clip_path}")
-
-    # Match source FPS to avoid playback speed changes; fall back to default
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if not fps or np.isnan(fps) or fps <= 0:
-        fps = OUTPUT_FPS
-
-    frame_duration = 1.0 / fps
-    time_tolerance = max(frame_duration / 2.0, 1e-3)
-
-    # Prefer H.264 writer; fall back to mp4v if unavailable
-    writer = _open_writer(temp_video, fps, (frame_width, frame_height))
-    if writer is None:
-        cap.release()
-        raise RuntimeError("Cannot create VideoWriter (failed all backends/fourcc).")
-
-    line_type = cv2.LINE_AA
-    font = cv2.FONT_HERSHEY_SIMPLEX
-
-    # --- Caption layout cache (recompute only when text changes) ---
-    _last_text = None
-    _last_scale = None
-    _last_spacing = None
-    _cached_lines: List[str] = []
-    _cached_sizes: List[Tuple[int, int]] = []
-    _cached_total_h: int = 0
-
-    def _measure_and_wrap(text: str, scale: float, spacing: int):
-        nonlocal _last_text, _last_scale, _last_spacing, _cached_lines, _cached_sizes, _cached_total_h
-        if (
-            (not cache_text_layout)
-            or (text != _last_text)
-            or (scale != _last_scale)
-            or (spacing != _last_spacing)
-        ):
-            max_text_w = max(1, caption_wrap_pixels)
-            words = text.replace("\n", " ").split()
-            lines: List[str] = []
-            cur = ""
-            for wtok in words:
-                test = (cur + " " + wtok).strip()
-                (tw, _), _ = cv2.getTextSize(test, font, scale, thickness + outline)
-                if tw <= max_text_w or not cur:
-                    cur = test
-                else:
-                    lines.append(cur)
-                    cur = wtok
-            if cur:
-                lines.append(cur)
-            sizes = [cv2.getTextSize(ln, font, scale, thickness + outline)[0] for ln in lines]
-            total_h = sum(sz[1] for sz in sizes) + spacing * max(0, len(lines) - 1)
-            _last_text, _last_scale, _last_spacing = text, scale, spacing
-            _cached_lines, _cached_sizes, _cached_total_h = lines, sizes, total_h
-        return _cached_lines, _cached_sizes, _cached_total_h
-
-    def _split_long_captions(
-        caps: List[CaptionEntry],
-        max_lines: int,
-    ) -> List[CaptionEntry]:
-        if max_lines <= 0:
-            return caps
-        out: List[CaptionEntry] = []
-        for entry in caps:
-            lines, _, _ = _measure_and_wrap(entry.text, font_scale, line_spacing)
-            if len(lines) <= max_lines:
-                out.append(entry)
-                continue
-            seq_words = list(_ensure_entry_words(entry))
-            word_idx = 0
-            total_lines = len(lines)
-            for idx in range(0, total_lines, max_lines):
-                seg_lines = lines[idx:idx + max_lines]
-                if not seg_lines:
-                    continue
-                seg_word_count = sum(len(seg_line.split()) for seg_line in seg_lines)
-                seg_words = seq_words[word_idx:word_idx + seg_word_count] if seg_word_count else []
-                word_idx += seg_word_count
-                seg_text = " ".join(seg_lines).strip()
-                if not seg_text:
-                    continue
-                if seg_words:
-                    seg_start = seg_words[0].start
-                    seg_end = seg_words[-1].end
-                else:
-                    portion_start = idx / max(total_lines, 1)
-                    portion_end = min(total_lines, idx + len(seg_lines)) / max(total_lines, 1)
-                    span = entry.end - entry.start
-                    seg_start = entry.start + span * portion_start
-                    seg_end = entry.start + span * portion_end
-                out.append(
-                    CaptionEntry(
-                        start=seg_start,
-                        end=seg_end,
-                        text=seg_text,
-                        words=[CaptionWord(start=w.start, end=w.end, text=w.text) for w in seg_words],
-                    )
-                )
-        out.sort(key=lambda e: e.start)
-        return out
-
-    caption_entries = _split_long_captions(caption_entries, caption_max_lines)
-    _last_text = _last_scale = _last_spacing = None
-    _cached_lines = []
-    _cached_sizes = []
-    _cached_total_h = 0
-
-    frame_idx = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        t = (frame_idx + 0.5) * frame_duration
-        current_entry = _current_caption_entry(t)
-
-        # --- Compose background and overlay layout items ---
-        h, w = frame.shape[:2]
-        bg: np.ndarray
-
-        if background_spec.kind == "blur":
-            scale_bg = max(frame_width / w, frame_height / h)
-            dim_factor = background_spec.opacity if background_spec.opacity is not None else 0.55
-            dim_factor = min(max(dim_factor, 0.0), 1.0)
-            blur_kernel = background_spec.radius if background_spec.radius else blur_ksize
-            if blur_kernel % 2 == 0:
-                blur_kernel += 1
-            if use_cuda:
-                gpu_frame = cv2.cuda_GpuMat()
-                gpu_frame.upload(frame)
-                sz_bg = (int(w * scale_bg), int(h * scale_bg))
-                gpu_bg = cv2.cuda.resize(gpu_frame, sz_bg)
-                y0 = max(0, (sz_bg[1] - frame_height) // 2)
-                x0 = max(0, (sz_bg[0] - frame_width) // 2)
-                gpu_bg = gpu_bg.rowRange(y0, y0 + frame_height).colRange(x0, x0 + frame_width)
-                if gpu_gauss is not None:
-                    gpu_bg = gpu_gauss.apply(gpu_bg)
-                    bg = gpu_bg.download()
-                else:
-                    bg = cv2.GaussianBlur(gpu_bg.download(), (blur_kernel, blur_kernel), 0)
-                bg = cv2.addWeighted(bg, dim_factor, np.zeros_like(bg), 1 - dim_factor, 0)
-            else:
-                frame_u = cv2.UMat(frame)
-                sz_bg = (int(w * scale_bg), int(h * scale_bg))
-                bg_u = cv2.resize(frame_u, sz_bg)
-                y0 = max(0, (sz_bg[1] - frame_height) // 2)
-                x0 = max(0, (sz_bg[0] - frame_width) // 2)
-                bg_nd = bg_u.get()
-                bg_nd = bg_nd[y0:y0 + frame_height, x0:x0 + frame_width]
-                small_w = max(2, frame_width // 4)
-                small_h = max(2, frame_height // 4)
-                small = cv2.resize(bg_nd, (small_w, small_h))
-                small = cv2.GaussianBlur(small, (blur_kernel, blur_kernel), 0)
-                bg = cv2.resize(small, (frame_width, frame_height))
-                bg = cv2.addWeighted(bg, dim_factor, np.zeros_like(bg), 1 - dim_factor, 0)
-        elif background_spec.kind == "color":
-            color = _parse_color_hex(background_spec.color, (16, 16, 16))
-            bg = np.full((frame_height, frame_width, 3), color, dtype=np.uint8)
-        elif background_image is not None:
-            bg = _resize_background_image(background_image)
+    if backend == "ffmpeg" and len(targets) == 1:
+        try:
+            rendered = targets[0].render_with_ffmpeg_backend(source)
+        except (UnsupportedLayoutError, RuntimeError) as exc:
+            print(f"[render] ffmpeg backend unavailable ({exc}); using the OpenCV engine")
         else:
-            small = cv2.GaussianBlur(frame, (blur_ksize if blur_ksize % 2 == 1 else blur_ksize + 1, ) * 2, 0)
-            bg = cv2.resize(small, (frame_width, frame_height))
-
-        canvas = bg.copy()
-
-        # Shape overlays
-        for prepared_shape in prepared_layout.shapes:
-            rect = prepared_shape.target.clamp(frame_width, frame_height)
-            if rect.width <= 0 or rect.height <= 0:
-                continue
-            color = _parse_color_hex(prepared_shape.item.color, (0, 0, 0))
-            opacity = max(0.0, min(1.0, prepared_shape.item.opacity))
-            x0, y0 = rect.x, rect.y
-            x1, y1 = rect.x + rect.width, rect.y + rect.height
-            if opacity >= 1.0:
-                canvas[y0:y1, x0:x1] = color
-            else:
-                overlay = np.full((rect.height, rect.width, 3), color, dtype=np.uint8)
-                roi = canvas[y0:y1, x0:x1]
-                cv2.addWeighted(overlay, opacity, roi, 1 - opacity, 0, dst=roi)
-
-        # Video overlays
-        for prepared_video in prepared_layout.videos:
-            rect = prepared_video.target.clamp(frame_width, frame_height)
-            if rect.width <= 0 or rect.height <= 0:
-                continue
-            crop = prepared_video.crop
-            region = frame
-            if crop is not None:
-                if crop.units == "pixels":
-                    crop_x = int(max(0, crop.x))
-                    crop_y = int(max(0, crop.y))
-                    crop_w = int(max(1, crop.width))
-                    crop_h = int(max(1, crop.height))
-                else:
-                    crop_x = int(max(0, crop.x) * w)
-                    crop_y = int(max(0, crop.y) * h)
-                    crop_w = int(max(1, crop.width) * w)
-                    crop_h = int(max(1, crop.height) * h)
-                crop_x2 = min(w, crop_x + crop_w)
-                crop_y2 = min(h, crop_y + crop_h)
-                if crop_x2 > crop_x and crop_y2 > crop_y:
-                    region = frame[crop_y:crop_y2, crop_x:crop_x2]
-            if region.size == 0:
-                continue
-            if prepared_video.item.mirror:
-                region = cv2.flip(region, 1)
-
-            target_w = max(1, rect.width)
-            target_h = max(1, rect.height)
-            mode = prepared_video.item.scale_mode
-            if mode == "fill":
-                resized = cv2.resize(region, (target_w, target_h))
-            else:
-                src_h, src_w = region.shape[:2]
-                scale_w = target_w / src_w
-                scale_h = target_h / src_h
-                if mode == "contain":
-                    scale = min(scale_w, scale_h)
-                    new_w = max(1, int(src_w * scale))
-                    new_h = max(1, int(src_h * scale))
-                    resized = cv2.resize(region, (new_w, new_h))
-                    video_canvas = np.zeros((target_h, target_w, 3), dtype=np.uint8)
-                    offset_x = (target_w - new_w) // 2
-                    offset_y = (target_h - new_h) // 2
-                    video_canvas[offset_y:offset_y + new_h, offset_x:offset_x + new_w] = resized
-                    resized = video_canvas
-                else:  # cover
-                    scale = max(scale_w, scale_h)
-                    new_w = max(1, int(src_w * scale))
-                    new_h = max(1, int(src_h * scale))
-                    resized = cv2.resize(region, (new_w, new_h))
-                    offset_x = max(0, (new_w - target_w) // 2)
-                    offset_y = max(0, (new_h - target_h) // 2)
-                    resized = resized[offset_y:offset_y + target_h, offset_x:offset_x + target_w]
-
-            opacity = prepared_video.item.opacity if prepared_video.item.opacity is not None else 1.0
-            opacity = max(0.0, min(1.0, opacity))
-            dest = canvas[rect.y:rect.y + target_h, rect.x:rect.x + target_w]
-            if resized.shape[0] != target_h or resized.shape[1] != target_w:
-                tmp = np.zeros((target_h, target_w, 3), dtype=np.uint8)
-                hh = min(target_h, resized.shape[0])
-                ww = min(target_w, resized.shape[1])
-                tmp[:hh, :ww] = resized[:hh, :ww]
-                resized = tmp
-            if opacity >= 1.0:
-                dest[:] = resized
-            else:
-                cv2.addWeighted(resized, opacity, dest, 1 - opacity, 0, dst=dest)
-
-        # Text overlays
-        for prepared_text in prepared_layout.texts:
-            content = prepared_text.item.content.strip()
-            if not content:
-                continue
-            rect = prepared_text.target.clamp(frame_width, frame_height)
-            if rect.width <= 0 or rect.height <= 0:
-                continue
-            lines = content.splitlines()
-            if not lines:
-                lines = [content]
-            text_scale = prepared_text.item.font_size
-            if text_scale is None:
-                text_scale = font_scale
-            else:
-                text_scale = max(0.3, float(text_scale) / 32.0 * font_scale)
-            text_spacing = prepared_text.item.line_height
-            if text_spacing is None:
-                text_spacing = int(18 * (text_scale / font_scale))
-            else:
-                text_spacing = int(text_spacing)
-            align_mode = prepared_text.item.align
-            text_color = _parse_color_hex(prepared_text.item.color, fill_color)
-            y_cursor = rect.y
-            for ln in lines:
-                if prepared_text.item.uppercase:
-                    ln = ln.upper()
-                (tw, th), _ = cv2.getTextSize(ln, font, text_scale, thickness + outline)
-                if align_mode == "left":
-                    x_text = rect.x
-                elif align_mode == "right":
-                    x_text = rect.x + max(0, rect.width - tw)
-                else:
-                    x_text = rect.x + max(0, (rect.width - tw) // 2)
-                y_cursor += th
-                for dx in (-outline, 0, outline):
-                    for dy in (-outline, 0, outline):
-                        if dx == 0 and dy == 0:
-                            continue
-                        cv2.putText(
-                            canvas,
-                            ln,
-                            (x_text + dx, y_cursor + dy),
-                            font,
-                            text_scale,
-                            outline_color,
-                            thickness + outline,
-                            line_type,
-                        )
-                cv2.putText(
-                    canvas,
-                    ln,
-                    (x_text, y_cursor),
-                    font,
-                    text_scale,
-                    text_color,
-                    thickness,
-                    line_type,
-                )
-                y_cursor += text_spacing
+            source.release()
+            if profiler is not None:
+                profiler.stop()
+            return [rendered]
+
+    def _compose_frame(frame_idx: int, frame: np.ndarray) -> Tuple[np.ndarray, ...]:
+        t = (frame_idx + 0.5) * source.frame_duration
+        return tuple(target.compose(frame_idx, frame, t) for target in targets)
+
+    def _write_frames(canvases: Tuple[np.ndarray, ...]) -> None:
+        for target, canvas in zip(targets, canvases):
+            target.writer.write(canvas)
+
+    read_frame, write_frames = source.read, _write_frames
+    if profiler is not None:
+        decode_timer = profiler.stage("decode")
+        write_timer = profiler.stage("write")
+
+        def read_frame(buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            started = time.perf_counter_ns()
+            frame = source.read(buffer)
+            decode_timer.add(time.perf_counter_ns() - started)
+            return frame
+
+        def write_frames(canvases: Tuple[np.ndarray, ...]) -> None:
+            started = time.perf_counter_ns()
+            _write_frames(canvases)
+            write_timer.add(time.perf_counter_ns() - started)
+
+    # Decode, compose and encode overlap on separate threads
+    try:
+        for target in targets:
+            target.open_writer(source, encoder, thumbnails=thumbnails)
+        frames = run_render_stages(read_frame, _compose_frame, write_frames, queue_size=prefetch_frames)
+    except BaseException:
+        source.release()
+        for target in targets:
+            target.abort()
+        raise
+
+    source.release()
+    rendered = [target.finish(source) for target in targets]
+    if profiler is not None:
+        profiler.frames = frames
+        profiler.stop()
+    return rendered
 
-        # --- Captions ---
-        effective_caption_rect = caption_rect or PixelRect(
-            int(frame_width * 0.08),
-            int(frame_height * 0.75),
-            int(frame_width * 0.84),
-            int(frame_height * 0.2),
-        ).clamp(frame_width, frame_height)
 
-        if current_entry is not None:
-            words = _ensure_entry_words(current_entry)
-            display_words = [w for w in words if w.text]
-            line_text = " ".join(w.text for w in display_words).strip()
-            if line_text:
-                fs = font_scale * 1.25
-                (tw, th), _ = cv2.getTextSize(line_text, font, fs, thickness + outline)
-                max_text_w = max(1, caption_wrap_pixels)
-                if tw > max_text_w:
-                    scale_factor = max_text_w / max(tw, 1)
-                    fs = fs * scale_factor
-                    (tw, th), _ = cv2.getTextSize(line_text, font, fs, thickness + outline)
-                available_h = max(0, effective_caption_rect.height)
-                total_h = th
-                if total_h > available_h and available_h > 0:
-                    scale_factor = available_h / max(total_h, 1)
-                    fs = fs * scale_factor
-                    (tw, th), _ = cv2.getTextSize(line_text, font, fs, thickness + outline)
-                    total_h = th
-                bottom_safe = int(frame_height * bottom_safe_ratio)
-                max_y = frame_height - bottom_safe - total_h
-                y_text = max(0, min(effective_caption_rect.y, max_y))
-                y_cursor = y_text + th
-
-                if caption_align == "left":
-                    x_text = effective_caption_rect.x
-                elif caption_align == "right":
-                    x_text = effective_caption_rect.x + max(0, effective_caption_rect.width - tw)
-                else:
-                    x_text = effective_caption_rect.x + max(0, (effective_caption_rect.width - tw) // 2)
-
-                highlight_index: Optional[int] = None
-                for idx, word in enumerate(display_words):
-                    if (word.start - time_tolerance) <= t <= (word.end + time_tolerance):
-                        highlight_index = idx
-                        break
-                if highlight_index is None and display_words:
-                    if t < display_words[0].start:
-                        highlight_index = 0
-                    else:
-                        highlight_index = len(display_words) - 1
-
-                space_width = cv2.getTextSize(" ", font, fs, thickness + outline)[0][0]
-                x_cursor = float(x_text)
-
-                def _draw_token(token: str, origin_x: float, origin_y: int, color: Tuple[int, int, int]) -> None:
-                    base_x = int(round(origin_x))
-                    for dx in (-outline, 0, outline):
-                        for dy in (-outline, 0, outline):
-                            if dx == 0 and dy == 0:
-                                continue
-                            cv2.putText(
-                                canvas,
-                                token,
-                                (base_x + dx, origin_y + dy),
-                                font,
-                                fs,
-                                outline_color,
-                                thickness + outline,
-                                line_type,
-                            )
-                    cv2.putText(
-                        canvas,
-                        token,
-                        (base_x, origin_y),
-                        font,
-                        fs,
-                        color,
-                        thickness,
-                        line_type,
-                    )
-
-                for idx, word in enumerate(display_words):
-                    token = word.text.strip()
-                    if not token:
-                        continue
-                    (word_w, _), _ = cv2.getTextSize(token, font, fs, thickness + outline)
-                    color = highlight_color if highlight_index == idx else base_caption_color
-                    _draw_token(token, x_cursor, int(round(y_cursor)), color)
-                    x_cursor += word_w
-                    if idx != len(display_words) - 1:
-                        x_cursor += space_width
-
-        writer.write(canvas)
-        frame_idx += 1
-
-    cap.release()
-    writer.release()
-
-    # --- Optional: Mux original audio (disabled if ffmpeg not present or mux_audio=False) ---
-    if mux_audio and shutil.which("ffmpeg") is not None:
-        gop = max(1, int(round(fps)) * 2)
-        mux_cmd = [
-            "ffmpeg", "-y",
-            "-i", str(temp_video),          # video (from OpenCV)
-            "-i", str(clip_path),           # original (for audio track)
-            "-map", "0:v:0", "-map", "1:a:0?",
-            # Re-encode video to H.264 + yuv420p at source FPS, faststart
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
-            "-profile:v", "high", "-level", "4.1",
-            "-r", f"{fps}",
-            "-vsync", "cfr",
-            "-g", str(gop),
-            "-movflags", "+faststart",
-            # Normalize audio to AAC if present
-            "-c:a", "aac", "-b:a", "192k", "-ar", "44100",
-            "-shortest",
-            str(output),
-        ]
-        try:
-            res = subprocess.run(mux_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            try:
-                if temp_video.exists():
-                    os.remove(temp_video)
-            except OSError:
-                pass
-        except subprocess.CalledProcessError as e:
-            # Fall back: just move the video-only file to the final path if mux fails
-            try:
-                if temp_video.exists():
-                    temp_video.replace(output)
-            except Exception:
-                pass
-            print("WARN: Audio mux/transcode failed; wrote video-only. STDERR head:\n" + (e.stderr.decode(errors='ignore')[:800] if e.stderr else ""))
-    else:
-        # No mux: write video-only as final
-        if temp_video.exists():
-            try:
-                temp_video.replace(output)
-            except Exception:
-                pass
+def render_vertical_with_captions(
+    clip_path: str | Path,
+    captions: CaptionSource = None,
+    output_path: str | Path = None,
+    *,
+    frame_width: int | None = None,
+    frame_height: int | None = None,
+    bottom_safe_ratio: float = 0.14,
+    layout: LayoutDefinition | str | None = None,
+    font_scale: float = CAPTION_FONT_SCALE,  # baseline; may shrink to keep captions below FG
+    thickness: int = 2,
+    outline: int = 4,
+    line_spacing: int = 10,
+    max_lines: int = CAPTION_MAX_LINES,
+    wrap_width_px_ratio: float = 0.86,  # caption max width as ratio of frame_width
+    blur_ksize: int = 31,               # must be odd; background blur amount
+    use_caption_colors: bool = CAPTION_USE_COLORS,
+    fill_bgr: Tuple[int, int, int] = CAPTION_FILL_BGR,
+    outline_bgr: Tuple[int, int, int] = CAPTION_OUTLINE_BGR,
+    # NEW performance toggles
+    use_cuda: bool = True,
+    use_opencl: bool = True,
+    cache_text_layout: bool = True,
+    # audio handling (mux is optional)
+    mux_audio: bool = True,
+    encoder: str = RENDER_ENCODER,
+    backend: str = RENDER_BACKEND,
+    # render a [start, end) range of ``clip_path`` (e.g. the full project video)
+    source_start: float | None = None,
+    source_end: float | None = None,
+    # frames buffered between the decode, compose and encode threads
+    prefetch_frames: int = 4,
+    # low-resolution review render; see ``promote_proxy_render``
+    proxy: bool = False,
+    # poster frame and scrub sprite sheet; see ``steps.rendering.thumbnails``
+    thumbnails: bool = False,
+    # per-stage timings; see ``steps.rendering.profile``
+    profiler: Optional[RenderProfiler] = None,
+) -> Path:
+    """Render a vertical video with burned-in captions.
 
-    return output
+    The original clip is resized and placed with blurred background and captions.
+    With ``encoder="ffmpeg"`` composed frames are piped into a single ffmpeg
+    process that encodes H.264 and muxes the clip audio in one pass; otherwise
+    (or when ffmpeg cannot be started) frames go through ``cv2.VideoWriter``
+    and a second ffmpeg pass re-encodes and muxes audio.
+
+    When ``source_start``/``source_end`` are given, ``clip_path`` is treated as
+    the full source video: decoding seeks to ``source_start`` and stops at
+    ``source_end`` so no intermediate clip needs to be cut first. Caption
+    timings stay relative to ``source_start``.
+
+    Decoding and encoding run on their own threads around composition, with
+    at most ``prefetch_frames`` frames queued between stages.
+
+    With ``backend="ffmpeg"`` the layout is compiled into a single ffmpeg
+    filtergraph that decodes, composes, burns in captions and encodes in one
+    process; layouts it cannot express fall back to the OpenCV engine.
+
+    With ``proxy=True`` the short is rendered at ``RENDER_PROXY_SCALE`` of the
+    layout size, with captions, outlines and blur scaled to match and an
+    ultrafast encode, for quick review. The render arguments are saved next
+    to the output so :func:`promote_proxy_render` can later redo it at full
+    quality.
+
+    With ``thumbnails=True`` (the OpenCV engine only) a poster frame, a scrub
+    sprite sheet and its JSON index are captured from the composed frames and
+    written next to the output; see :mod:`steps.rendering.thumbnails`. The
+    pipeline enables this with ``RENDER_THUMBNAILS``.
+
+    Pass a :class:`~steps.rendering.RenderProfiler` as ``profiler`` to record
+    decode, background, video, caption, write, finalize and mux timings; read
+    them with ``profiler.summary()`` once the render returns.
+
+    To produce several layouts or canvas sizes of the same clip, use
+    :func:`render_variants_with_captions`, which decodes the source once.
+    """
+    clip_path = Path(clip_path)
+    output = Path(output_path) if output_path is not None else Path(clip_path).with_name(Path(clip_path).stem + "_vertical.mp4")
+    variant = RenderVariant(
+        output,
+        layout=layout,
+        frame_width=frame_width,
+        frame_height=frame_height,
+        proxy=proxy,
+    )
+    style = _RenderStyle.from_options(
+        font_scale=font_scale,
+        thickness=thickness,
+        outline=outline,
+        line_spacing=line_spacing,
+        blur_ksize=blur_ksize,
+        bottom_safe_ratio=bottom_safe_ratio,
+        wrap_width_px_ratio=wrap_width_px_ratio,
+        use_caption_colors=use_caption_colors,
+        fill_bgr=fill_bgr,
+        outline_bgr=outline_bgr,
+    )
+    (rendered,) = _render_targets(
+        clip_path,
+        captions,
+        [variant],
+        style,
+        use_cuda=use_cuda,
+        use_opencl=use_opencl,
+        mux_audio=mux_audio,
+        encoder=encoder,
+        backend=backend,
+        source_start=source_start,
+        source_end=source_end,
+        prefetch_frames=prefetch_frames,
+        thumbnails=thumbnails,
+        profiler=profiler,
+    )
+    return rendered
+
+
+def render_variants_with_captions(
+    clip_path: str | Path,
+    captions: CaptionSource,
+    variants: Sequence[RenderVariant],
+    *,
+    bottom_safe_ratio: float = 0.14,
+    font_scale: float = CAPTION_FONT_SCALE,
+    thickness: int = 2,
+    outline: int = 4,
+    line_spacing: int = 10,
+    wrap_width_px_ratio: float = 0.86,
+    blur_ksize: int = 31,
+    use_caption_colors: bool = CAPTION_USE_COLORS,
+    fill_bgr: Tuple[int, int, int] = CAPTION_FILL_BGR,
+    outline_bgr: Tuple[int, int, int] = CAPTION_OUTLINE_BGR,
+    use_cuda: bool = True,
+    use_opencl: bool = True,
+    mux_audio: bool = True,
+    encoder: str = RENDER_ENCODER,
+    source_start: float | None = None,
+    source_end: float | None = None,
+    prefetch_frames: int = 4,
+    thumbnails: bool = False,
+    profiler: Optional[RenderProfiler] = None,
+) -> List[Path]:
+    """Render several layouts or canvas sizes of one clip in a single pass.
+
+    Each :class:`RenderVariant` names an output path and a layout and/or
+    canvas size (e.g. a 9:16 short alongside 1:1 and 16:9 versions). The
+    source is decoded once and every frame is composed into each variant,
+    with one encoder per output. Captions are parsed once, and variants that
+    wrap them the same way share one caption timeline.
+
+    The options match :func:`render_vertical_with_captions`; the filtergraph
+    backend is not used because it decodes per output. Returns the output
+    paths in the order of ``variants``.
+    """
+
+    if not variants:
+        return []
+    style = _RenderStyle.from_options(
+        font_scale=font_scale,
+        thickness=thickness,
+        outline=outline,
+        line_spacing=line_spacing,
+        blur_ksize=blur_ksize,
+        bottom_safe_ratio=bottom_safe_ratio,
+        wrap_width_px_ratio=wrap_width_px_ratio,
+        use_caption_colors=use_caption_colors,
+        fill_bgr=fill_bgr,
+        outline_bgr=outline_bgr,
+    )
+    return _render_targets(
+        Path(clip_path),
+        captions,
+        variants,
+        style,
+        use_cuda=use_cuda,
+        use_opencl=use_opencl,
+        mux_audio=mux_audio,
+        encoder=encoder,
+        backend="opencv",
+        source_start=source_start,
+        source_end=source_end,
+        prefetch_frames=prefetch_frames,
+        thumbnails=thumbnails,
+        profiler=profiler,
+    )
@@ -0,0 +1,62 @@
+"""Building blocks for the vertical renderer in :mod:`steps.render`."""
+
+from .captions import CaptionLayout, CaptionRasterizer, CaptionSprite, CaptionStyle, wrap_caption_text
+from .compose import FrameBufferPool, FrameCompositor
+from .filtergraph import UnsupportedLayoutError, compile_filtergraph, render_with_filtergraph
+from .layers import Overlay, StaticLayers, build_static_layers, parse_color_hex
+from .profile import RenderProfiler, StageTimer, append_render_metrics, load_render_metrics
+from .stages import run_render_stages
+from .thumbnails import (
+    ThumbnailCollector,
+    ThumbnailPaths,
+    load_sprite_index,
+    move_thumbnails,
+    remove_thumbnails,
+    thumbnail_paths,
+)
+from .timeline import (
+    CaptionEntry,
+    CaptionTimeline,
+    CaptionWord,
+    assign_words_to_entries,
+    ensure_entry_words,
+    split_long_captions,
+)
+from .writer import FFmpegPipeWriter, encode_output_args, open_ffmpeg_writer
+
+__all__ = [
+    "CaptionEntry",
+    "CaptionLayout",
+    "CaptionRasterizer",
+    "CaptionSprite",
+    "CaptionStyle",
+    "CaptionTimeline",
+    "CaptionWord",
+    "FFmpegPipeWriter",
+    "FrameBufferPool",
+    "FrameCompositor",
+    "Overlay",
+    "RenderProfiler",
+    "StageTimer",
+    "StaticLayers",
+    "ThumbnailCollector",
+    "ThumbnailPaths",
+    "UnsupportedLayoutError",
+    "append_render_metrics",
+    "assign_words_to_entries",
+    "build_static_layers",
+    "compile_filtergraph",
+    "encode_output_args",
+    "ensure_entry_words",
+    "load_render_metrics",
+    "load_sprite_index",
+    "move_thumbnails",
+    "open_ffmpeg_writer",
+    "parse_color_hex",
+    "remove_thumbnails",
+    "render_with_filtergraph",
+    "run_render_stages",
+    "split_long_captions",
+    "thumbnail_paths",
+    "wrap_caption_text",
+]
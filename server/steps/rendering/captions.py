@@ -0,0 +1,230 @@
+"""Pre-rasterized caption sprites for the vertical renderer.
+
+Captions only change when the active entry or highlighted word changes, so
+each ``(entry, highlight index)`` state is rasterized once into a premultiplied
+BGR sprite plus an inverse alpha mask. Per frame the renderer then performs a
+single in-place alpha blend into the canvas region instead of measuring and
+drawing every word with an outline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from layouts import PixelRect
+
+from .layers import Overlay, crop_overlay
+
+
+@dataclass(frozen=True)
+class CaptionStyle:
+    """Font and color settings shared by every caption sprite."""
+
+    font_scale: float
+    thickness: int
+    outline: int
+    base_color: Tuple[int, int, int]
+    highlight_color: Tuple[int, int, int]
+    outline_color: Tuple[int, int, int]
+    font: int = cv2.FONT_HERSHEY_SIMPLEX
+    line_type: int = cv2.LINE_AA
+
+
+class CaptionSprite(Overlay):
+    """A rasterized caption placed at ``(x, y)`` on the output canvas."""
+
+
+@dataclass
+class CaptionLayout:
+    """Placement of one caption line: scale, baseline and per-token x."""
+
+    font_scale: float
+    baseline_y: int
+    band_top: int
+    band_bottom: int
+    token_x: List[int]
+    text_width: int
+
+
+def wrap_caption_text(
+    text: str,
+    max_width: int,
+    *,
+    font: int = cv2.FONT_HERSHEY_SIMPLEX,
+    font_scale: float,
+    thickness: int,
+) -> List[str]:
+    """Greedily wrap ``text`` into lines no wider than ``max_width`` pixels."""
+
+    max_width = max(1, int(max_width))
+    lines: List[str] = []
+    cur = ""
+    for token in text.replace("\n", " ").split():
+        test = (cur + " " + token).strip()
+        (tw, _), _ = cv2.getTextSize(test, font, font_scale, thickness)
+        if tw <= max_width or not cur:
+            cur = test
+        else:
+            lines.append(cur)
+            cur = token
+    if cur:
+        lines.append(cur)
+    return lines
+
+
+class CaptionRasterizer:
+    """Lay out and rasterize word-highlighted caption lines once per state.
+
+    Layout matches the historical per-frame drawing: the line is scaled down to
+    fit ``wrap_pixels`` and the caption rect height, kept above the bottom safe
+    area, aligned inside ``caption_rect`` and drawn word by word with an
+    8-direction outline.
+    """
+
+    def __init__(
+        self,
+        style: CaptionStyle,
+        *,
+        frame_size: Tuple[int, int],
+        caption_rect: PixelRect,
+        wrap_pixels: int,
+        bottom_safe_ratio: float,
+        align: str = "center",
+    ) -> None:
+        self.style = style
+        self.frame_width, self.frame_height = int(frame_size[0]), int(frame_size[1])
+        self.caption_rect = caption_rect
+        self.wrap_pixels = max(1, int(wrap_pixels))
+        self.bottom_safe = int(self.frame_height * bottom_safe_ratio)
+        self.align = align or "center"
+        self._layout_key: Optional[Hashable] = None
+        self._layout: Optional[CaptionLayout] = None
+        self._sprites: Dict[Optional[int], Optional[CaptionSprite]] = {}
+        self.rasterized = 0
+
+    def sprite(
+        self,
+        key: Hashable,
+        tokens: Sequence[str],
+        highlight_index: Optional[int],
+    ) -> Optional[CaptionSprite]:
+        """Return the sprite for ``tokens`` with ``highlight_index`` emphasised.
+
+        ``key`` identifies the caption entry; sprites for the previous entry are
+        discarded when it changes since render time only moves forward.
+        """
+
+        if key != self._layout_key:
+            self._layout_key = key
+            self._layout = self.measure(tokens)
+            self._sprites = {}
+        if highlight_index in self._sprites:
+            return self._sprites[highlight_index]
+        sprite = None
+        if self._layout is not None:
+            sprite = self._rasterize(tokens, self._layout, highlight_index)
+            self.rasterized += 1
+        self._sprites[highlight_index] = sprite
+        return sprite
+
+    def _text_size(self, text: str, scale: float) -> Tuple[Tuple[int, int], int]:
+        st = self.style
+        return cv2.getTextSize(text, st.font, scale, st.thickness + st.outline)
+
+    def measure(self, tokens: Sequence[str]) -> Optional[CaptionLayout]:
+        """Lay out ``tokens`` on one line, or ``None`` if there is no text."""
+
+        line_text = " ".join(tokens).strip()
+        if not line_text:
+            return None
+        rect = self.caption_rect
+        fs = self.style.font_scale * 1.25
+        (tw, th), baseline = self._text_size(line_text, fs)
+        if tw > self.wrap_pixels:
+            fs = fs * (self.wrap_pixels / max(tw, 1))
+            (tw, th), baseline = self._text_size(line_text, fs)
+        available_h = max(0, rect.height)
+        if th > available_h and available_h > 0:
+            fs = fs * (available_h / max(th, 1))
+            (tw, th), baseline = self._text_size(line_text, fs)
+        max_y = self.frame_height - self.bottom_safe - th
+        y_text = max(0, min(rect.y, max_y))
+        baseline_y = y_text + th
+
+        if self.align == "left":
+            x_text = rect.x
+        elif self.align == "right":
+            x_text = rect.x + max(0, rect.width - tw)
+        else:
+            x_text = rect.x + max(0, (rect.width - tw) // 2)
+
+        space_width = self._text_size(" ", fs)[0][0]
+        token_x: List[int] = []
+        x_cursor = float(x_text)
+        for idx, token in enumerate(tokens):
+            token_x.append(int(round(x_cursor)))
+            if not token.strip():
+                continue
+            x_cursor += self._text_size(token.strip(), fs)[0][0]
+            if idx != len(tokens) - 1:
+                x_cursor += space_width
+
+        pad = self.style.outline + self.style.thickness + self.style.outline + 2
+        band_top = max(0, y_text - pad)
+        band_bottom = min(self.frame_height, baseline_y + baseline + pad)
+        return CaptionLayout(
+            font_scale=fs,
+            baseline_y=baseline_y,
+            band_top=band_top,
+            band_bottom=band_bottom,
+            token_x=token_x,
+            text_width=tw,
+        )
+
+    def _rasterize(
+        self,
+        tokens: Sequence[str],
+        layout: CaptionLayout,
+        highlight_index: Optional[int],
+    ) -> Optional[CaptionSprite]:
+        st = self.style
+        band_h = layout.band_bottom - layout.band_top
+        if band_h <= 0:
+            return None
+        color_layer = np.zeros((band_h, self.frame_width, 3), dtype=np.uint8)
+        alpha_layer = np.zeros((band_h, self.frame_width), dtype=np.uint8)
+        origin_y = layout.baseline_y - layout.band_top
+        outline = st.outline
+        fs = layout.font_scale
+
+        for idx, raw in enumerate(tokens):
+            token = raw.strip()
+            if not token:
+                continue
+            base_x = layout.token_x[idx]
+            color = st.highlight_color if highlight_index == idx else st.base_color
+            for dx in (-outline, 0, outline):
+                for dy in (-outline, 0, outline):
+                    if dx == 0 and dy == 0:
+                        continue
+                    org = (base_x + dx, origin_y + dy)
+                    cv2.putText(color_layer, token, org, st.font, fs, st.outline_color, st.thickness + outline, st.line_type)
+                    cv2.putText(alpha_layer, token, org, st.font, fs, 255, st.thickness + outline, st.line_type)
+            org = (base_x, origin_y)
+            cv2.putText(color_layer, token, org, st.font, fs, color, st.thickness, st.line_type)
+            cv2.putText(alpha_layer, token, org, st.font, fs, 255, st.thickness, st.line_type)
+
+        # Crop to the drawn pixels so the per-frame blend touches as little as possible
+        return crop_overlay(
+            color_layer,
+            alpha_layer,
+            offset=(0, layout.band_top),
+            cls=CaptionSprite,
+        )
+
+
+__all__ = ["CaptionLayout", "CaptionRasterizer", "CaptionSprite", "CaptionStyle", "wrap_caption_text"]
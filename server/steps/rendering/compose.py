@@ -0,0 +1,254 @@
+"""Per-frame compositing of background and video regions into reused buffers.
+
+:class:`FrameCompositor` owns every intermediate image the compose loop
+needs. Buffers are sized from the :class:`~layouts.PreparedLayout` and the
+first decoded frame, then reused for the rest of the render so steady-state
+frames allocate nothing: OpenCV calls write through ``dst=`` into pool
+buffers or directly into canvas views, and background dimming is a scalar
+multiply instead of a blend with a zero image.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from layouts import LayoutBackground, PreparedLayout, PreparedVideoItem
+
+from .layers import StaticLayers
+from .profile import RenderProfiler
+
+
+class FrameBufferPool:
+    """Named ``uint8`` buffers reused across frames.
+
+    ``canvas()`` hands out output canvases round-robin so up to ``depth``
+    frames can be in flight (e.g. queued for the encoder) before one is
+    overwritten. ``get()`` returns a scratch buffer for ``key`` and only
+    reallocates when the requested shape changes.
+    """
+
+    def __init__(self, width: int, height: int, *, depth: int = 1) -> None:
+        self.width = int(width)
+        self.height = int(height)
+        self._canvases = [
+            np.empty((self.height, self.width, 3), dtype=np.uint8) for _ in range(max(1, depth))
+        ]
+        self._next = 0
+        self._buffers: Dict[Hashable, np.ndarray] = {}
+
+    @property
+    def depth(self) -> int:
+        return len(self._canvases)
+
+    def canvas(self) -> np.ndarray:
+        canvas = self._canvases[self._next]
+        self._next = (self._next + 1) % len(self._canvases)
+        return canvas
+
+    def get(self, key: Hashable, shape: Tuple[int, ...]) -> np.ndarray:
+        buf = self._buffers.get(key)
+        if buf is None or buf.shape != shape:
+            buf = np.zeros(shape, dtype=np.uint8)
+            self._buffers[key] = buf
+        return buf
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._canvases) + sum(b.nbytes for b in self._buffers.values())
+
+
+def _odd(value: int) -> int:
+    value = max(1, int(value))
+    return value if value % 2 == 1 else value + 1
+
+
+def cover_crop_window(src_w: int, src_h: int, dst_w: int, dst_h: int) -> Tuple[int, int, int, int]:
+    """Return the ``(x, y, w, h)`` source window a centered "cover" fit shows.
+
+    Matches scaling the whole source up and cropping the middle, so resizing
+    just this window gives the same picture without the oversized temporary.
+    """
+
+    scale = max(dst_w / src_w, dst_h / src_h)
+    new_w = max(1, int(src_w * scale))
+    new_h = max(1, int(src_h * scale))
+    # ``cv2.resize`` scales each axis by the integer output size it is given
+    ratio_x = src_w / new_w
+    ratio_y = src_h / new_h
+    x = min(src_w - 1, int(round(max(0, (new_w - dst_w) // 2) * ratio_x)))
+    y = min(src_h - 1, int(round(max(0, (new_h - dst_h) // 2) * ratio_y)))
+    crop_w = min(src_w - x, max(1, int(round(dst_w * ratio_x))))
+    crop_h = min(src_h - y, max(1, int(round(dst_h * ratio_y))))
+    return x, y, crop_w, crop_h
+
+
+class FrameCompositor:
+    """Compose the background, video items and static layers for one frame."""
+
+    def __init__(
+        self,
+        prepared_layout: PreparedLayout,
+        static_layers: StaticLayers,
+        *,
+        background: LayoutBackground,
+        static_background: Optional[np.ndarray] = None,
+        blur_ksize: int = 31,
+        gpu_gauss=None,
+        pool: Optional[FrameBufferPool] = None,
+        profiler: Optional[RenderProfiler] = None,
+    ) -> None:
+        self.width = prepared_layout.width
+        self.height = prepared_layout.height
+        self.static_layers = static_layers
+        self.background = background
+        self.static_background = static_background
+        self.blur_ksize = blur_ksize
+        self.gpu_gauss = gpu_gauss
+        self.pool = pool or FrameBufferPool(self.width, self.height)
+        self._background_timer = profiler.stage("background") if profiler is not None else None
+        self._video_timer = profiler.stage("video") if profiler is not None else None
+
+        # Static items below the first video; already flattened into
+        # ``static_background`` for color/image backgrounds.
+        self.underlay = None if static_background is not None else static_layers.underlay
+
+        dim = background.opacity if background.opacity is not None else 0.55
+        self.dim_factor = min(max(dim, 0.0), 1.0)
+        kernel = background.radius if background.radius else blur_ksize
+        self.blur_kernel = _odd(kernel)
+
+    def compose(self, frame: np.ndarray) -> np.ndarray:
+        """Return a pool canvas holding ``frame`` laid out (captions excluded)."""
+
+        timed = self._background_timer is not None
+        started = time.perf_counter_ns() if timed else 0
+        canvas = self.pool.canvas()
+        if self.static_background is not None:
+            np.copyto(canvas, self.static_background)
+        elif self.background.kind == "blur":
+            if self.gpu_gauss is not None:
+                self._blur_background_cuda(frame, canvas)
+            else:
+                self._blur_background(frame, canvas)
+        else:
+            small = self.pool.get("fallback_blur", frame.shape)
+            k = _odd(self.blur_ksize)
+            cv2.GaussianBlur(frame, (k, k), 0, dst=small)
+            cv2.resize(small, (self.width, self.height), dst=canvas)
+
+        if self.underlay is not None:
+            self.underlay.blend_into(canvas)
+        if timed:
+            now = time.perf_counter_ns()
+            self._background_timer.add(now - started)
+            started = now
+
+        for idx, (prepared_video, layer) in enumerate(
+            zip(self.static_layers.videos, self.static_layers.layers[1:])
+        ):
+            self._compose_video(canvas, frame, idx, prepared_video)
+            if layer is not None:
+                layer.blend_into(canvas)
+        if timed:
+            self._video_timer.add(time.perf_counter_ns() - started)
+        return canvas
+
+    def _blur_background(self, frame: np.ndarray, canvas: np.ndarray) -> None:
+        # Only the part of the frame that covers the canvas is ever visible, so
+        # crop it first and downscale straight to the blur resolution.
+        h, w = frame.shape[:2]
+        x, y, cw, ch = cover_crop_window(w, h, self.width, self.height)
+        small_w = max(2, self.width // 4)
+        small_h = max(2, self.height // 4)
+        small = self.pool.get("blur_small", (small_h, small_w, 3))
+        blurred = self.pool.get("blur_blurred", (small_h, small_w, 3))
+        cv2.resize(frame[y:y + ch, x:x + cw], (small_w, small_h), dst=small, interpolation=cv2.INTER_AREA)
+        cv2.GaussianBlur(small, (self.blur_kernel, self.blur_kernel), 0, dst=blurred)
+        if self.dim_factor < 1.0:
+            cv2.convertScaleAbs(blurred, dst=blurred, alpha=self.dim_factor)
+        cv2.resize(blurred, (self.width, self.height), dst=canvas)
+
+    def _blur_background_cuda(self, frame: np.ndarray, canvas: np.ndarray) -> None:
+        h, w = frame.shape[:2]
+        x, y, cw, ch = cover_crop_window(w, h, self.width, self.height)
+        gpu_frame = cv2.cuda_GpuMat()
+        gpu_frame.upload(frame[y:y + ch, x:x + cw])
+        gpu_bg = cv2.cuda.resize(gpu_frame, (self.width, self.height))
+        gpu_bg = self.gpu_gauss.apply(gpu_bg)
+        gpu_bg.download(canvas)
+        if self.dim_factor < 1.0:
+            cv2.convertScaleAbs(canvas, dst=canvas, alpha=self.dim_factor)
+
+    def _compose_video(
+        self,
+        canvas: np.ndarray,
+        frame: np.ndarray,
+        idx: int,
+        prepared_video: PreparedVideoItem,
+    ) -> None:
+        h, w = frame.shape[:2]
+        rect = prepared_video.target.clamp(self.width, self.height)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        crop = prepared_video.crop
+        region = frame
+        if crop is not None:
+            if crop.units == "pixels":
+                crop_x = int(max(0, crop.x))
+                crop_y = int(max(0, crop.y))
+                crop_w = int(max(1, crop.width))
+                crop_h = int(max(1, crop.height))
+            else:
+                crop_x = int(max(0, crop.x) * w)
+                crop_y = int(max(0, crop.y) * h)
+                crop_w = int(max(1, crop.width) * w)
+                crop_h = int(max(1, crop.height) * h)
+            crop_x2 = min(w, crop_x + crop_w)
+            crop_y2 = min(h, crop_y + crop_h)
+            if crop_x2 > crop_x and crop_y2 > crop_y:
+                region = frame[crop_y:crop_y2, crop_x:crop_x2]
+        if region.size == 0:
+            return
+
+        target_w = rect.width
+        target_h = rect.height
+        src_h, src_w = region.shape[:2]
+        mode = prepared_video.item.scale_mode
+        if mode == "cover":
+            x, y, cw, ch = cover_crop_window(src_w, src_h, target_w, target_h)
+            region = region[y:y + ch, x:x + cw]
+
+        if prepared_video.item.mirror:
+            flipped = self.pool.get(("mirror", idx), region.shape)
+            cv2.flip(region, 1, dst=flipped)
+            region = flipped
+
+        opacity = prepared_video.item.opacity if prepared_video.item.opacity is not None else 1.0
+        opacity = max(0.0, min(1.0, opacity))
+        dest = canvas[rect.y:rect.y + target_h, rect.x:rect.x + target_w]
+        # Opaque items are resized straight into the canvas
+        out = dest if opacity >= 1.0 else self.pool.get(("video", idx), (target_h, target_w, 3))
+
+        if mode == "contain":
+            scale = min(target_w / src_w, target_h / src_h)
+            new_w = min(target_w, max(1, int(src_w * scale)))
+            new_h = min(target_h, max(1, int(src_h * scale)))
+            offset_x = (target_w - new_w) // 2
+            offset_y = (target_h - new_h) // 2
+            out[:offset_y] = 0
+            out[offset_y + new_h:] = 0
+            out[offset_y:offset_y + new_h, :offset_x] = 0
+            out[offset_y:offset_y + new_h, offset_x + new_w:] = 0
+            cv2.resize(region, (new_w, new_h), dst=out[offset_y:offset_y + new_h, offset_x:offset_x + new_w])
+        else:
+            cv2.resize(region, (target_w, target_h), dst=out)
+
+        if out is not dest:
+            cv2.addWeighted(out, opacity, dest, 1 - opacity, 0, dst=dest)
+
+
+__all__ = ["FrameBufferPool", "FrameCompositor", "cover_crop_window"]
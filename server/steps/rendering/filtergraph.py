@@ -0,0 +1,362 @@
+"""Compile a prepared layout into a single ffmpeg ``filter_complex`` render.
+
+This backend hands the whole compose step to ffmpeg's native, multi-threaded
+filters: the blurred background is ``crop``/``scale``/``gblur``/``lutyuv``,
+video items are ``crop``/``hflip``/``scale``/``pad`` chains placed with
+``overlay``, and captions are burned in by libass from a generated subtitle
+file. Static layers (shapes and texts) and color/image backgrounds are the
+same pre-composed images the OpenCV engine uses, looped as extra inputs so
+both engines agree on z-order, opacity and text rendering.
+
+Anything ffmpeg cannot express raises :class:`UnsupportedLayoutError` so the
+caller can fall back to the OpenCV engine.
+"""
+
+from __future__ import annotations
+
+import functools
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from layouts import LayoutBackground, PreparedVideoItem
+
+from .compose import cover_crop_window
+from .layers import Overlay, StaticLayers
+from .writer import encode_output_args
+
+_REQUIRED_FILTERS = ("crop", "scale", "gblur", "lutyuv", "overlay", "pad", "hflip", "loop", "colorchannelmixer")
+
+
+class UnsupportedLayoutError(ValueError):
+    """Raised when a layout or environment cannot use the filtergraph backend."""
+
+
+@dataclass
+class OverlayImage:
+    """A straight-alpha image input placed at ``(x, y)`` on the canvas."""
+
+    path: Path
+    x: int
+    y: int
+
+
+@dataclass
+class FilterGraph:
+    """Extra inputs plus the ``filter_complex`` producing ``output_label``."""
+
+    inputs: List[str]
+    filter_complex: str
+    output_label: str
+
+
+def escape_filter_value(value: str) -> str:
+    """Escape ``value`` for use as a filter option inside ``filter_complex``."""
+
+    # First level: the filter's own option parser
+    for ch in ("\\", "'", ":"):
+        value = value.replace(ch, "\\" + ch)
+    # Second level: the filtergraph parser
+    for ch in ("\\", "'", "[", "]", ",", ";"):
+        value = value.replace(ch, "\\" + ch)
+    return value
+
+
+def _even(value: int) -> int:
+    return max(2, int(value) // 2 * 2)
+
+
+def _gaussian_sigma(ksize: int) -> float:
+    # Same sigma OpenCV derives for GaussianBlur(ksize, sigma=0)
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def _dim_filter(factor: float) -> str:
+    # Scaling RGB by ``factor`` scales limited-range luma and chroma around their offsets
+    return (
+        f"lutyuv=y='(val-16)*{factor:.4f}+16'"
+        f":u='(val-128)*{factor:.4f}+128'"
+        f":v='(val-128)*{factor:.4f}+128'"
+    )
+
+
+def _video_chain(
+    prepared: PreparedVideoItem,
+    source_size: Tuple[int, int],
+    canvas_size: Tuple[int, int],
+) -> Optional[Tuple[str, int, int]]:
+    """Return ``(filters, x, y)`` placing one video item, or ``None`` if empty."""
+
+    item = prepared.item
+    if item.rotation:
+        raise UnsupportedLayoutError(f"video item {item.id!r} uses rotation")
+    w, h = source_size
+    rect = prepared.target.clamp(*canvas_size)
+    if rect.width <= 0 or rect.height <= 0:
+        return None
+
+    rx, ry, rw, rh = 0, 0, w, h
+    crop = prepared.crop
+    if crop is not None:
+        if crop.units == "pixels":
+            cx, cy = int(max(0, crop.x)), int(max(0, crop.y))
+            cw, ch = int(max(1, crop.width)), int(max(1, crop.height))
+        else:
+            cx, cy = int(max(0, crop.x) * w), int(max(0, crop.y) * h)
+            cw, ch = int(max(1, crop.width) * w), int(max(1, crop.height) * h)
+        cx2, cy2 = min(w, cx + cw), min(h, cy + ch)
+        if cx2 > cx and cy2 > cy:
+            rx, ry, rw, rh = cx, cy, cx2 - cx, cy2 - cy
+
+    filters: List[str] = []
+    tw, th = rect.width, rect.height
+    mode = item.scale_mode
+    if mode == "cover":
+        x, y, cw, ch = cover_crop_window(rw, rh, tw, th)
+        rx, ry, rw, rh = rx + x, ry + y, cw, ch
+    if (rx, ry, rw, rh) != (0, 0, w, h):
+        filters.append(f"crop={rw}:{rh}:{rx}:{ry}")
+    if item.mirror:
+        filters.append("hflip")
+    if mode == "contain":
+        scale = min(tw / rw, th / rh)
+        new_w = min(tw, max(1, int(rw * scale)))
+        new_h = min(th, max(1, int(rh * scale)))
+        filters.append(f"scale={new_w}:{new_h}:flags=bilinear")
+        filters.append(f"pad={tw}:{th}:{(tw - new_w) // 2}:{(th - new_h) // 2}:black")
+    else:
+        filters.append(f"scale={tw}:{th}:flags=bilinear")
+
+    opacity = item.opacity if item.opacity is not None else 1.0
+    opacity = max(0.0, min(1.0, opacity))
+    if opacity < 1.0:
+        filters.append("format=yuva420p")
+        filters.append(f"colorchannelmixer=aa={opacity:.4f}")
+    return ",".join(filters), rect.x, rect.y
+
+
+def compile_filtergraph(
+    videos: Sequence[PreparedVideoItem],
+    layers: Sequence[Optional[OverlayImage]],
+    *,
+    canvas_size: Tuple[int, int],
+    source_size: Tuple[int, int],
+    fps: float,
+    background: LayoutBackground,
+    background_image: Optional[Path] = None,
+    blur_ksize: int = 31,
+    subtitles: Optional[Path] = None,
+) -> FilterGraph:
+    """Build the filtergraph for one render.
+
+    Input ``0`` is the source video. ``background_image`` (a pre-composed
+    color/image background) and the static ``layers`` become looped image
+    inputs; ``layers[i]`` is drawn before ``videos[i]`` and ``layers[-1]``
+    last, matching :class:`~steps.rendering.layers.StaticLayers`.
+    """
+
+    if not videos:
+        raise UnsupportedLayoutError("layout has no video items")
+    if background_image is None and background.kind != "blur":
+        raise UnsupportedLayoutError(f"background {background.kind!r} needs a pre-composed image")
+    width, height = canvas_size
+    inputs: List[str] = []
+    graph: List[str] = []
+    next_input = 1
+
+    def _image_input(path: Path) -> str:
+        nonlocal next_input
+        inputs.extend(["-framerate", f"{fps}", "-i", str(path)])
+        label = f"img{next_input}"
+        # Decode once, then repeat the frame for the whole render
+        graph.append(f"[{next_input}:v]loop=loop=-1:size=1:start=0,format=yuva420p[{label}]")
+        next_input += 1
+        return label
+
+    chains = [_video_chain(prepared, source_size, canvas_size) for prepared in videos]
+    video_labels = [f"v{idx}" for idx, chain in enumerate(chains) if chain is not None]
+    sources = (["bgsrc"] if background_image is None else []) + video_labels
+    if len(sources) == 1:
+        graph.append(f"[0:v]null[{sources[0]}]")
+    else:
+        graph.append(f"[0:v]split={len(sources)}" + "".join(f"[{label}]" for label in sources))
+
+    if background_image is None:
+        src_w, src_h = source_size
+        x, y, cw, ch = cover_crop_window(src_w, src_h, width, height)
+        small_w, small_h = _even(width // 4), _even(height // 4)
+        kernel = background.radius if background.radius else blur_ksize
+        kernel = max(1, int(kernel)) | 1
+        dim = background.opacity if background.opacity is not None else 0.55
+        dim = min(max(dim, 0.0), 1.0)
+        bg = [
+            f"crop={cw}:{ch}:{x}:{y}",
+            f"scale={small_w}:{small_h}:flags=area",
+            f"gblur=sigma={_gaussian_sigma(kernel):.3f}",
+        ]
+        if dim < 1.0:
+            bg.append(_dim_filter(dim))
+        bg.append(f"scale={width}:{height}:flags=bilinear")
+        graph.append("[bgsrc]" + ",".join(bg) + "[base0]")
+        underlay = layers[0] if layers else None
+    else:
+        graph.append(f"[{_image_input(background_image)}]format=yuv420p[base0]")
+        underlay = None
+
+    base = "base0"
+    step = 0
+
+    def _overlay(top: str, x: int, y: int) -> None:
+        nonlocal base, step
+        step += 1
+        out = f"base{step}"
+        graph.append(f"[{base}][{top}]overlay={x}:{y}:shortest=1:format=yuv420[{out}]")
+        base = out
+
+    if underlay is not None:
+        _overlay(_image_input(underlay.path), underlay.x, underlay.y)
+    for idx, chain in enumerate(chains):
+        if chain is not None:
+            filters, x, y = chain
+            graph.append(f"[v{idx}]{filters}[v{idx}out]")
+            _overlay(f"v{idx}out", x, y)
+        layer = layers[idx + 1] if idx + 1 < len(layers) else None
+        if layer is not None:
+            _overlay(_image_input(layer.path), layer.x, layer.y)
+
+    if subtitles is not None:
+        step += 1
+        out = f"base{step}"
+        graph.append(f"[{base}]subtitles=filename={escape_filter_value(str(subtitles))}[{out}]")
+        base = out
+
+    return FilterGraph(inputs=inputs, filter_complex=";".join(graph), output_label=base)
+
+
+def _write_overlay_png(overlay: Overlay, path: Path) -> OverlayImage:
+    """Save a premultiplied :class:`Overlay` as a straight-alpha PNG."""
+
+    alpha = 255 - overlay.inverse_alpha[:, :, 0].astype(np.float32)
+    safe = np.maximum(alpha, 1.0)[:, :, None]
+    color = np.clip(overlay.premultiplied.astype(np.float32) * 255.0 / safe, 0, 255)
+    bgra = np.dstack([color.astype(np.uint8), alpha.astype(np.uint8)])
+    cv2.imwrite(str(path), bgra)
+    return OverlayImage(path=path, x=overlay.x, y=overlay.y)
+
+
+@functools.lru_cache(maxsize=None)
+def available_filters(ffmpeg_bin: str) -> frozenset[str]:
+    """Return the filter names supported by ``ffmpeg_bin``.
+
+    Cached per binary path, so ``ffmpeg -filters`` runs once per process
+    rather than once per clip.
+    """
+
+    try:
+        res = subprocess.run(
+            [ffmpeg_bin, "-hide_banner", "-filters"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    names = set()
+    for line in res.stdout.decode(errors="ignore").splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and "->" in parts[2]:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def render_with_filtergraph(
+    source: str | Path,
+    output: str | Path,
+    static_layers: StaticLayers,
+    *,
+    canvas_size: Tuple[int, int],
+    source_size: Tuple[int, int],
+    fps: float,
+    background: LayoutBackground,
+    static_background: Optional[np.ndarray] = None,
+    blur_ksize: int = 31,
+    subtitles: Optional[Path] = None,
+    source_start: float | None = None,
+    source_end: float | None = None,
+    mux_audio: bool = True,
+    preset: str | None = None,
+    crf: int | None = None,
+) -> Path:
+    """Render ``source`` through one ffmpeg process using a compiled filtergraph.
+
+    Raises :class:`UnsupportedLayoutError` before starting ffmpeg when the
+    layout or the local ffmpeg build cannot express the render, and
+    ``RuntimeError`` if ffmpeg itself fails.
+    """
+
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if ffmpeg_bin is None:
+        raise UnsupportedLayoutError("ffmpeg is not installed")
+    required = set(_REQUIRED_FILTERS) | ({"subtitles"} if subtitles is not None else set())
+    missing = required - available_filters(ffmpeg_bin)
+    if missing:
+        raise UnsupportedLayoutError(f"ffmpeg lacks filters: {', '.join(sorted(missing))}")
+
+    output = Path(output)
+    with tempfile.TemporaryDirectory(prefix="filtergraph-", dir=output.parent) as tmp:
+        tmp_dir = Path(tmp)
+        background_image = None
+        if static_background is not None:
+            background_image = tmp_dir / "background.png"
+            cv2.imwrite(str(background_image), static_background)
+        layer_images = [
+            _write_overlay_png(layer, tmp_dir / f"layer{idx}.png") if layer is not None else None
+            for idx, layer in enumerate(static_layers.layers)
+        ]
+        graph = compile_filtergraph(
+            static_layers.videos,
+            layer_images,
+            canvas_size=canvas_size,
+            source_size=source_size,
+            fps=fps,
+            background=background,
+            background_image=background_image,
+            blur_ksize=blur_ksize,
+            subtitles=subtitles,
+        )
+
+        cmd = [ffmpeg_bin, "-y", "-hide_banner", "-loglevel", "error"]
+        if source_start:
+            cmd += ["-ss", f"{source_start:.3f}"]
+        if source_end is not None:
+            cmd += ["-t", f"{source_end - (source_start or 0.0):.3f}"]
+        cmd += ["-i", str(source), *graph.inputs]
+        cmd += ["-filter_complex", graph.filter_complex, "-map", f"[{graph.output_label}]"]
+        if mux_audio:
+            cmd += ["-map", "0:a:0?"]
+        cmd += encode_output_args(fps, audio=mux_audio, preset=preset, crf=crf)
+        cmd.append(str(output))
+        res = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if res.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg filtergraph render failed ({res.returncode}): "
+                + res.stderr.decode(errors="ignore")[-800:]
+            )
+    return output
+
+
+__all__ = [
+    "FilterGraph",
+    "OverlayImage",
+    "UnsupportedLayoutError",
+    "available_filters",
+    "compile_filtergraph",
+    "escape_filter_value",
+    "render_with_filtergraph",
+]
@@ -0,0 +1,293 @@
+"""Static layout layers pre-composed once per render.
+
+Shapes and text overlays never change during a clip, so they are painted once
+into premultiplied BGR layers with an inverse alpha mask. Layers are split
+around the video items by ``z_index`` so the compose loop only has to place
+the video regions and blend one layer per gap.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from layouts import PreparedLayout, PreparedShapeItem, PreparedTextItem, PreparedVideoItem
+
+
+def parse_color_hex(value: str | None, fallback: Tuple[int, int, int] = (0, 0, 0)) -> Tuple[int, int, int]:
+    """Convert ``#rrggbb``/``#rgb`` into an OpenCV BGR tuple."""
+
+    if not value:
+        return fallback
+    value = value.strip().lstrip('#')
+    if len(value) == 3:
+        value = ''.join(ch * 2 for ch in value)
+    if len(value) != 6:
+        return fallback
+    try:
+        r = int(value[0:2], 16)
+        g = int(value[2:4], 16)
+        b = int(value[4:6], 16)
+    except ValueError:
+        return fallback
+    return (b, g, r)
+
+
+@dataclass
+class Overlay:
+    """A premultiplied BGR image placed at ``(x, y)`` on the output canvas."""
+
+    x: int
+    y: int
+    premultiplied: np.ndarray
+    inverse_alpha: np.ndarray
+
+    @property
+    def width(self) -> int:
+        return int(self.premultiplied.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.premultiplied.shape[0])
+
+    def blend_into(self, canvas: np.ndarray) -> None:
+        """Composite the overlay over ``canvas`` in place."""
+
+        roi = canvas[self.y:self.y + self.height, self.x:self.x + self.width]
+        cv2.multiply(roi, self.inverse_alpha, dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, self.premultiplied, dst=roi)
+
+
+def crop_overlay(
+    premultiplied: np.ndarray,
+    alpha: np.ndarray,
+    *,
+    offset: Tuple[int, int] = (0, 0),
+    cls: type = Overlay,
+):
+    """Crop uint8 ``premultiplied``/``alpha`` planes to their drawn pixels.
+
+    Returns an instance of ``cls`` (an :class:`Overlay` subclass) positioned at
+    ``offset`` plus the crop origin, or ``None`` when nothing was drawn.
+    """
+
+    ys, xs = np.nonzero(alpha)
+    if ys.size == 0:
+        return None
+    y0, y1 = int(ys.min()), int(ys.max()) + 1
+    x0, x1 = int(xs.min()), int(xs.max()) + 1
+    inverse = 255 - alpha[y0:y1, x0:x1]
+    return cls(
+        x=offset[0] + x0,
+        y=offset[1] + y0,
+        premultiplied=np.ascontiguousarray(premultiplied[y0:y1, x0:x1]),
+        inverse_alpha=np.ascontiguousarray(np.repeat(inverse[:, :, None], 3, axis=2)),
+    )
+
+
+class _LayerCanvas:
+    """Float accumulator for painting static items with ``over`` compositing."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.color = np.zeros((height, width, 3), dtype=np.float32)
+        self.alpha = np.zeros((height, width), dtype=np.float32)
+        self.empty = True
+
+    def paint(self, coverage: np.ndarray, color: Tuple[int, int, int], region: Tuple[int, int, int, int] | None = None) -> None:
+        """Paint ``color`` where ``coverage`` (0..1) is set, over existing pixels."""
+
+        if region is None:
+            dst_color, dst_alpha = self.color, self.alpha
+        else:
+            x0, y0, x1, y1 = region
+            dst_color = self.color[y0:y1, x0:x1]
+            dst_alpha = self.alpha[y0:y1, x0:x1]
+        keep = 1.0 - coverage
+        dst_color *= keep[..., None]
+        dst_color += coverage[..., None] * np.asarray(color, dtype=np.float32)
+        dst_alpha *= keep
+        dst_alpha += coverage
+        self.empty = False
+
+    def to_overlay(self) -> Optional[Overlay]:
+        if self.empty:
+            return None
+        premultiplied = np.clip(np.rint(self.color), 0, 255).astype(np.uint8)
+        alpha = np.clip(np.rint(self.alpha * 255.0), 0, 255).astype(np.uint8)
+        return crop_overlay(premultiplied, alpha)
+
+
+@dataclass
+class StaticLayers:
+    """Video items in paint order with the static layers between them.
+
+    ``layers`` has one more entry than ``videos``: ``layers[i]`` is painted
+    before ``videos[i]`` and ``layers[-1]`` after the last video. Entries are
+    ``None`` when no static item falls into that gap.
+    """
+
+    videos: Tuple[PreparedVideoItem, ...]
+    layers: Tuple[Optional[Overlay], ...]
+
+    @property
+    def underlay(self) -> Optional[Overlay]:
+        return self.layers[0]
+
+    @property
+    def overlay(self) -> Optional[Overlay]:
+        return self.layers[-1]
+
+
+_StaticItem = Union[PreparedShapeItem, PreparedTextItem]
+
+# Tie-break for equal ``z_index`` keeps the historical shapes → videos → texts order
+_KIND_ORDER = {"shape": 0, "video": 1, "text": 2}
+
+
+def _paint_shape(layer: _LayerCanvas, prepared: PreparedShapeItem) -> None:
+    rect = prepared.target.clamp(layer.width, layer.height)
+    if rect.width <= 0 or rect.height <= 0:
+        return
+    opacity = max(0.0, min(1.0, prepared.item.opacity))
+    if opacity <= 0.0:
+        return
+    color = parse_color_hex(prepared.item.color, (0, 0, 0))
+    coverage = np.full((rect.height, rect.width), opacity, dtype=np.float32)
+    layer.paint(coverage, color, (rect.x, rect.y, rect.x + rect.width, rect.y + rect.height))
+
+
+def _paint_text(
+    layer: _LayerCanvas,
+    prepared: PreparedTextItem,
+    *,
+    font_scale: float,
+    thickness: int,
+    outline: int,
+    fill_color: Tuple[int, int, int],
+    outline_color: Tuple[int, int, int],
+    font: int,
+    line_type: int,
+) -> None:
+    item = prepared.item
+    content = item.content.strip()
+    if not content:
+        return
+    rect = prepared.target.clamp(layer.width, layer.height)
+    if rect.width <= 0 or rect.height <= 0:
+        return
+    opacity = item.opacity if item.opacity is not None else 1.0
+    opacity = max(0.0, min(1.0, opacity))
+    if opacity <= 0.0:
+        return
+    lines = content.splitlines() or [content]
+    if item.font_size is None:
+        text_scale = font_scale
+    else:
+        text_scale = max(0.3, float(item.font_size) / 32.0 * font_scale)
+    if item.line_height is None:
+        text_spacing = int(18 * (text_scale / font_scale))
+    else:
+        text_spacing = int(item.line_height)
+    text_color = parse_color_hex(item.color, fill_color)
+
+    outline_mask = np.zeros((layer.height, layer.width), dtype=np.uint8)
+    fill_mask = np.zeros_like(outline_mask)
+    y_cursor = rect.y
+    for ln in lines:
+        if item.uppercase:
+            ln = ln.upper()
+        (tw, th), _ = cv2.getTextSize(ln, font, text_scale, thickness + outline)
+        if item.align == "left":
+            x_text = rect.x
+        elif item.align == "right":
+            x_text = rect.x + max(0, rect.width - tw)
+        else:
+            x_text = rect.x + max(0, (rect.width - tw) // 2)
+        y_cursor += th
+        for dx in (-outline, 0, outline):
+            for dy in (-outline, 0, outline):
+                if dx == 0 and dy == 0:
+                    continue
+                cv2.putText(outline_mask, ln, (x_text + dx, y_cursor + dy), font, text_scale, 255, thickness + outline, line_type)
+        cv2.putText(fill_mask, ln, (x_text, y_cursor), font, text_scale, 255, thickness, line_type)
+        y_cursor += text_spacing
+
+    scale = opacity / 255.0
+    layer.paint(outline_mask.astype(np.float32) * scale, outline_color)
+    layer.paint(fill_mask.astype(np.float32) * scale, text_color)
+
+
+def build_static_layers(
+    prepared_layout: PreparedLayout,
+    *,
+    font_scale: float,
+    thickness: int,
+    outline: int,
+    fill_color: Tuple[int, int, int],
+    outline_color: Tuple[int, int, int],
+    font: int = cv2.FONT_HERSHEY_SIMPLEX,
+    line_type: int = cv2.LINE_AA,
+) -> StaticLayers:
+    """Pre-compose the shapes and texts of ``prepared_layout``.
+
+    Items are ordered by ``z_index`` across kinds; consecutive static items are
+    flattened into one :class:`Overlay` per gap between video items.
+    """
+
+    width, height = prepared_layout.width, prepared_layout.height
+    ordered: List[Tuple[int, int, int, str, object]] = []
+    for kind, items in (
+        ("shape", prepared_layout.shapes),
+        ("video", prepared_layout.videos),
+        ("text", prepared_layout.texts),
+    ):
+        for position, prepared in enumerate(items):
+            ordered.append((prepared.item.z_index, _KIND_ORDER[kind], position, kind, prepared))
+    ordered.sort(key=lambda entry: entry[:3])
+
+    videos: List[PreparedVideoItem] = []
+    groups: List[List[Tuple[str, _StaticItem]]] = [[]]
+    for _, _, _, kind, prepared in ordered:
+        if kind == "video":
+            videos.append(prepared)  # type: ignore[arg-type]
+            groups.append([])
+        else:
+            groups[-1].append((kind, prepared))  # type: ignore[arg-type]
+
+    layers: List[Optional[Overlay]] = []
+    for group in groups:
+        if not group:
+            layers.append(None)
+            continue
+        layer = _LayerCanvas(width, height)
+        for kind, prepared in group:
+            if kind == "shape":
+                _paint_shape(layer, prepared)  # type: ignore[arg-type]
+            else:
+                _paint_text(
+                    layer,
+                    prepared,  # type: ignore[arg-type]
+                    font_scale=font_scale,
+                    thickness=thickness,
+                    outline=outline,
+                    fill_color=fill_color,
+                    outline_color=outline_color,
+                    font=font,
+                    line_type=line_type,
+                )
+        layers.append(layer.to_overlay())
+    return StaticLayers(videos=tuple(videos), layers=tuple(layers))
+
+
+__all__ = [
+    "Overlay",
+    "StaticLayers",
+    "build_static_layers",
+    "crop_overlay",
+    "parse_color_hex",
+]
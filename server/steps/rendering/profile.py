@@ -0,0 +1,145 @@
+"""Low-overhead per-stage timings for the vertical renderer.
+
+A :class:`RenderProfiler` holds one :class:`StageTimer` per render stage.
+Timing a stage costs two ``perf_counter_ns`` calls and a few integer
+operations; there are no locks because every stage is only ever recorded
+from one thread (decode on the reader thread, compose stages on the calling
+thread, writes on the writer thread). Durations are bucketed into a base-2
+histogram of microseconds so summaries stay small however long the render.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Stages in the order a frame passes through them
+STAGES = (
+    "decode",
+    "background",
+    "video",
+    "captions",
+    "thumbnails",
+    "write",
+    "finalize",
+    "mux",
+    "filtergraph",
+)
+
+# Bucket ``i`` counts durations below 2**i microseconds (bucket 0: under 1µs);
+# the last bucket also takes everything longer.
+_BUCKETS = 26
+
+
+class StageTimer:
+    """Count, total, maximum and histogram of one stage's durations."""
+
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = (elapsed_ns // 1000).bit_length()
+        self.buckets[bucket if bucket < _BUCKETS else _BUCKETS - 1] += 1
+
+    def quantile_ms(self, q: float) -> Optional[float]:
+        """Upper bound of the histogram bucket holding quantile ``q``."""
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return (1 << idx) / 1000.0
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_ms": round(self.total_ns / self.count / 1e6, 4) if self.count else None,
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "p50_ms": self.quantile_ms(0.5),
+            "p95_ms": self.quantile_ms(0.95),
+            # Non-empty buckets as (upper bound in ms, count)
+            "histogram": [
+                [(1 << idx) / 1000.0, n] for idx, n in enumerate(self.buckets) if n
+            ],
+        }
+
+
+class RenderProfiler:
+    """Per-stage timings for one call of the renderer.
+
+    Hot paths fetch a stage once with :meth:`stage` and call
+    ``timer.add(time.perf_counter_ns() - started)`` around the work.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageTimer] = {name: StageTimer() for name in STAGES}
+        self.frames = 0
+        self._started = time.perf_counter_ns()
+        self._elapsed_ns: Optional[int] = None
+
+    def stage(self, name: str) -> StageTimer:
+        return self.stages[name]
+
+    def stop(self) -> None:
+        """Freeze the wall-clock time reported by :meth:`summary`."""
+
+        self._elapsed_ns = time.perf_counter_ns() - self._started
+
+    def summary(self) -> dict:
+        elapsed = self._elapsed_ns if self._elapsed_ns is not None else time.perf_counter_ns() - self._started
+        wall_seconds = elapsed / 1e9
+        return {
+            "frames": self.frames,
+            "wall_seconds": round(wall_seconds, 3),
+            "fps": round(self.frames / wall_seconds, 2) if wall_seconds > 0 and self.frames else None,
+            "stages": {name: timer.summary() for name, timer in self.stages.items() if timer.count},
+        }
+
+
+def append_render_metrics(path: str | Path, record: dict) -> Path:
+    """Append ``record`` as one JSON line to the metrics file at ``path``."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return path
+
+
+def load_render_metrics(path: str | Path) -> List[dict]:
+    """Return every record in the metrics file at ``path``, oldest first."""
+
+    path = Path(path)
+    if not path.exists():
+        return []
+    records: List[dict] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+__all__ = [
+    "RenderProfiler",
+    "StageTimer",
+    "append_render_metrics",
+    "load_render_metrics",
+]
@@ -0,0 +1,135 @@
+"""Threaded decode → compose → encode stages for the vertical renderer.
+
+Decoding and encoding run on their own threads around the compose stage,
+which stays on the calling thread. OpenCV and the ffmpeg pipe release the GIL
+while they work, so the three stages overlap on multi-core machines. Bounded
+queues provide backpressure: a slow encoder stalls composition, which in turn
+stalls decoding, so at most ``queue_size`` frames wait between any two stages.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Marks the end of a stream on a stage queue
+_END = object()
+
+
+def _put(q: "queue.Queue[object]", item: object, stop: threading.Event) -> bool:
+    """Put ``item`` unless ``stop`` is set while waiting for space."""
+
+    while True:
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                return False
+
+
+def _get(q: "queue.Queue[object]", stop: threading.Event) -> object:
+    """Get the next item, returning ``_END`` if ``stop`` is set while waiting."""
+
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return _END
+
+
+def run_render_stages(
+    read: Callable[[Optional[np.ndarray]], Optional[np.ndarray]],
+    compose: Callable[[int, np.ndarray], np.ndarray],
+    write: Callable[[np.ndarray], None],
+    *,
+    queue_size: int = 4,
+) -> int:
+    """Run ``read`` → ``compose`` → ``write`` as a three-stage pipeline.
+
+    ``read(buffer)`` runs on a reader thread and returns the next frame, or
+    ``None`` at the end of the stream; it is handed back one of its earlier
+    frames to decode into, and may ignore it. ``compose(index, frame)`` runs
+    on the calling thread and returns the canvas to encode. ``write(canvas)``
+    runs on a writer thread, in order.
+
+    Frames and canvases are recycled, so callers must not keep more than
+    ``queue_size + 2`` of them alive at once; a compose stage backed by a
+    :class:`~steps.rendering.compose.FrameBufferPool` needs at least that
+    ``depth``. The first exception raised by any stage stops the others and
+    is re-raised here. Returns the number of frames written.
+    """
+
+    queue_size = max(1, int(queue_size))
+    decoded: "queue.Queue[object]" = queue.Queue(maxsize=queue_size)
+    encoded: "queue.Queue[object]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    written = 0
+
+    def _fail(exc: BaseException) -> None:
+        errors.append(exc)
+        stop.set()
+
+    def _reader() -> None:
+        # One buffer being decoded, ``queue_size`` queued, one being composed
+        buffers: List[Optional[np.ndarray]] = [None] * (queue_size + 2)
+        slot = 0
+        try:
+            while not stop.is_set():
+                frame = read(buffers[slot])
+                if frame is None:
+                    break
+                buffers[slot] = frame
+                slot = (slot + 1) % len(buffers)
+                if not _put(decoded, frame, stop):
+                    return
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the caller
+            _fail(exc)
+        finally:
+            _put(decoded, _END, stop)
+
+    def _writer() -> None:
+        nonlocal written
+        try:
+            while True:
+                canvas = _get(encoded, stop)
+                if canvas is _END:
+                    return
+                write(canvas)  # type: ignore[arg-type]
+                written += 1
+        except BaseException as exc:  # noqa: BLE001 - re-raised on the caller
+            _fail(exc)
+
+    reader = threading.Thread(target=_reader, name="render-decode", daemon=True)
+    writer = threading.Thread(target=_writer, name="render-encode", daemon=True)
+    reader.start()
+    writer.start()
+    try:
+        index = 0
+        while not stop.is_set():
+            frame = _get(decoded, stop)
+            if frame is _END:
+                break
+            canvas = compose(index, frame)  # type: ignore[arg-type]
+            index += 1
+            if not _put(encoded, canvas, stop):
+                break
+    except BaseException as exc:
+        _fail(exc)
+    finally:
+        _put(encoded, _END, stop)
+        writer.join()
+        stop.set()
+        reader.join()
+
+    if errors:
+        raise errors[0]
+    return written
+
+
+__all__ = ["run_render_stages"]
@@ -0,0 +1,214 @@
+"""Poster frame and scrub sprite sheet captured while a short is rendered.
+
+The compose stage already holds every finished canvas, so the renderer hands
+them to a :class:`ThumbnailCollector` instead of decoding the short again
+later. Three files are written next to the output ``<stem>.mp4``:
+
+``<stem>.poster.jpg``
+    The full-size frame at the middle of the short.
+``<stem>.sprites.jpg``
+    Downscaled tiles, one every ``interval`` seconds, laid out row-major.
+``<stem>.sprites.json``
+    The index: tile size, grid and the time and position of every tile.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+POSTER_SUFFIX = ".poster.jpg"
+SPRITE_SUFFIX = ".sprites.jpg"
+SPRITE_INDEX_SUFFIX = ".sprites.json"
+SPRITE_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ThumbnailPaths:
+    """Locations of the thumbnails rendered alongside one output."""
+
+    poster: Path
+    sprite: Path
+    index: Path
+
+    def all(self) -> Tuple[Path, Path, Path]:
+        return (self.poster, self.sprite, self.index)
+
+
+def thumbnail_paths(output: str | Path) -> ThumbnailPaths:
+    """Return where the thumbnails of the short at ``output`` live."""
+
+    output = Path(output)
+    stem = output.with_suffix("")
+    return ThumbnailPaths(
+        poster=stem.with_name(stem.name + POSTER_SUFFIX),
+        sprite=stem.with_name(stem.name + SPRITE_SUFFIX),
+        index=stem.with_name(stem.name + SPRITE_INDEX_SUFFIX),
+    )
+
+
+def load_sprite_index(output: str | Path) -> Optional[dict]:
+    """Return the sprite index for ``output`` if its thumbnails are current.
+
+    Thumbnails older than the short (e.g. left behind by a render that did
+    not capture them) are ignored.
+    """
+
+    output = Path(output)
+    paths = thumbnail_paths(output)
+    try:
+        output_mtime = output.stat().st_mtime
+        if any(path.stat().st_mtime < output_mtime for path in paths.all()):
+            return None
+        index = json.loads(paths.index.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != SPRITE_INDEX_VERSION:
+        return None
+    return index
+
+
+def remove_thumbnails(output: str | Path) -> None:
+    """Delete any thumbnails rendered for ``output``."""
+
+    for path in thumbnail_paths(output).all():
+        path.unlink(missing_ok=True)
+
+
+def move_thumbnails(source: str | Path, target: str | Path) -> None:
+    """Move the thumbnails of ``source`` so they belong to ``target``.
+
+    Stale thumbnails of ``target`` are removed when ``source`` has none.
+    """
+
+    src_paths = thumbnail_paths(source)
+    dst_paths = thumbnail_paths(target)
+    for src, dst in zip(src_paths.all(), dst_paths.all()):
+        if src.exists():
+            src.replace(dst)
+        else:
+            dst.unlink(missing_ok=True)
+    if dst_paths.index.exists():
+        # The index names its images; keep it pointing at the moved files
+        index = json.loads(dst_paths.index.read_text(encoding="utf-8"))
+        index["poster"] = dst_paths.poster.name
+        index["sprite"] = dst_paths.sprite.name
+        dst_paths.index.write_text(json.dumps(index, indent=2), encoding="utf-8")
+
+
+class ThumbnailCollector:
+    """Collect a poster frame and sprite tiles from composed canvases.
+
+    ``add`` is called from the compose stage for every frame, before the
+    canvas is handed to the encoder; it only reads the canvas and copies what
+    it keeps, since canvases are recycled. ``duration`` is the expected length
+    of the short and places the poster at its middle; when the render ends
+    before then, the last frame captured for a tile is used instead.
+    """
+
+    def __init__(
+        self,
+        frame_size: Tuple[int, int],
+        fps: float,
+        *,
+        duration: float | None = None,
+        interval: float = 1.0,
+        tile_width: int = 160,
+        columns: int = 10,
+        jpeg_quality: int = 85,
+    ) -> None:
+        width, height = int(frame_size[0]), int(frame_size[1])
+        self.fps = float(fps)
+        self.interval = max(float(interval), 1.0 / self.fps)
+        self.tile_width = max(2, min(int(tile_width), width))
+        self.tile_height = max(2, int(round(height * self.tile_width / width)))
+        self.columns = max(1, int(columns))
+        self.jpeg_quality = int(jpeg_quality)
+        self.poster_time = duration / 2.0 if duration else None
+        self.frames = 0
+        self._tiles: List[Tuple[float, np.ndarray]] = []
+        self._next_tile = 0.0
+        self._poster: Optional[np.ndarray] = None
+        self._poster_at = 0.0
+        self._fallback: Optional[np.ndarray] = None
+        self._fallback_at = 0.0
+
+    def add(self, frame_idx: int, canvas: np.ndarray) -> None:
+        t = frame_idx / self.fps
+        self.frames = max(self.frames, frame_idx + 1)
+        if (
+            self._poster is None
+            and self.poster_time is not None
+            and t + 1.0 / self.fps > self.poster_time
+        ):
+            self._poster = canvas.copy()
+            self._poster_at = t
+        if t + 1e-6 < self._next_tile:
+            return
+        self._next_tile = len(self._tiles) * self.interval + self.interval
+        tile = cv2.resize(canvas, (self.tile_width, self.tile_height), interpolation=cv2.INTER_AREA)
+        self._tiles.append((t, tile))
+        if self._poster is None:
+            if self._fallback is None:
+                self._fallback = canvas.copy()
+            else:
+                np.copyto(self._fallback, canvas)
+            self._fallback_at = t
+
+    def write(self, output: str | Path) -> Optional[ThumbnailPaths]:
+        """Write the poster, sprite sheet and index next to ``output``."""
+
+        poster, poster_at = self._poster, self._poster_at
+        if poster is None:
+            poster, poster_at = self._fallback, self._fallback_at
+        if poster is None or not self._tiles:
+            remove_thumbnails(output)
+            return None
+
+        paths = thumbnail_paths(output)
+        columns = min(self.columns, len(self._tiles))
+        rows = math.ceil(len(self._tiles) / columns)
+        sheet = np.zeros((rows * self.tile_height, columns * self.tile_width, 3), dtype=np.uint8)
+        tiles = []
+        for idx, (t, tile) in enumerate(self._tiles):
+            x = (idx % columns) * self.tile_width
+            y = (idx // columns) * self.tile_height
+            sheet[y:y + self.tile_height, x:x + self.tile_width] = tile
+            tiles.append({"time": round(t, 3), "x": x, "y": y})
+
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        if not cv2.imwrite(str(paths.poster), poster, params) or not cv2.imwrite(str(paths.sprite), sheet, params):
+            remove_thumbnails(output)
+            return None
+        index = {
+            "version": SPRITE_INDEX_VERSION,
+            "duration": round(self.frames / self.fps, 3),
+            "poster": paths.poster.name,
+            "poster_time": round(poster_at, 3),
+            "sprite": paths.sprite.name,
+            "interval": self.interval,
+            "tile_width": self.tile_width,
+            "tile_height": self.tile_height,
+            "columns": columns,
+            "rows": rows,
+            "tiles": tiles,
+        }
+        # Written last so a complete index implies complete images
+        paths.index.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        return paths
+
+
+__all__ = [
+    "ThumbnailCollector",
+    "ThumbnailPaths",
+    "load_sprite_index",
+    "move_thumbnails",
+    "remove_thumbnails",
+    "thumbnail_paths",
+]
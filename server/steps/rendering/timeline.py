@@ -0,0 +1,230 @@
+"""Array-backed caption timeline with cursor lookups for the renderer.
+
+Entry and word timings are flattened into sorted NumPy arrays once per
+render. Because render time only moves forward, lookups keep a cursor and
+usually answer from it directly; otherwise they binary search from the
+cursor onwards, so per-frame cost no longer grows with the caption count.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class CaptionWord:
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class CaptionEntry:
+    start: float
+    end: float
+    text: str
+    words: List[CaptionWord]
+
+
+def ensure_entry_words(entry: CaptionEntry) -> List[CaptionWord]:
+    """Return ``entry.words``, spreading its tokens evenly when it has none."""
+
+    if entry.words:
+        return entry.words
+    tokens = entry.text.replace("\n", " ").split()
+    if not tokens:
+        entry.words = []
+        return entry.words
+    duration = max(entry.end - entry.start, 0.01)
+    step = max(duration / max(len(tokens), 1), 0.01)
+    cur = entry.start
+    fallback: List[CaptionWord] = []
+    for idx, token in enumerate(tokens):
+        token = token.strip()
+        if not token:
+            continue
+        nxt = cur + step
+        if idx == len(tokens) - 1:
+            nxt = max(nxt, entry.end)
+        fallback.append(CaptionWord(start=cur, end=nxt, text=token))
+        cur = nxt
+    if fallback and fallback[-1].end < entry.end:
+        fallback[-1].end = entry.end
+    entry.words = fallback
+    return entry.words
+
+
+def assign_words_to_entries(entries: Sequence[CaptionEntry], words: Sequence[CaptionWord]) -> None:
+    """Give each entry a copy of the ``words`` (sorted by start) it overlaps."""
+
+    if not words:
+        return
+    starts = [w.start for w in words]
+    # Running max of word ends: the first word that can still overlap a time
+    reach = np.maximum.accumulate(np.fromiter((w.end for w in words), dtype=np.float64, count=len(words)))
+    for entry in entries:
+        lo = int(np.searchsorted(reach, entry.start, side="right"))
+        hi = bisect_left(starts, entry.end)
+        entry.words = [
+            CaptionWord(start=w.start, end=w.end, text=w.text)
+            for w in words[lo:hi]
+            if w.end > entry.start
+        ]
+
+
+def split_long_captions(
+    entries: Sequence[CaptionEntry],
+    max_lines: int,
+    wrap: Callable[[str], List[str]],
+) -> List[CaptionEntry]:
+    """Split entries that ``wrap`` into more than ``max_lines`` lines.
+
+    Each group of ``max_lines`` wrapped lines becomes its own entry, timed by
+    the words it contains (or by its share of the entry when it has none).
+    """
+
+    if max_lines <= 0:
+        return list(entries)
+    out: List[CaptionEntry] = []
+    for entry in entries:
+        lines = wrap(entry.text)
+        if len(lines) <= max_lines:
+            out.append(entry)
+            continue
+        seq_words = list(ensure_entry_words(entry))
+        word_idx = 0
+        total_lines = len(lines)
+        for idx in range(0, total_lines, max_lines):
+            seg_lines = lines[idx:idx + max_lines]
+            if not seg_lines:
+                continue
+            seg_word_count = sum(len(seg_line.split()) for seg_line in seg_lines)
+            seg_words = seq_words[word_idx:word_idx + seg_word_count] if seg_word_count else []
+            word_idx += seg_word_count
+            seg_text = " ".join(seg_lines).strip()
+            if not seg_text:
+                continue
+            if seg_words:
+                seg_start = seg_words[0].start
+                seg_end = seg_words[-1].end
+            else:
+                portion_start = idx / max(total_lines, 1)
+                portion_end = min(total_lines, idx + len(seg_lines)) / max(total_lines, 1)
+                span = entry.end - entry.start
+                seg_start = entry.start + span * portion_start
+                seg_end = entry.start + span * portion_end
+            out.append(
+                CaptionEntry(
+                    start=seg_start,
+                    end=seg_end,
+                    text=seg_text,
+                    words=[CaptionWord(start=w.start, end=w.end, text=w.text) for w in seg_words],
+                )
+            )
+    out.sort(key=lambda e: e.start)
+    return out
+
+
+def _first_reaching(reach: np.ndarray, lo: int, hi: int, t: float) -> int:
+    """First index in ``[lo, hi)`` whose running max end is ``>= t`` (``hi`` if none)."""
+
+    if lo >= hi or reach[lo] >= t:
+        return lo
+    return lo + int(np.searchsorted(reach[lo:hi], t, side="left"))
+
+
+class CaptionTimeline:
+    """Sorted entry/word timing arrays with forward-moving cursor lookups.
+
+    Matching follows the historical per-frame scan: the active entry is the
+    first one whose ``[start - tolerance, end + tolerance]`` contains ``t``,
+    and the highlighted word is the first such word of that entry, else the
+    first word before it starts or the last word otherwise.
+    """
+
+    def __init__(self, entries: Sequence[CaptionEntry], *, tolerance: float = 0.0) -> None:
+        self.entries = list(entries)
+        self.tolerance = float(tolerance)
+        n = len(self.entries)
+        self.entry_starts = np.empty(n, dtype=np.float64)
+        self.entry_ends = np.empty(n, dtype=np.float64)
+        self.word_offsets = np.zeros(n + 1, dtype=np.int64)
+        self.tokens: List[List[str]] = []
+
+        word_starts: List[float] = []
+        word_ends: List[float] = []
+        word_reach: List[float] = []
+        for idx, entry in enumerate(self.entries):
+            self.entry_starts[idx] = entry.start
+            self.entry_ends[idx] = entry.end
+            display = [w for w in ensure_entry_words(entry) if w.text]
+            reach = float("-inf")
+            for word in display:
+                word_starts.append(word.start)
+                word_ends.append(word.end)
+                reach = max(reach, word.end)
+                word_reach.append(reach)
+            self.tokens.append([w.text for w in display])
+            self.word_offsets[idx + 1] = len(word_starts)
+
+        self.word_starts = np.asarray(word_starts, dtype=np.float64)
+        self.word_ends = np.asarray(word_ends, dtype=np.float64)
+        # Running max of ends (per entry for words) so "first interval still
+        # open at t" is a binary search even when intervals overlap.
+        self._entry_reach = np.maximum.accumulate(self.entry_ends) if n else self.entry_ends
+        self._word_reach = np.asarray(word_reach, dtype=np.float64)
+        self._entry_cursor = 0
+        self._last_t = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def entry_index(self, t: float) -> Optional[int]:
+        """Index of the caption entry shown at ``t`` or ``None``."""
+
+        if not self.entries:
+            return None
+        if t < self._last_t:
+            self._entry_cursor = 0
+        self._last_t = t
+        tol = self.tolerance
+        idx = _first_reaching(self._entry_reach, self._entry_cursor, len(self.entries), t - tol)
+        self._entry_cursor = idx
+        if idx >= len(self.entries) or self.entry_starts[idx] - tol > t:
+            return None
+        return idx
+
+    def highlight_index(self, entry_idx: int, t: float) -> Optional[int]:
+        """Index (within the entry's tokens) of the word highlighted at ``t``."""
+
+        lo = int(self.word_offsets[entry_idx])
+        hi = int(self.word_offsets[entry_idx + 1])
+        if lo == hi:
+            return None
+        tol = self.tolerance
+        idx = _first_reaching(self._word_reach, lo, hi, t - tol)
+        if idx < hi and self.word_starts[idx] - tol <= t:
+            return idx - lo
+        return 0 if t < self.word_starts[lo] else hi - lo - 1
+
+    def lookup(self, t: float) -> Optional[Tuple[int, List[str], Optional[int]]]:
+        """Return ``(entry index, tokens, highlight index)`` at ``t``."""
+
+        idx = self.entry_index(t)
+        if idx is None:
+            return None
+        return idx, self.tokens[idx], self.highlight_index(idx, t)
+
+
+__all__ = [
+    "CaptionEntry",
+    "CaptionTimeline",
+    "CaptionWord",
+    "assign_words_to_entries",
+    "ensure_entry_words",
+    "split_long_captions",
+]
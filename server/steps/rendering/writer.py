@@ -0,0 +1,219 @@
+"""Frame sinks used by the vertical renderer."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def encode_output_args(
+    fps: float,
+    *,
+    audio: bool,
+    preset: str | None = None,
+    crf: int | None = None,
+) -> List[str]:
+    """H.264/AAC output options shared by every ffmpeg render path.
+
+    ``preset``/``crf`` override the libx264 defaults (e.g. ``"ultrafast"``
+    for review proxies).
+    """
+
+    gop = max(1, int(round(fps)) * 2)
+    args = [
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        "-profile:v", "high", "-level", "4.1",
+        "-r", f"{fps}",
+        "-vsync", "cfr",
+        "-g", str(gop),
+        "-movflags", "+faststart",
+    ]
+    if preset:
+        args += ["-preset", preset]
+    if crf is not None:
+        args += ["-crf", str(int(crf))]
+    if audio:
+        args += ["-c:a", "aac", "-b:a", "192k", "-ar", "44100", "-shortest"]
+    return args
+
+
+class FFmpegPipeWriter:
+    """Stream raw BGR frames into a single ``ffmpeg`` encode + audio mux.
+
+    The object mirrors the subset of :class:`cv2.VideoWriter` used by the
+    renderer (``isOpened``/``write``/``release``) so it can be swapped in
+    without touching the compose loop. Frames are written to ``ffmpeg`` over
+    stdin and encoded once to H.264; when ``audio_source`` is given its first
+    audio track is transcoded to AAC and muxed in the same process.
+    ``audio_start``/``audio_duration`` select a range of ``audio_source`` so a
+    short can take its audio straight from the full project video.
+    ``preset``/``crf`` are passed through to libx264.
+    """
+
+    preset: str | None = None
+    crf: int | None = None
+
+    def __init__(
+        self,
+        output_path: str | Path,
+        fps: float,
+        size: Tuple[int, int],
+        *,
+        audio_source: str | Path | None = None,
+        audio_start: float | None = None,
+        audio_duration: float | None = None,
+        preset: str | None = None,
+        crf: int | None = None,
+        ffmpeg_bin: str = "ffmpeg",
+    ) -> None:
+        self.output_path = Path(output_path)
+        self.fps = float(fps)
+        self.size = (int(size[0]), int(size[1]))
+        self.audio_source = Path(audio_source) if audio_source is not None else None
+        self.audio_start = audio_start
+        self.audio_duration = audio_duration
+        self.preset = preset
+        self.crf = crf
+        self.ffmpeg_bin = ffmpeg_bin
+        self._stderr = tempfile.TemporaryFile()
+        self._proc: Optional[subprocess.Popen] = None
+        try:
+            self._proc = subprocess.Popen(
+                self.build_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except OSError:
+            self._proc = None
+            self._stderr.close()
+
+    def build_command(self) -> List[str]:
+        """Return the ``ffmpeg`` argument list for this writer."""
+
+        w, h = self.size
+        cmd = [
+            self.ffmpeg_bin, "-y",
+            "-hide_banner", "-loglevel", "error",
+            # Raw frames from the compose loop
+            "-f", "rawvideo",
+            "-pix_fmt", "bgr24",
+            "-s", f"{w}x{h}",
+            "-r", f"{self.fps}",
+            "-i", "pipe:0",
+        ]
+        if self.audio_source is not None:
+            if self.audio_start:
+                cmd += ["-ss", f"{self.audio_start:.3f}"]
+            if self.audio_duration:
+                cmd += ["-t", f"{self.audio_duration:.3f}"]
+            cmd += ["-i", str(self.audio_source), "-map", "0:v:0", "-map", "1:a:0?"]
+        else:
+            cmd += ["-map", "0:v:0"]
+        cmd += encode_output_args(
+            self.fps,
+            audio=self.audio_source is not None,
+            preset=self.preset,
+            crf=self.crf,
+        )
+        cmd.append(str(self.output_path))
+        return cmd
+
+    def isOpened(self) -> bool:  # noqa: N802 - mirrors cv2.VideoWriter
+        return self._proc is not None and self._proc.poll() is None
+
+    def write(self, frame: np.ndarray) -> None:
+        if self._proc is None or self._proc.stdin is None:
+            raise RuntimeError("ffmpeg writer is not open")
+        if frame.dtype != np.uint8 or frame.shape[:2] != (self.size[1], self.size[0]):
+            raise ValueError(
+                f"Expected {self.size[0]}x{self.size[1]} uint8 frame, got {frame.shape} {frame.dtype}"
+            )
+        buf = frame if frame.flags["C_CONTIGUOUS"] else np.ascontiguousarray(frame)
+        try:
+            self._proc.stdin.write(memoryview(buf).cast("B"))
+        except (BrokenPipeError, OSError) as exc:
+            self._proc.wait()
+            raise RuntimeError(f"ffmpeg encoder exited early: {self._stderr_tail()}") from exc
+
+    def release(self) -> None:
+        """Flush stdin and wait for ``ffmpeg`` to finalise the container."""
+
+        proc = self._proc
+        if proc is None:
+            return
+        self._proc = None
+        try:
+            if proc.stdin is not None:
+                try:
+                    proc.stdin.close()
+                except (BrokenPipeError, OSError):
+                    pass
+            returncode = proc.wait()
+            if returncode != 0:
+                raise RuntimeError(f"ffmpeg encoder failed ({returncode}): {self._stderr_tail()}")
+        finally:
+            self._stderr.close()
+
+    def abort(self) -> None:
+        """Terminate the encoder without finalising output (used on errors)."""
+
+        proc = self._proc
+        if proc is None:
+            return
+        self._proc = None
+        try:
+            proc.kill()
+            proc.wait()
+        finally:
+            self._stderr.close()
+
+    def _stderr_tail(self, limit: int = 800) -> str:
+        try:
+            self._stderr.seek(0)
+            data = self._stderr.read()
+        except (OSError, ValueError):
+            return ""
+        return data.decode(errors="ignore")[-limit:]
+
+
+def open_ffmpeg_writer(
+    output_path: str | Path,
+    fps: float,
+    size: Tuple[int, int],
+    *,
+    audio_source: str | Path | None = None,
+    audio_start: float | None = None,
+    audio_duration: float | None = None,
+    preset: str | None = None,
+    crf: int | None = None,
+) -> FFmpegPipeWriter | None:
+    """Start an :class:`FFmpegPipeWriter` or return ``None`` if ffmpeg is unavailable."""
+
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if ffmpeg_bin is None:
+        return None
+    writer = FFmpegPipeWriter(
+        output_path,
+        fps,
+        size,
+        audio_source=audio_source,
+        audio_start=audio_start,
+        audio_duration=audio_duration,
+        preset=preset,
+        crf=crf,
+        ffmpeg_bin=ffmpeg_bin,
+    )
+    if not writer.isOpened():
+        writer.abort()
+        return None
+    return writer
+
+
+__all__ = ["FFmpegPipeWriter", "encode_output_args", "open_ffmpeg_writer"]
@@ -73,6 +73,7 @@ def refine_segments_with_llm(
             prompt="ping",
             options=default_llm_options(16),
             timeout=min(timeout, config.LLM_PER_CHUNK_TIMEOUT),
+            cache=False,
         )
     except Exception as e:
         print(f"[segments] LLM ping failed: {e}; continuing without fail-fast.")
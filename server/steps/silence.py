@@ -2,7 +2,9 @@ import json
 import re
 import subprocess
 from pathlib import Path
-from typing import Callable, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
 
 SILENCE_START_RE = re.compile(r"silence_start: (?P<time>\d+(?:\.\d+)?)")
 SILENCE_END_RE = re.compile(r"silence_end: (?P<time>\d+(?:\.\d+)?)")
@@ -10,7 +12,185 @@ SILENCE_END_RE = re.compile(r"silence_end: (?P<time>\d+(?:\.\d+)?)")
 from config import (
     SILENCE_DETECTION_NOISE,
     SILENCE_DETECTION_MIN_DURATION,
+    SILENCE_DETECTION_WINDOW,
 )
+from helpers.pcm import SAMPLE_RATE, ffmpeg_input_args, is_pcm_path, load_pcm, pcm_duration
+
+from .timeline_index import TimelineIndex
+
+Intervals = List[Tuple[float, float]] | TimelineIndex
+
+ProgressCallback = Callable[[float, float], None]
+# (noise, min_duration) as accepted by ``detect_silences``
+SilenceThreshold = Tuple[str | float, float]
+
+# Samples analysed per step; a multiple of any sensible RMS window
+_CHUNK_SAMPLES = 1 << 20
+
+
+def parse_noise(noise: str | float) -> float:
+    """Amplitude ratio for an ffmpeg-style noise level (``"-30dB"`` or ``0.001``)."""
+
+    if isinstance(noise, str):
+        text = noise.strip()
+        if text.lower().endswith("db"):
+            return 10 ** (float(text[:-2]) / 20)
+        return float(text)
+    return float(noise)
+
+
+class _RunTracker:
+    """Collect runs of silent units that are at least ``min_units`` long."""
+
+    def __init__(self, min_units: int) -> None:
+        self.min_units = max(1, min_units)
+        self.runs: List[Tuple[int, int]] = []
+        self._open: int | None = None
+
+    def feed(self, silent: np.ndarray, offset: int) -> None:
+        if not len(silent):
+            return
+        edges = np.diff(silent.astype(np.int8), prepend=np.int8(self._open is not None))
+        starts = np.flatnonzero(edges == 1) + offset
+        ends = np.flatnonzero(edges == -1) + offset
+        if self._open is not None:
+            starts = np.concatenate(([self._open], starts))
+        # A run still open at the end of the chunk carries into the next one
+        self._open = int(starts[-1]) if len(starts) > len(ends) else None
+        starts = starts[: len(ends)]
+        keep = ends - starts >= self.min_units
+        self.runs.extend(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+    def finish(self, total: int) -> None:
+        if self._open is not None and total - self._open >= self.min_units:
+            self.runs.append((self._open, total))
+        self._open = None
+
+
+def _iter_samples(audio_path: str | Path) -> Iterator[np.ndarray]:
+    """Yield 16 kHz mono int16 chunks of ``audio_path``."""
+
+    if is_pcm_path(audio_path):
+        samples = load_pcm(audio_path)
+        for lo in range(0, len(samples), _CHUNK_SAMPLES):
+            yield np.asarray(samples[lo : lo + _CHUNK_SAMPLES])
+        return
+
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "error",
+        *ffmpeg_input_args(audio_path),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    assert proc.stdout is not None
+    try:
+        pending = b""
+        while True:
+            data = proc.stdout.read(_CHUNK_SAMPLES * 2)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - len(data) % 2
+            pending = data[usable:]
+            yield np.frombuffer(data[:usable], dtype="<i2")
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def detect_silences_multi(
+    audio_path: str | Path,
+    thresholds: Sequence[SilenceThreshold],
+    *,
+    window: float = SILENCE_DETECTION_WINDOW,
+    progress_callback: ProgressCallback | None = None,
+    duration_hint: float | None = None,
+) -> Dict[SilenceThreshold, List[Tuple[float, float]]]:
+    """Detect silences for several ``(noise, min_duration)`` pairs in one pass.
+
+    With ``window == 0`` a sample is silent when its amplitude is below
+    ``noise``, exactly as ffmpeg's ``silencedetect`` decides it, and runs of
+    at least ``min_duration`` seconds are reported. With ``window > 0`` the
+    RMS level of each ``window``-second block is compared instead, which
+    ignores the zero crossings inside speech. Pairs sharing a noise level
+    share the work; each result is the list :func:`detect_silences` returns.
+    """
+
+    unit = max(1, int(round(window * SAMPLE_RATE))) if window > 0 else 1
+    levels = sorted({parse_noise(noise) for noise, _ in thresholds})
+    trackers: Dict[float, _RunTracker] = {}
+    for level in levels:
+        shortest = min(
+            int(round(float(d) * SAMPLE_RATE))
+            for noise, d in thresholds
+            if parse_noise(noise) == level
+        )
+        trackers[level] = _RunTracker(shortest // unit)
+
+    if duration_hint is None and is_pcm_path(audio_path):
+        duration_hint = pcm_duration(audio_path)
+
+    position = 0  # in units
+    pending = np.zeros(0, dtype=np.int16)
+    for chunk in _iter_samples(audio_path):
+        chunk = np.concatenate((pending, chunk)) if len(pending) else chunk
+        usable = len(chunk) - len(chunk) % unit
+        pending = chunk[usable:]
+        chunk = chunk[:usable]
+        if not len(chunk):
+            continue
+        if unit == 1:
+            values = chunk.astype(np.int32)
+        else:
+            blocks = chunk.astype(np.float64).reshape(-1, unit)
+            values = np.sqrt(np.mean(blocks * blocks, axis=1)) / 32768.0
+        for level, tracker in trackers.items():
+            if unit == 1:
+                # Same test as silencedetect on s16 input: -noise < x < noise
+                limit = int(level * 32767)
+                silent = (values < limit) & (values > -limit)
+            else:
+                silent = values < level
+            tracker.feed(silent, position)
+        position += len(values)
+        if progress_callback and duration_hint:
+            seconds = position * unit / SAMPLE_RATE
+            progress_callback(min(0.99, seconds / duration_hint), seconds)
+    total_samples = position * unit
+    # A trailing partial window counts as one more unit
+    if len(pending):
+        rms = np.sqrt(np.mean(pending.astype(np.float64) ** 2)) / 32768.0
+        for level, tracker in trackers.items():
+            tracker.feed(np.array([rms < level]), position)
+        position += 1
+        total_samples += len(pending)
+    for tracker in trackers.values():
+        tracker.finish(position)
+
+    results: Dict[SilenceThreshold, List[Tuple[float, float]]] = {}
+    for noise, min_duration in thresholds:
+        tracker = trackers[parse_noise(noise)]
+        min_units = int(round(float(min_duration) * SAMPLE_RATE)) / unit
+        results[(noise, min_duration)] = [
+            (start * unit / SAMPLE_RATE, min(end * unit, total_samples) / SAMPLE_RATE)
+            for start, end in tracker.runs
+            if end - start >= min_units
+        ]
+    if progress_callback:
+        progress_callback(1.0, total_samples / SAMPLE_RATE)
+    return results
 
 
 def detect_silences(
@@ -18,14 +198,36 @@ def detect_silences(
     *,
     noise: str = SILENCE_DETECTION_NOISE,
     min_duration: float = SILENCE_DETECTION_MIN_DURATION,
-    progress_callback: Callable[[float, float], None] | None = None,
+    progress_callback: ProgressCallback | None = None,
     duration_hint: float | None = None,
+    window: float = SILENCE_DETECTION_WINDOW,
 ) -> List[Tuple[float, float]]:
-    """Return a list of (start, end) silence segments for ``audio_path``."""
+    """Return a list of (start, end) silence segments for ``audio_path``.
+
+    ``audio_path`` is read from the PCM cache when it is one and decoded to
+    16 kHz mono otherwise; see :func:`detect_silences_multi`.
+    """
+    return detect_silences_multi(
+        audio_path,
+        [(noise, min_duration)],
+        window=window,
+        progress_callback=progress_callback,
+        duration_hint=duration_hint,
+    )[(noise, min_duration)]
+
+
+def detect_silences_ffmpeg(
+    audio_path: str | Path,
+    *,
+    noise: str = SILENCE_DETECTION_NOISE,
+    min_duration: float = SILENCE_DETECTION_MIN_DURATION,
+    progress_callback: ProgressCallback | None = None,
+    duration_hint: float | None = None,
+) -> List[Tuple[float, float]]:
+    """Reference implementation using ffmpeg's ``silencedetect`` filter."""
     cmd = [
         "ffmpeg",
-        "-i",
-        str(audio_path),
+        *ffmpeg_input_args(audio_path),
         "-af",
         f"silencedetect=noise={noise}:d={min_duration}",
         "-f",
@@ -74,7 +276,7 @@ def load_silences_json(path: str | Path) -> List[Tuple[float, float]]:
     return [(float(item["start"]), float(item["end"])) for item in data]
 
 
-def snap_start_to_silence(start: float | str, silences: List[Tuple[float, float]]) -> float:
+def snap_start_to_silence(start: float | str, silences: Intervals) -> float:
     """Snap ``start`` to the beginning of the preceding silence.
 
     ``start`` may be provided as either a ``float`` or a string representing a
@@ -84,7 +286,8 @@ def snap_start_to_silence(start: float | str, silences: List[Tuple[float, float]
     trimming quiet padding.  We instead want the clip to include that padding so
     we snap to the **start** of that silence.  If ``start`` already lies within
     a silence, we still snap to the start of that region.  If no preceding
-    silence exists, ``start`` is returned unchanged.
+    silence exists, ``start`` is returned unchanged.  ``silences`` may be a
+    :class:`TimelineIndex`, which answers in O(log n).
     """
 
     try:
@@ -92,6 +295,10 @@ def snap_start_to_silence(start: float | str, silences: List[Tuple[float, float]
     except (TypeError, ValueError) as exc:
         raise TypeError(f"start must be float-like, got {start!r}") from exc
 
+    if isinstance(silences, TimelineIndex):
+        idx = silences.last_starting_at_or_before(start_val)
+        return start_val if idx is None else silences.items[idx][0]
+
     for s_start, _ in reversed(silences):
         # When the start falls within a silence or after one, snap to the
         # beginning of that silence to include the quiet lead-in.
@@ -100,7 +307,7 @@ def snap_start_to_silence(start: float | str, silences: List[Tuple[float, float]
     return start_val
 
 
-def snap_end_to_silence(end: float | str, silences: List[Tuple[float, float]]) -> float:
+def snap_end_to_silence(end: float | str, silences: Intervals) -> float:
     """Snap ``end`` to the conclusion of the following silence.
 
     ``end`` may be provided as either a ``float`` or a string representing a
@@ -109,7 +316,8 @@ def snap_end_to_silence(end: float | str, silences: List[Tuple[float, float]]) -
     silence which cut off any trailing quiet section.  To extend clips through
     the silence we now snap to the silence's end.  If ``end`` already lies
     inside a silence, the end of that same silence is used.  When no subsequent
-    silence exists, the original ``end`` is returned.
+    silence exists, the original ``end`` is returned.  ``silences`` may be a
+    :class:`TimelineIndex`, which answers in O(log n).
     """
 
     try:
@@ -117,6 +325,10 @@ def snap_end_to_silence(end: float | str, silences: List[Tuple[float, float]]) -
     except (TypeError, ValueError) as exc:
         raise TypeError(f"end must be float-like, got {end!r}") from exc
 
+    if isinstance(silences, TimelineIndex):
+        idx = silences.first_ending_at_or_after(end_val)
+        return end_val if idx is None else silences.items[idx][1]
+
     for _, s_end in silences:
         # If the clip ends before or inside this silence, extend to its end.
         if s_end >= end_val:
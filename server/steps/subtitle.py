@@ -4,9 +4,27 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+
+from config import (
+    CAPTION_FONT_SCALE,
+    CAPTION_HIGHLIGHT_BGR,
+    CAPTION_MAX_LINES,
+    CAPTION_OUTLINE_BGR,
+)
+from layouts import PixelRect
 
 from .candidates import parse_transcript
+from .rendering import (
+    CaptionEntry,
+    CaptionRasterizer,
+    CaptionStyle,
+    CaptionTimeline,
+    split_long_captions,
+    wrap_caption_text,
+)
 
 # -----------------------------
 # Subtitle / SRT utilities
@@ -109,3 +127,208 @@ def build_srt_for_range(
 
     return out
 
+
+# -----------------------------
+# ASS (karaoke) utilities
+# -----------------------------
+
+# DejaVu Sans metrics at ASS font size 1 (libass sizes fonts by ascent + descent)
+_ASS_CAP_HEIGHT = 0.627
+_ASS_BASELINE = 0.797
+_ASS_SPACE_WIDTH = 0.273
+# Hershey simplex capitals are 21 units tall at font scale 1
+_HERSHEY_CAP_HEIGHT = 21.0
+_ASS_ANCHOR_TOP = {"left": 7, "center": 8, "right": 9}
+
+
+def _fmt_ass_ts(seconds: float) -> str:
+    if seconds < 0:
+        seconds = 0.0
+    cs = int(round(seconds * 100))
+    h, rem = divmod(cs, 360000)
+    m, rem = divmod(rem, 6000)
+    s, cs = divmod(rem, 100)
+    return f"{h:d}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def _ass_color(bgr: Tuple[int, int, int]) -> str:
+    b, g, r = (max(0, min(255, int(c))) for c in bgr)
+    return f"{b:02X}{g:02X}{r:02X}"
+
+
+def _ass_text(text: str) -> str:
+    # Braces open override blocks and backslashes start tags in ASS
+    return text.replace("\\", "/").replace("{", "(").replace("}", ")").strip()
+
+
+def _ass_font_size(font_scale: float) -> int:
+    # Match the cap height of OpenCV's Hershey font at ``font_scale``
+    return max(1, round(_HERSHEY_CAP_HEIGHT * font_scale / _ASS_CAP_HEIGHT))
+
+
+def _highlight_changes(
+    timeline: CaptionTimeline,
+    idx: int,
+    start: float,
+    end: float,
+) -> List[Tuple[float, Optional[int]]]:
+    """Return ``(time, highlighted word)`` for each highlight change in ``[start, end)``."""
+
+    tol = timeline.tolerance
+    cuts = {start, end}
+    for word in timeline.entries[idx].words:
+        for t in (word.start - tol, word.end + tol):
+            if start < t < end:
+                cuts.add(t)
+    bounds = sorted(cuts)
+    changes: List[Tuple[float, Optional[int]]] = []
+    for lo, hi in zip(bounds, bounds[1:]):
+        highlight = timeline.highlight_index(idx, (lo + hi) / 2)
+        if not changes or changes[-1][1] != highlight:
+            changes.append((lo, highlight))
+    return changes
+
+
+def write_ass_subtitles(
+    entries: Sequence[CaptionEntry],
+    ass_path: str | Path,
+    *,
+    width: int,
+    height: int,
+    caption_rect: PixelRect,
+    wrap_pixels: int | None = None,
+    font_scale: float = CAPTION_FONT_SCALE,
+    thickness: int = 2,
+    outline: int = 4,
+    fill_bgr: Tuple[int, int, int] = (255, 255, 255),
+    highlight_bgr: Tuple[int, int, int] = CAPTION_HIGHLIGHT_BGR,
+    outline_bgr: Tuple[int, int, int] = CAPTION_OUTLINE_BGR,
+    max_lines: int = CAPTION_MAX_LINES,
+    bottom_safe_ratio: float = 0.14,
+    align: str = "center",
+    tolerance: float = 0.0,
+    font_name: str = "DejaVu Sans",
+) -> Path:
+    """Write word-highlighted captions as an ASS script for libass burn-in.
+
+    Mirrors the OpenCV caption renderer: entries wrapping to more than
+    ``max_lines`` lines are split, each entry is one line scaled and placed
+    the way :class:`~steps.rendering.CaptionRasterizer` lays it out, and only
+    one entry shows at a time. Each word carries karaoke-style timed ``\\t``
+    color transforms, so libass switches the highlighted word itself instead
+    of needing one event per highlight state.
+
+    ``PlayResX``/``PlayResY`` match the output so positions are in output
+    pixels. Entries without words get evenly spread word timings.
+    """
+
+    wrap_pixels = caption_rect.width if wrap_pixels is None else wrap_pixels
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    entries = split_long_captions(
+        entries,
+        max_lines,
+        lambda text: wrap_caption_text(
+            text,
+            wrap_pixels,
+            font=font,
+            font_scale=font_scale,
+            thickness=thickness + outline,
+        ),
+    )
+    timeline = CaptionTimeline(entries, tolerance=tolerance)
+    rasterizer = CaptionRasterizer(
+        CaptionStyle(
+            font_scale=font_scale,
+            thickness=thickness,
+            outline=outline,
+            base_color=fill_bgr,
+            highlight_color=highlight_bgr,
+            outline_color=outline_bgr,
+            font=font,
+        ),
+        frame_size=(width, height),
+        caption_rect=caption_rect,
+        wrap_pixels=wrap_pixels,
+        bottom_safe_ratio=bottom_safe_ratio,
+        align=align,
+    )
+    base = _ass_color(fill_bgr)
+    highlight = _ass_color(highlight_bgr)
+    anchor = _ASS_ANCHOR_TOP.get(align, 8)
+    style = ",".join(
+        [
+            "Style: Caption",
+            font_name,
+            str(_ass_font_size(font_scale)),
+            f"&H00{base}",
+            f"&H00{highlight}",
+            f"&H00{_ass_color(outline_bgr)}",
+            "&H00000000",
+            "0", "0", "0", "0",
+            "100", "100", "0", "0",
+            "1",
+            # OpenCV strokes the outline at ``thickness + outline``, offset by ``outline``
+            f"{outline * 1.5:g}",
+            "0",
+            str(anchor),
+            "0", "0", "0",
+            "1",
+        ]
+    )
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {int(width)}",
+        f"PlayResY: {int(height)}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+        "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        style,
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+
+    # The renderer shows the first matching entry, so later overlapping
+    # entries only appear once every earlier one has ended.
+    shown_until = 0.0
+    for idx, tokens in enumerate(timeline.tokens):
+        entry = timeline.entries[idx]
+        start = max(entry.start - tolerance, shown_until)
+        end = entry.end + tolerance
+        shown_until = max(shown_until, end)
+        layout = rasterizer.measure(tokens)
+        if layout is None or end <= start:
+            continue
+        size = _ass_font_size(layout.font_scale)
+        x = layout.token_x[0]
+        if align == "center":
+            x += layout.text_width // 2
+        elif align == "right":
+            x += layout.text_width
+        y = round(layout.baseline_y - _ASS_BASELINE * size)
+        # Widen spaces to the Hershey word gap the rasterizer uses
+        (space_w, _), _ = cv2.getTextSize(" ", font, layout.font_scale, thickness + outline)
+        gap = max(0, round(space_w - _ASS_SPACE_WIDTH * size))
+
+        changes = _highlight_changes(timeline, idx, start, end)
+        parts = []
+        for w_idx, token in enumerate(tokens):
+            color = highlight if changes and changes[0][1] == w_idx else base
+            tags = f"\\fsp0\\1c&H{color}&"
+            for t, active in changes[1:]:
+                ms = int(round((t - start) * 1000))
+                color = highlight if active == w_idx else base
+                tags += f"\\t({ms},{ms},\\1c&H{color}&)"
+            parts.append(f"{{{tags}}}{_ass_text(token)}")
+        text = f"{{\\an{anchor}\\pos({x},{y})\\fs{size}}}" + f"{{\\fsp{gap}}} ".join(parts)
+        lines.append(f"Dialogue: 0,{_fmt_ass_ts(start)},{_fmt_ass_ts(end)},Caption,,0,0,0,,{text}")
+
+    out = Path(ass_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return out
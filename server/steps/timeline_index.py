@@ -0,0 +1,102 @@
+"""Sorted interval index for the snapping helpers.
+
+Silences, dialog ranges, transcript items and words are all lists of
+``(start, end, ...)`` intervals that the candidate helpers search for every
+clip. Scanning them costs O(n) per query, which adds up over tens of thousands
+of words on long streams. :class:`TimelineIndex` sorts an interval list once
+into NumPy arrays and answers the same questions with binary searches.
+
+Queries return what a front-to-back scan of the start-sorted list would find
+first, so for already sorted inputs (everything the pipeline produces) the
+results match the list-based helpers exactly. ``reach[i]`` is the largest end
+among intervals ``0..i``; it is non-decreasing, so "first interval ending at
+or after ``t``" is a binary search even when intervals overlap.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Optional
+
+import numpy as np
+
+
+class TimelineIndex:
+    """Intervals sorted by start with O(log n) lookups.
+
+    ``items`` keeps the original entries (tuples or word dicts) in index
+    order, so callers can walk forward from a returned position.
+    """
+
+    __slots__ = ("items", "starts", "ends", "reach")
+
+    def __init__(self, intervals: Iterable[Any] = ()) -> None:
+        rows = [(float(_start(it)), float(_end(it)), it) for it in intervals]
+        rows.sort(key=lambda row: row[0])
+        self.items: List[Any] = [row[2] for row in rows]
+        self.starts = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+        self.ends = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        self.reach = np.maximum.accumulate(self.ends) if len(rows) else self.ends
+
+    @classmethod
+    def of(cls, intervals: Optional[Iterable[Any]]) -> Optional["TimelineIndex"]:
+        """Return ``intervals`` as an index (``None`` and indexes pass through)."""
+
+        if intervals is None or isinstance(intervals, TimelineIndex):
+            return intervals
+        return cls(intervals)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        return bool(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def first_ending_at_or_after(self, t: float) -> Optional[int]:
+        """Position of the first interval whose end is ``>= t``."""
+
+        idx = int(np.searchsorted(self.reach, t, side="left"))
+        return idx if idx < len(self.items) else None
+
+    def last_starting_at_or_before(self, t: float) -> Optional[int]:
+        """Position of the last interval whose start is ``<= t``."""
+
+        idx = int(np.searchsorted(self.starts, t, side="right")) - 1
+        return idx if idx >= 0 else None
+
+    def containing(self, t: float) -> Optional[int]:
+        """Position of the first interval with ``start <= t <= end``."""
+
+        idx = self.first_ending_at_or_after(t)
+        if idx is None or self.starts[idx] > t:
+            return None
+        return idx
+
+    def previous_start(self, t: float) -> Optional[float]:
+        """Largest start ``<= t``."""
+
+        idx = self.last_starting_at_or_before(t)
+        return None if idx is None else float(self.starts[idx])
+
+    def next_end(self, t: float) -> Optional[float]:
+        """End of the first interval ending at or after ``t``."""
+
+        idx = self.first_ending_at_or_after(t)
+        return None if idx is None else float(self.ends[idx])
+
+
+def _start(item: Any) -> Any:
+    if isinstance(item, dict):
+        return item.get("start", np.inf)
+    return item[0]
+
+
+def _end(item: Any) -> Any:
+    if isinstance(item, dict):
+        return item.get("end", 0)
+    return item[1]
+
+
+__all__ = ["TimelineIndex"]
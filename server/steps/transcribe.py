@@ -1,88 +1,150 @@
-from typing import Callable
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
-from faster_whisper import WhisperModel
+from helpers.pcm import is_pcm_path, pcm_samples
+from helpers.whisper_models import get_model_registry
 from interfaces.timer import Timer
-from config import WHISPER_MODEL
+from config import TRANSCRIBE_WORKERS, WHISPER_MODEL
 
 ProgressCallback = Callable[[float], None]
+SegmentCallback = Callable[[Dict[str, Any]], None]
+SilencesCallback = Callable[[List[Tuple[float, float]]], None]
 
 
-def transcribe_audio(file_path, model_size=WHISPER_MODEL, progress_callback: ProgressCallback | None = None):
-    """Transcribe an audio file using faster_whisper."""
-    with Timer() as t:
-        model = WhisperModel(model_size, device="auto")
+def run_whisper(model: Any, audio: Any, *, word_timestamps: bool = True) -> Tuple[Iterable[Any], Any]:
+    """Start transcribing ``audio`` (a path or 16 kHz mono samples) with ``model``."""
+
+    try:
+        return model.transcribe(
+            audio,
+            chunk_length=10,
+            beam_size=1,
+            temperature=0.0,
+            vad_filter=True,
+            vad_parameters=dict(threshold=0.6),
+            no_speech_threshold=0.6,
+            condition_on_previous_text=False,
+            word_timestamps=word_timestamps,
+        )
+    except TypeError:
         try:
-            segments_iter, info = model.transcribe(
-                file_path,
-                chunk_length=10,
-                beam_size=1,
-                temperature=0.0,
-                vad_filter=True,
-                vad_parameters=dict(threshold=0.6),
-                no_speech_threshold=0.6,
-                condition_on_previous_text=False,
-                word_timestamps=True,
-            )
+            return model.transcribe(audio, word_timestamps=word_timestamps)
         except TypeError:
-            try:
-                segments_iter, info = model.transcribe(file_path, word_timestamps=True)
-            except TypeError:
-                segments_iter, info = model.transcribe(file_path)
+            return model.transcribe(audio)
+
+
+def segment_to_dict(seg: Any, offset: float = 0.0) -> Dict[str, Any]:
+    """Return the transcript entry for ``seg`` with times shifted by ``offset``."""
+
+    words_data = []
+    for w in getattr(seg, "words", []) or []:
+        text = getattr(w, "word", "")
+        if text is None:
+            continue
+        cleaned = text.strip()
+        if not cleaned:
+            continue
+        start = getattr(w, "start", None)
+        end = getattr(w, "end", None)
+        try:
+            start_val = float(start) if start is not None else None
+            end_val = float(end) if end is not None else None
+        except (TypeError, ValueError):
+            start_val = end_val = None
+        if start_val is None or end_val is None or end_val <= start_val:
+            continue
+        words_data.append({
+            "start": start_val + offset,
+            "end": end_val + offset,
+            "text": cleaned,
+        })
+
+    return {
+        "start": seg.start + offset,
+        "end": seg.end + offset,
+        "text": seg.text,
+        "words": words_data,
+    }
+
+
+def transcription_result(segment_list: List[Dict[str, Any]], t: Timer) -> Dict[str, Any]:
+    """Package transcript entries the way :func:`transcribe_audio` returns them."""
+
+    return {
+        "text": "".join(seg["text"] for seg in segment_list),
+        "segments": segment_list,
+        "timing": {
+            "start_time": t.start_time,
+            "stop_time": t.stop_time,
+            "total_time": t.elapsed,
+        },
+    }
+
+
+def transcribe_audio(
+    file_path,
+    model_size=WHISPER_MODEL,
+    progress_callback: ProgressCallback | None = None,
+    *,
+    workers: int = TRANSCRIBE_WORKERS,
+    on_segment: SegmentCallback | None = None,
+    compute_type: str | None = None,
+    word_timestamps: bool = True,
+    on_silences: SilencesCallback | None = None,
+):
+    """Transcribe an audio file using faster_whisper.
+
+    ``file_path`` may be a PCM cache from :mod:`helpers.pcm`, whose samples
+    are handed to Whisper without decoding.
+
+    The model comes from the process-wide registry, so repeated calls and
+    concurrent jobs reuse one loaded copy. With ``workers > 1`` long audio is
+    split at silences and transcribed in a process pool instead; see
+    :mod:`steps.transcribe_sharded`. The silences it detects are passed to
+    ``on_silences`` so the silence step can reuse them.
+
+    ``on_segment`` receives each transcript entry, in time order, as soon as
+    it is final (e.g. :meth:`helpers.transcript.TranscriptWriter.append` or
+    :meth:`helpers.transcript.TranscriptStream.publish`), so consumers can
+    start before the whole file is transcribed.
+
+    ``compute_type`` overrides ``WHISPER_COMPUTE_TYPE`` (e.g. ``"int8"`` for a
+    quantized fast pass) and ``word_timestamps=False`` skips word alignment;
+    see :mod:`steps.transcribe_refine` for re-transcribing chosen ranges.
+    """
+    if workers > 1:
+        from .transcribe_sharded import transcribe_sharded
+
+        result = transcribe_sharded(
+            file_path,
+            model_size,
+            progress_callback,
+            workers=workers,
+            on_segment=on_segment,
+            compute_type=compute_type,
+            word_timestamps=word_timestamps,
+            on_silences=on_silences,
+        )
+        if result is not None:
+            return result
+
+    with Timer() as t, get_model_registry().lease(model_size, compute_type=compute_type) as model:
+        audio = pcm_samples(file_path) if is_pcm_path(file_path) else file_path
+        segments_iter, info = run_whisper(model, audio, word_timestamps=word_timestamps)
 
         duration = getattr(info, "duration", None)
-        segments = []
+        segment_list = []
         for segment in segments_iter:
-            segments.append(segment)
+            entry = segment_to_dict(segment)
+            segment_list.append(entry)
+            if on_segment is not None:
+                on_segment(entry)
             if progress_callback and duration:
                 progress_callback(min(0.99, max(0.0, segment.end / duration)))
 
     if progress_callback:
         progress_callback(1.0)
 
-    text = "".join(s.text for s in segments)
-    segment_list = []
-    for seg in segments:
-        words_data = []
-        for w in getattr(seg, "words", []) or []:
-            text = getattr(w, "word", "")
-            if text is None:
-                continue
-            cleaned = text.strip()
-            if not cleaned:
-                continue
-            start = getattr(w, "start", None)
-            end = getattr(w, "end", None)
-            try:
-                start_val = float(start) if start is not None else None
-                end_val = float(end) if end is not None else None
-            except (TypeError, ValueError):
-                start_val = end_val = None
-            if start_val is None or end_val is None or end_val <= start_val:
-                continue
-            words_data.append({
-                "start": start_val,
-                "end": end_val,
-                "text": cleaned,
-            })
-
-        segment_list.append(
-            {
-                "start": seg.start,
-                "end": seg.end,
-                "text": seg.text,
-                "words": words_data,
-            }
-        )
-    timing = {
-        "start_time": t.start_time,
-        "stop_time": t.stop_time,
-        "total_time": t.elapsed,
-    }
-    return {
-        "text": text,
-        "segments": segment_list,
-        "timing": timing,
-    }
+    return transcription_result(segment_list, t)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""Second, high-quality transcription pass over the clips that were chosen.
+
+With ``TRANSCRIBE_FAST_MODEL`` set, step 3 transcribes the whole audio with a
+small or quantized model and no word timestamps; that is enough text for
+candidate search. Once candidates are picked, :func:`refine_transcript_ranges`
+re-transcribes only their ranges (plus padding) with ``WHISPER_MODEL`` and
+word timestamps and splices the result into the transcript ``.txt`` and its
+``.json`` companion, which subtitles and the renderer read.
+
+Each range is widened to the fast segments it touches and those segments are
+replaced wholesale, so no line is duplicated or cut in half at the seams.
+Refined ranges are recorded in the ``.json`` so reruns skip them.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from config import TRANSCRIBE_REFINE_PADDING, WHISPER_MODEL
+from helpers.transcript import TranscriptWriter, load_transcript_json
+from helpers.whisper_models import get_model_registry
+
+from .transcribe import run_whisper, segment_to_dict
+
+Range = Tuple[float, float]
+ProgressCallback = Callable[[float], None]
+
+# Value of the ``tier`` key in the .json written by the fast pass
+FAST_TIER = "fast"
+
+
+def plan_refine_ranges(
+    segments: Sequence[Dict[str, Any]],
+    ranges: Sequence[Range],
+    *,
+    padding: float = TRANSCRIBE_REFINE_PADDING,
+    done: Sequence[Range] = (),
+) -> List[Range]:
+    """Return the merged ranges to re-transcribe for clips at ``ranges``.
+
+    Each range is padded, widened to cover every segment it overlaps and
+    merged with its neighbours. Ranges already inside one of ``done`` are
+    dropped.
+    """
+
+    widened: List[Range] = []
+    for start, end in ranges:
+        if end <= start:
+            continue
+        start, end = max(0.0, start - padding), end + padding
+        for seg in segments:
+            if seg["start"] < end and seg["end"] > start:
+                start = min(start, seg["start"])
+                end = max(end, seg["end"])
+        widened.append((start, end))
+
+    merged: List[Range] = []
+    for start, end in sorted(widened):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return [
+        (start, end)
+        for start, end in merged
+        if not any(d_start <= start and end <= d_end for d_start, d_end in done)
+    ]
+
+
+def splice_segments(
+    segments: Sequence[Dict[str, Any]],
+    refined: Sequence[Tuple[Range, List[Dict[str, Any]]]],
+) -> List[Dict[str, Any]]:
+    """Replace the segments overlapping each refined range with its new entries."""
+
+    kept = [
+        seg
+        for seg in segments
+        if not any(seg["start"] < end and seg["end"] > start for (start, end), _ in refined)
+    ]
+    for _, entries in refined:
+        kept.extend(entries)
+    kept.sort(key=lambda seg: (seg["start"], seg["end"]))
+    return kept
+
+
+def refine_transcript_ranges(
+    transcript_path: str | Path,
+    audio_path: str | Path,
+    ranges: Sequence[Range],
+    *,
+    model_size: str = WHISPER_MODEL,
+    padding: float = TRANSCRIBE_REFINE_PADDING,
+    progress_callback: ProgressCallback | None = None,
+) -> List[Range]:
+    """Re-transcribe ``ranges`` of a fast-pass transcript with ``model_size``.
+
+    Returns the ranges that were re-transcribed. Transcripts not written by
+    the fast pass (e.g. downloaded ones) are left alone.
+    """
+
+    payload = load_transcript_json(transcript_path)
+    if payload.get("tier") != FAST_TIER:
+        return []
+    segments = payload.get("segments", [])
+    done = [tuple(r) for r in payload.get("refined", [])]
+    todo = plan_refine_ranges(segments, ranges, padding=padding, done=done)
+    if not todo:
+        return []
+
+    from .transcribe_sharded import decode_pcm_range
+
+    total = sum(end - start for start, end in todo)
+    covered = 0.0
+    refined: List[Tuple[Range, List[Dict[str, Any]]]] = []
+    with get_model_registry().lease(model_size) as model:
+        for start, end in todo:
+            audio = decode_pcm_range(str(audio_path), start, end)
+            segments_iter, _ = run_whisper(model, audio, word_timestamps=True)
+            entries = [segment_to_dict(seg, offset=start) for seg in segments_iter]
+            refined.append(((start, end), entries))
+            covered += end - start
+            if progress_callback:
+                progress_callback(min(0.99, covered / total))
+
+    writer = TranscriptWriter(transcript_path)
+    try:
+        for seg in splice_segments(segments, refined):
+            writer.append(seg)
+    except BaseException:
+        writer.abort()
+        raise
+    extra = {key: value for key, value in payload.items() if key not in ("segments", "timing")}
+    extra["refined"] = sorted([list(r) for r in done] + [[start, end] for start, end in todo])
+    writer.close(payload.get("timing", {}), extra=extra)
+
+    if progress_callback:
+        progress_callback(1.0)
+    return todo
+
+
+__all__ = ["FAST_TIER", "plan_refine_ranges", "refine_transcript_ranges", "splice_segments"]
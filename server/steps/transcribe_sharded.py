@@ -0,0 +1,255 @@
+"""Silence-sharded transcription across a process pool.
+
+Long audio is cut at detected silences into shards of roughly
+``TRANSCRIBE_SHARD_SECONDS``. Each worker process loads its own Whisper model
+with a bounded number of CPU threads, decodes only its shard with ffmpeg and
+returns plain transcript entries. Segment and word times are shifted back by
+the shard start, so the stitched result matches what
+:func:`steps.transcribe.transcribe_audio` returns for the whole file.
+
+Cutting inside silences means no word straddles a shard boundary. More shards
+than workers are used for long audio so a slow shard does not leave the other
+workers idle.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing as mp
+import os
+import queue
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import (
+    TRANSCRIBE_SHARD_SECONDS,
+    TRANSCRIBE_THREADS_PER_WORKER,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_DEVICE,
+)
+from helpers.media import probe_media_duration
+from helpers.pcm import SAMPLE_RATE, ffmpeg_input_args, is_pcm_path, pcm_samples
+from interfaces.timer import Timer
+
+from .silence import detect_silences
+from .transcribe import (
+    ProgressCallback,
+    SegmentCallback,
+    SilencesCallback,
+    run_whisper,
+    segment_to_dict,
+    transcription_result,
+)
+
+Shard = Tuple[float, float]
+
+
+def plan_shards(
+    duration: float,
+    silences: Sequence[Tuple[float, float]],
+    *,
+    shard_seconds: float = TRANSCRIBE_SHARD_SECONDS,
+    min_shards: int = 1,
+) -> List[Shard]:
+    """Split ``[0, duration)`` into roughly equal shards cut inside silences.
+
+    Each cut goes to the middle of the silence closest to its ideal position,
+    searched within a quarter shard either side; without a nearby silence the
+    ideal position is used.
+    """
+
+    if duration <= 0:
+        return []
+    count = max(int(min_shards), math.ceil(duration / max(shard_seconds, 1.0)))
+    count = max(1, count)
+    length = duration / count
+    window = length / 4
+    midpoints = sorted((start + end) / 2 for start, end in silences if end > start)
+
+    cuts: List[float] = []
+    for k in range(1, count):
+        ideal = k * length
+        nearby = [m for m in midpoints if abs(m - ideal) <= window]
+        cut = min(nearby, key=lambda m: abs(m - ideal)) if nearby else ideal
+        if cuts and cut <= cuts[-1]:
+            continue
+        cuts.append(cut)
+
+    bounds = [0.0, *cuts, duration]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i + 1] > bounds[i]]
+
+
+def decode_pcm_range(audio_path: str, start: float, end: float) -> np.ndarray:
+    """Decode ``[start, end)`` of ``audio_path`` to 16 kHz mono float samples."""
+
+    if is_pcm_path(audio_path):
+        return pcm_samples(audio_path, start, end)
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "error",
+        "-ss",
+        f"{start:.3f}",
+        "-t",
+        f"{end - start:.3f}",
+        *ffmpeg_input_args(audio_path),
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    raw = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE).stdout
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+# Per-process state of a pool worker
+_WORKER_MODEL: Any = None
+_WORKER_PROGRESS: Any = None
+_WORKER_WORDS = True
+
+
+def _init_worker(
+    model_size: str,
+    device: str,
+    compute_type: str,
+    threads: int,
+    progress: Any,
+    word_timestamps: bool = True,
+) -> None:
+    global _WORKER_MODEL, _WORKER_PROGRESS, _WORKER_WORDS
+    from faster_whisper import WhisperModel
+
+    _WORKER_MODEL = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=threads,
+        num_workers=1,
+    )
+    _WORKER_PROGRESS = progress
+    _WORKER_WORDS = word_timestamps
+
+
+def _transcribe_shard(index: int, audio_path: str, start: float, end: float) -> Tuple[int, List[Dict[str, Any]]]:
+    audio = decode_pcm_range(audio_path, start, end)
+    segments_iter, _ = run_whisper(_WORKER_MODEL, audio, word_timestamps=_WORKER_WORDS)
+    entries: List[Dict[str, Any]] = []
+    for segment in segments_iter:
+        entries.append(segment_to_dict(segment, offset=start))
+        if _WORKER_PROGRESS is not None:
+            _WORKER_PROGRESS.put((index, min(segment.end, end - start)))
+    if _WORKER_PROGRESS is not None:
+        _WORKER_PROGRESS.put((index, end - start))
+    return index, entries
+
+
+def transcribe_sharded(
+    file_path,
+    model_size: str,
+    progress_callback: ProgressCallback | None = None,
+    *,
+    workers: int,
+    shard_seconds: float = TRANSCRIBE_SHARD_SECONDS,
+    threads_per_worker: int = TRANSCRIBE_THREADS_PER_WORKER,
+    silences: Optional[Sequence[Tuple[float, float]]] = None,
+    on_segment: SegmentCallback | None = None,
+    compute_type: str | None = None,
+    word_timestamps: bool = True,
+    on_silences: SilencesCallback | None = None,
+) -> Optional[Dict[str, Any]]:
+    """Transcribe ``file_path`` in ``workers`` processes, one shard at a time each.
+
+    ``on_segment`` receives entries in time order: a shard's entries are
+    passed on once it and every shard before it have finished.
+
+    Without ``silences`` they are detected here with the step 4 settings and
+    passed to ``on_silences``, so the silence step need not scan the audio
+    again.
+
+    Returns ``None`` when sharding would not help (unknown duration or audio
+    shorter than two shards) so the caller can transcribe in-process.
+    """
+
+    duration = probe_media_duration(file_path)
+    if not duration or duration < 2 * shard_seconds:
+        return None
+    if silences is None:
+        silences = detect_silences(file_path)
+        if on_silences is not None:
+            on_silences(list(silences))
+    shards = plan_shards(duration, silences, shard_seconds=shard_seconds, min_shards=workers)
+    if len(shards) < 2:
+        return None
+
+    workers = min(workers, len(shards))
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    print(f"[transcribe] {len(shards)} shards on {workers} workers x {threads} threads")
+
+    ctx = mp.get_context("spawn")
+    progress = ctx.Queue()
+    done = [0.0] * len(shards)
+    results: List[Optional[List[Dict[str, Any]]]] = [None for _ in shards]
+    emitted = 0
+
+    def _emit_ready() -> None:
+        nonlocal emitted
+        while emitted < len(results) and results[emitted] is not None:
+            if on_segment is not None:
+                for entry in results[emitted]:
+                    on_segment(entry)
+            emitted += 1
+
+    def _report() -> None:
+        while True:
+            try:
+                index, seconds = progress.get_nowait()
+            except queue.Empty:
+                break
+            done[index] = max(done[index], seconds)
+        if progress_callback:
+            progress_callback(min(0.99, sum(done) / duration))
+
+    with Timer() as t:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(
+                model_size,
+                WHISPER_DEVICE,
+                compute_type or WHISPER_COMPUTE_TYPE,
+                threads,
+                progress,
+                word_timestamps,
+            ),
+        ) as pool:
+            # Longest shards first so the tail of the run stays short
+            order = sorted(range(len(shards)), key=lambda i: shards[i][0] - shards[i][1])
+            pending = {pool.submit(_transcribe_shard, i, str(file_path), *shards[i]) for i in order}
+            try:
+                while pending:
+                    finished, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index, entries = future.result()
+                        results[index] = entries
+                    _emit_ready()
+                    _report()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+    progress.close()
+
+    if progress_callback:
+        progress_callback(1.0)
+    return transcription_result([entry for entries in results if entries for entry in entries], t)
+
+
+__all__ = ["decode_pcm_range", "plan_shards", "transcribe_sharded"]
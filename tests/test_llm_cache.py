@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from server.helpers import ai
+
+
+class _Response:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return {"response": self.text}
+
+
+def _use_cache(monkeypatch, tmp_path, **kwargs) -> ai.LLMResponseCache:
+    cache = ai.LLMResponseCache(tmp_path / "llm.sqlite3", **kwargs)
+    monkeypatch.setattr(ai, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai, "_LLM_CACHE", cache)
+    return cache
+
+
+def test_identical_requests_are_answered_from_disk(monkeypatch, tmp_path) -> None:
+    cache = _use_cache(monkeypatch, tmp_path)
+    posts = []
+
+    def fake_post(url, json=None, timeout=None):
+        posts.append(json)
+        return _Response(f"answer {len(posts)}")
+
+    monkeypatch.setattr(ai.requests, "post", fake_post)
+
+    cold = {"temperature": 0.0}
+    assert ai.ollama_generate("m", "p", options=cold) == "answer 1"
+    assert ai.ollama_generate("m", "p", options=cold) == "answer 1"
+    assert ai.ollama_generate("m", "p", options={"temperature": 0.0, "top_p": 0.9}) == "answer 2"
+    assert ai.ollama_generate("m", "p", json_format=False, options=cold) == "answer 3"
+    # Hot sampling, no temperature and explicit opt-out all reach the server
+    assert ai.ollama_generate("m", "p", options={"temperature": 0.8}) == "answer 4"
+    assert ai.ollama_generate("m", "p") == "answer 5"
+    assert ai.ollama_generate("m", "p", options=cold, cache=False) == "answer 6"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+    # A new process reads the same file
+    reopened = ai.LLMResponseCache(tmp_path / "llm.sqlite3")
+    key = reopened.key("ollama", "m", "p", json_format=True, options=cold)
+    assert reopened.get(key) == "answer 1"
+
+
+def test_old_and_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    now = [0.0]
+    cache = ai.LLMResponseCache(
+        tmp_path / "llm.sqlite3", max_bytes=25, max_age=100.0, clock=lambda: now[0]
+    )
+    for name in ("a", "b", "c"):
+        cache.put(name, "ollama", "m", "x" * 10)
+        now[0] += 10.0
+    assert cache.get("a") == "x" * 10
+
+    # b is the least recently used once a was read again
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    now[0] = 110.0
+    assert cache.get("a") is None
+    assert cache.get("c") == "x" * 10
+    assert cache.evict() == 0
+    now[0] = 200.0
+    assert cache.evict() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_unparseable_json_responses_are_not_cached(monkeypatch, tmp_path) -> None:
+    cache = _use_cache(monkeypatch, tmp_path)
+    answers = ["not json at all", '[{"start": 1.0}]']
+    posts = []
+
+    def fake_post(url, json=None, timeout=None):
+        posts.append(json)
+        return _Response(answers[len(posts) - 1])
+
+    monkeypatch.setattr(ai.requests, "post", fake_post)
+
+    cold = {"temperature": 0.0}
+    with pytest.raises(ValueError):
+        ai.ollama_call_json("m", "p", options=cold)
+    assert cache.stats()["entries"] == 0
+
+    # The rerun reaches the server again, and its good answer is kept
+    assert ai.ollama_call_json("m", "p", options=cold) == [{"start": 1.0}]
+    assert ai.ollama_call_json("m", "p", options=cold) == [{"start": 1.0}]
+    assert len(posts) == 2
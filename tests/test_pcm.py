@@ -0,0 +1,41 @@
+"""Tests for the shared PCM audio cache."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.helpers.media import probe_media_duration
+from server.helpers.pcm import SAMPLE_RATE, ffmpeg_input_args, pcm_duration, pcm_samples
+
+
+def _write_pcm(path: Path, seconds: float) -> np.ndarray:
+    samples = (np.arange(int(seconds * SAMPLE_RATE)) % 200 - 100).astype("<i2") * 100
+    samples.tofile(path)
+    return samples
+
+
+def test_pcm_duration_comes_from_file_size(tmp_path: Path) -> None:
+    pcm = tmp_path / "a.pcm"
+    _write_pcm(pcm, 2.5)
+    assert pcm_duration(pcm) == 2.5
+    assert probe_media_duration(pcm) == 2.5
+
+
+def test_pcm_samples_slices_seconds_as_float(tmp_path: Path) -> None:
+    pcm = tmp_path / "a.pcm"
+    raw = _write_pcm(pcm, 2.0)
+    part = pcm_samples(pcm, 0.5, 1.0)
+    assert part.dtype == np.float32
+    assert len(part) == SAMPLE_RATE // 2
+    np.testing.assert_allclose(part, raw[SAMPLE_RATE // 2 : SAMPLE_RATE] / 32768.0)
+    assert len(pcm_samples(pcm, 1.5, 10.0)) == SAMPLE_RATE // 2
+
+
+def test_ffmpeg_input_args_describe_raw_pcm() -> None:
+    assert ffmpeg_input_args("a.mp3") == ["-i", "a.mp3"]
+    assert ffmpeg_input_args("a.pcm") == ["-f", "s16le", "-ar", "16000", "-ac", "1", "-i", "a.pcm"]
@@ -49,3 +49,21 @@ def test_run_step_emits_failure(monkeypatch: pytest.MonkeyPatch) -> None:
         PipelineEventType.STEP_STARTED,
         PipelineEventType.STEP_FAILED,
     ]
+
+
+def test_run_step_adds_completed_data() -> None:
+    recorder = _Recorder()
+
+    result = run_step(
+        "Test",
+        lambda: 3,
+        step_id="test",
+        observer=recorder,
+        completed_data=lambda value: {"doubled": value * 2},
+    )
+
+    assert result == 3
+    completed = recorder.events[-1]
+    assert completed.type == PipelineEventType.STEP_COMPLETED
+    assert completed.data["doubled"] == 6
+    assert "elapsed_seconds" in completed.data
@@ -43,3 +43,60 @@ def test_find_candidates_uses_tqdm(monkeypatch, tmp_path: Path) -> None:
     result = tone_module.find_candidates_by_tone(transcript, tone=tone_module.Tone.FUNNY)
     assert result == []
     assert called["total"] == len(windows)
+
+
+def test_concurrent_windows_report_progress_in_order(monkeypatch, tmp_path: Path) -> None:
+    """Windows overlap, progress stays ordered and a failed window is skipped."""
+    import threading
+    import time
+
+    root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(root))
+    sys.path.insert(0, str(root / "server"))
+
+    from server.steps.candidates import tone as tone_module
+
+    monkeypatch.setattr(tone_module, "parse_transcript", lambda _: [(0.0, 1.0, "hi")])
+    windows = [(float(i), float(i + 1), []) for i in range(6)]
+    monkeypatch.setattr(tone_module, "_window_items", lambda _: windows)
+    monkeypatch.setattr(tone_module, "LLM_WINDOW_CONCURRENCY", 3)
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def fake_llm(**kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        if "boom" in kwargs["prompt"]:
+            raise RuntimeError("server error")
+        return [{"start": 1.0, "end": 20.0, "rating": 9.5, "reason": "r", "quote": "q"}]
+
+    texts = iter(["ok", "boom", "ok", "ok", "ok", "ok"])
+    monkeypatch.setattr(
+        tone_module, "build_window_prompt", lambda _desc, _text: next(texts)
+    )
+    monkeypatch.setattr("server.steps.candidates.local_llm_call_json", fake_llm)
+    monkeypatch.setattr(
+        "server.steps.candidates._filter_promotional_candidates", lambda c, _i: c
+    )
+    monkeypatch.setattr(tone_module, "_filter_promotional_candidates", lambda c, _i: c)
+    monkeypatch.setattr(tone_module, "_merge_adjacent_candidates", lambda c, *_, **__: c)
+    monkeypatch.setattr(tone_module, "chain_into_sweet_spot", lambda c: c)
+    monkeypatch.setattr(tone_module, "_enforce_non_overlap", lambda c, _i, strategy, **__: c)
+
+    progress: list[tuple[int, int]] = []
+    result = tone_module.find_candidates_by_tone(
+        tmp_path / "t.txt",
+        tone=tone_module.Tone.FUNNY,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert len(result) == 5
+    assert [done for done, _ in progress] == [0, 1, 2, 3, 4, 5, 6, 6]
+    assert peak > 1
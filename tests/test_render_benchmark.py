@@ -0,0 +1,45 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.benchmarks.render import compare_to_baseline, generate_captions, main
+
+
+def test_generate_captions_writes_word_sidecar(tmp_path: Path) -> None:
+    path = generate_captions(3.0, tmp_path, words_per_caption=4, word_seconds=0.3)
+
+    words = json.loads(path.with_suffix(".words.json").read_text())["words"]
+    assert len(words) == 10
+    assert words[-1]["end"] <= 3.0
+    blocks = path.read_text().strip().split("\n\n")
+    assert len(blocks) == 3
+    assert blocks[0].splitlines()[1] == "00:00:00,000 --> 00:00:01,200"
+
+
+def test_compare_to_baseline_flags_only_regressions() -> None:
+    baseline = [
+        {"key": "a", "fps": 100.0, "compose_ms_per_frame": 4.0, "peak_rss_mb": 500.0, "output_mb": 2.0},
+        {"key": "b", "fps": 50.0, "compose_ms_per_frame": None, "peak_rss_mb": 400.0, "output_mb": 1.0},
+    ]
+    results = [
+        {"key": "a", "fps": 85.0, "compose_ms_per_frame": 3.0, "peak_rss_mb": 550.0, "output_mb": 2.0},
+        {"key": "b", "fps": 70.0, "compose_ms_per_frame": 9.0, "peak_rss_mb": 600.0, "output_mb": 1.0},
+        {"key": "c", "fps": 1.0, "compose_ms_per_frame": 1.0, "peak_rss_mb": 1.0, "output_mb": 1.0},
+    ]
+
+    regressions = compare_to_baseline(results, baseline)
+
+    assert [(r["key"], r["metric"]) for r in regressions] == [("a", "fps"), ("b", "peak_rss_mb")]
+    assert regressions[0]["change"] == 0.15
+
+
+def test_missing_baseline_is_an_error(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["--baseline", str(tmp_path / "missing.json")])
+    assert exc.value.code == 2
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.layouts import PixelRect
+from server.steps.rendering import CaptionRasterizer, CaptionStyle
+
+
+def _rasterizer() -> CaptionRasterizer:
+    style = CaptionStyle(
+        font_scale=1.0,
+        thickness=2,
+        outline=2,
+        base_color=(255, 255, 255),
+        highlight_color=(0, 255, 0),
+        outline_color=(0, 0, 0),
+    )
+    return CaptionRasterizer(
+        style,
+        frame_size=(360, 640),
+        caption_rect=PixelRect(20, 480, 320, 120),
+        wrap_pixels=320,
+        bottom_safe_ratio=0.1,
+    )
+
+
+def test_sprite_is_rasterized_once_per_highlight_state():
+    rasterizer = _rasterizer()
+    tokens = ["hello", "caption", "world"]
+
+    first = rasterizer.sprite(0, tokens, 1)
+    again = rasterizer.sprite(0, tokens, 1)
+    other = rasterizer.sprite(0, tokens, 2)
+
+    assert first is again
+    assert other is not first
+    assert rasterizer.rasterized == 2
+
+    rasterizer.sprite(1, ["next"], None)
+    assert rasterizer.rasterized == 3
+
+
+def test_sprite_blend_only_touches_caption_region():
+    rasterizer = _rasterizer()
+    canvas = np.full((640, 360, 3), 90, dtype=np.uint8)
+
+    sprite = rasterizer.sprite(0, ["hello", "world"], 0)
+    assert sprite is not None
+    sprite.blend_into(canvas)
+
+    changed = np.argwhere(np.any(canvas != 90, axis=2))
+    assert changed.size > 0
+    assert changed[:, 0].min() >= sprite.y
+    assert changed[:, 0].max() < sprite.y + sprite.height
+    # Highlighted word is drawn in the highlight color
+    region = canvas[sprite.y:sprite.y + sprite.height, sprite.x:sprite.x + sprite.width]
+    assert np.any((region[:, :, 1] == 255) & (region[:, :, 0] == 0) & (region[:, :, 2] == 0))
+
+
+def test_empty_caption_has_no_sprite():
+    rasterizer = _rasterizer()
+    assert rasterizer.sprite(0, ["  "], None) is None
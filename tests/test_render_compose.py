@@ -0,0 +1,122 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.layouts import (
+    LayoutBackground,
+    LayoutCanvas,
+    LayoutDefinition,
+    LayoutFrame,
+    LayoutShapeItem,
+    LayoutVideoItem,
+    prepare_layout,
+)
+from server.steps.rendering import FrameBufferPool, FrameCompositor, build_static_layers
+
+
+def _compositor(background: LayoutBackground, *items, **kwargs) -> FrameCompositor:
+    layout = LayoutDefinition(
+        id="compose",
+        name="Compose",
+        version=1,
+        description=None,
+        author=None,
+        tags=(),
+        canvas=LayoutCanvas(width=180, height=320, background=background),
+        caption_area=None,
+        items=tuple(items),
+    )
+    prepared = prepare_layout(layout)
+    layers = build_static_layers(
+        prepared,
+        font_scale=1.0,
+        thickness=2,
+        outline=2,
+        fill_color=(255, 255, 255),
+        outline_color=(0, 0, 0),
+    )
+    return FrameCompositor(prepared, layers, background=background, **kwargs)
+
+
+def _frame() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    return rng.integers(0, 255, (90, 160, 3), dtype=np.uint8)
+
+
+def test_buffer_pool_reuses_buffers():
+    pool = FrameBufferPool(4, 2, depth=2)
+    first, second, third = pool.canvas(), pool.canvas(), pool.canvas()
+    assert first is third and first is not second
+    assert first.shape == (2, 4, 3)
+
+    scratch = pool.get("scratch", (3, 3, 3))
+    assert pool.get("scratch", (3, 3, 3)) is scratch
+    assert pool.get("scratch", (5, 3, 3)) is not scratch
+
+
+def test_compose_allocates_nothing_after_warm_up():
+    compositor = _compositor(
+        LayoutBackground(kind="blur", radius=9, opacity=0.5),
+        LayoutVideoItem(id="cover", kind="video", frame=LayoutFrame(0.1, 0.1, 0.8, 0.4), mirror=True),
+        LayoutVideoItem(
+            id="contain",
+            kind="video",
+            frame=LayoutFrame(0.1, 0.55, 0.8, 0.3),
+            scale_mode="contain",
+            opacity=0.5,
+            z_index=1,
+        ),
+        LayoutShapeItem(id="bar", kind="shape", frame=LayoutFrame(0, 0.9, 1, 0.1), opacity=0.5, z_index=2),
+    )
+    frame = _frame()
+    compositor.compose(frame)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(3):
+            compositor.compose(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Only Python bookkeeping remains; no image-sized buffers
+    assert peak - before < 16 * 1024
+
+
+def test_cover_video_matches_full_resize_and_crop():
+    compositor = _compositor(
+        LayoutBackground(kind="color", color="#000000"),
+        LayoutVideoItem(id="video", kind="video", frame=LayoutFrame(0, 0, 1, 1)),
+        static_background=np.zeros((320, 180, 3), dtype=np.uint8),
+    )
+    # Smooth content: the crop-first path may differ by a sub-pixel offset
+    frame = cv2.GaussianBlur(_frame(), (15, 15), 0)
+    canvas = compositor.compose(frame)
+
+    scale = max(180 / 160, 320 / 90)
+    new_w, new_h = int(160 * scale), int(90 * scale)
+    resized = cv2.resize(frame, (new_w, new_h))
+    x0 = (new_w - 180) // 2
+    expected = resized[:, x0:x0 + 180]
+    assert np.abs(canvas.astype(int) - expected.astype(int)).mean() < 2.0
+
+
+def test_contain_video_keeps_letterbox_black():
+    compositor = _compositor(
+        LayoutBackground(kind="color", color="#ffffff"),
+        LayoutVideoItem(id="video", kind="video", frame=LayoutFrame(0, 0, 1, 1), scale_mode="contain"),
+        static_background=np.full((320, 180, 3), 255, dtype=np.uint8),
+    )
+    canvas = compositor.compose(_frame())
+    # 160x90 contained in 180x320 leaves bars above and below the picture
+    assert np.all(canvas[:100] == 0)
+    assert np.all(canvas[-100:] == 0)
+    assert canvas[160].any()
@@ -0,0 +1,163 @@
+import shutil
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.layouts import (
+    LayoutBackground,
+    LayoutCanvas,
+    LayoutDefinition,
+    LayoutFrame,
+    LayoutShapeItem,
+    LayoutVideoItem,
+    prepare_layout,
+)
+from server.steps.rendering import build_static_layers
+from server.steps.rendering import filtergraph
+from server.steps.rendering.filtergraph import (
+    OverlayImage,
+    UnsupportedLayoutError,
+    available_filters,
+    compile_filtergraph,
+    escape_filter_value,
+    render_with_filtergraph,
+)
+
+
+def _layers(background: LayoutBackground, *items):
+    layout = LayoutDefinition(
+        id="graph",
+        name="Graph",
+        version=1,
+        description=None,
+        author=None,
+        tags=(),
+        canvas=LayoutCanvas(width=180, height=320, background=background),
+        caption_area=None,
+        items=tuple(items),
+    )
+    return build_static_layers(
+        prepare_layout(layout),
+        font_scale=1.0,
+        thickness=2,
+        outline=2,
+        fill_color=(255, 255, 255),
+        outline_color=(0, 0, 0),
+    )
+
+
+def test_compile_blur_layout_with_video_options():
+    background = LayoutBackground(kind="blur", radius=9, opacity=0.5)
+    layers = _layers(
+        background,
+        LayoutVideoItem(id="cover", kind="video", frame=LayoutFrame(0.1, 0.1, 0.8, 0.4), mirror=True),
+        LayoutVideoItem(
+            id="contain",
+            kind="video",
+            frame=LayoutFrame(0.1, 0.55, 0.8, 0.3),
+            scale_mode="contain",
+            opacity=0.5,
+            z_index=1,
+        ),
+    )
+    graph = compile_filtergraph(
+        layers.videos,
+        [None, None, OverlayImage(Path("/tmp/top.png"), 4, 5)],
+        canvas_size=(180, 320),
+        source_size=(160, 90),
+        fps=30.0,
+        background=background,
+        subtitles=Path("/tmp/it's:here.ass"),
+    )
+
+    fc = graph.filter_complex
+    assert fc.startswith("[0:v]split=3[bgsrc][v0][v1]")
+    assert "scale=44:80:flags=area,gblur=sigma=" in fc
+    assert "lutyuv=y='(val-16)*0.5000+16'" in fc
+    assert "hflip" in fc
+    assert "pad=144:96:" in fc and "colorchannelmixer=aa=0.5000" in fc
+    assert "[base2][img1]overlay=4:5:shortest=1" in fc
+    assert graph.inputs[-2:] == ["-i", "/tmp/top.png"]
+    assert fc.endswith(f"[{graph.output_label}]")
+    assert "subtitles=filename=/tmp/it\\\\\\'s\\\\:here.ass" in fc
+
+
+def test_unsupported_layouts_are_rejected():
+    background = LayoutBackground(kind="blur")
+    rotated = _layers(background, LayoutVideoItem(id="v", kind="video", rotation=90))
+    with pytest.raises(UnsupportedLayoutError):
+        compile_filtergraph(rotated.videos, rotated.layers, canvas_size=(180, 320), source_size=(160, 90), fps=30.0, background=background)
+    empty = _layers(background, LayoutShapeItem(id="s", kind="shape", frame=LayoutFrame(0, 0, 1, 1)))
+    with pytest.raises(UnsupportedLayoutError):
+        compile_filtergraph(empty.videos, empty.layers, canvas_size=(180, 320), source_size=(160, 90), fps=30.0, background=background)
+
+
+def test_escape_filter_value_escapes_both_levels():
+    assert escape_filter_value("a:b") == "a\\\\:b"
+    assert escape_filter_value("x,y[z];") == "x\\,y\\[z\\]\\;"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_render_with_filtergraph_places_video_over_color_background(tmp_path):
+    source = tmp_path / "src.avi"
+    writer = cv2.VideoWriter(str(source), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (160, 90))
+    for _ in range(10):
+        writer.write(np.full((90, 160, 3), (0, 0, 255), dtype=np.uint8))
+    writer.release()
+
+    background = LayoutBackground(kind="color", color="#00ff00")
+    layers = _layers(
+        background,
+        LayoutVideoItem(id="v", kind="video", frame=LayoutFrame(0, 0, 1, 0.5)),
+        LayoutShapeItem(id="bar", kind="shape", frame=LayoutFrame(0, 0.75, 1, 0.25), color="#0000ff", z_index=1),
+    )
+    out = render_with_filtergraph(
+        source,
+        tmp_path / "out.mp4",
+        layers,
+        canvas_size=(180, 320),
+        source_size=(160, 90),
+        fps=10.0,
+        background=background,
+        static_background=np.full((320, 180, 3), (0, 255, 0), dtype=np.uint8),
+        mux_audio=False,
+    )
+
+    cap = cv2.VideoCapture(str(out))
+    ok, frame = cap.read()
+    count = 1
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    assert ok and frame.shape == (320, 180, 3)
+    assert count == 10
+    assert np.abs(frame[80, 90].astype(int) - (0, 0, 255)).max() < 40
+    assert np.abs(frame[200, 90].astype(int) - (0, 255, 0)).max() < 40
+    assert np.abs(frame[300, 90].astype(int) - (255, 0, 0)).max() < 40
+
+
+def test_available_filters_probes_each_binary_once(monkeypatch):
+    calls = []
+
+    class _Result:
+        stdout = b" T.. scale             V->V       Scale the input video.\n"
+
+    def fake_run(cmd, **_kwargs):
+        calls.append(cmd[0])
+        return _Result()
+
+    available_filters.cache_clear()
+    monkeypatch.setattr(filtergraph.subprocess, "run", fake_run)
+    try:
+        assert available_filters("/opt/ffmpeg") == {"scale"}
+        assert available_filters("/opt/ffmpeg") == {"scale"}
+        assert calls == ["/opt/ffmpeg"]
+    finally:
+        available_filters.cache_clear()
@@ -64,3 +64,34 @@ def test_render_without_caption_colors(tmp_path: Path) -> None:
     )
 
     assert out_path.exists()
+
+
+def test_render_source_range_without_intermediate_clip(tmp_path: Path) -> None:
+    src_path = tmp_path / "source.mp4"
+    fps = 10.0
+    size = (64, 64)
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    writer = cv2.VideoWriter(str(src_path), fourcc, fps, size)
+    for idx in range(30):
+        writer.write(np.full((size[1], size[0], 3), idx * 8, dtype=np.uint8))
+    writer.release()
+
+    out_path = tmp_path / "out.mp4"
+    render_vertical_with_captions(
+        src_path,
+        captions=[(0.0, 0.7, "range")],
+        output_path=out_path,
+        frame_width=160,
+        frame_height=280,
+        mux_audio=False,
+        use_cuda=False,
+        use_opencl=False,
+        source_start=1.0,
+        source_end=1.7,
+    )
+
+    cap = cv2.VideoCapture(str(out_path))
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    assert frames == 7
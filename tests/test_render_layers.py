@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.layouts import (
+    LayoutBackground,
+    LayoutCanvas,
+    LayoutDefinition,
+    LayoutFrame,
+    LayoutShapeItem,
+    LayoutTextItem,
+    LayoutVideoItem,
+    prepare_layout,
+)
+from server.steps.rendering import build_static_layers, parse_color_hex
+
+
+def _layout(*items) -> LayoutDefinition:
+    return LayoutDefinition(
+        id="layers",
+        name="Layers",
+        version=1,
+        description=None,
+        author=None,
+        tags=(),
+        canvas=LayoutCanvas(width=200, height=400, background=LayoutBackground(kind="color", color="#000000")),
+        caption_area=None,
+        items=tuple(items),
+    )
+
+
+def _build(layout: LayoutDefinition):
+    return build_static_layers(
+        prepare_layout(layout),
+        font_scale=1.0,
+        thickness=2,
+        outline=2,
+        fill_color=(255, 255, 255),
+        outline_color=(0, 0, 0),
+    )
+
+
+def test_static_items_are_split_around_videos_by_z_index():
+    layers = _build(
+        _layout(
+            LayoutVideoItem(id="video", kind="video", frame=LayoutFrame(0, 0.25, 1, 0.5), z_index=5),
+            LayoutShapeItem(id="below", kind="shape", frame=LayoutFrame(0, 0, 1, 0.1), color="#ff0000", z_index=1),
+            LayoutShapeItem(id="above", kind="shape", frame=LayoutFrame(0, 0.3, 0.5, 0.1), color="#00ff00", z_index=8),
+            LayoutTextItem(id="title", kind="text", content="Hi", frame=LayoutFrame(0, 0.8, 1, 0.1), z_index=10),
+        )
+    )
+
+    assert [video.item.id for video in layers.videos] == ["video"]
+    assert len(layers.layers) == 2
+    underlay, overlay = layers.underlay, layers.overlay
+    assert underlay is not None and overlay is not None
+    # The red backdrop sits in the underlay, the green shape and text on top
+    assert (underlay.y, underlay.height) == (0, 40)
+    assert overlay.y == 120
+    assert overlay.y + overlay.height > 320
+
+
+def test_static_layer_blend_respects_opacity():
+    layers = _build(
+        _layout(
+            LayoutShapeItem(
+                id="tint",
+                kind="shape",
+                frame=LayoutFrame(0, 0, 0.5, 0.5),
+                color="#ffffff",
+                opacity=0.5,
+            ),
+        )
+    )
+    assert layers.videos == ()
+    canvas = np.full((400, 200, 3), 100, dtype=np.uint8)
+    layers.underlay.blend_into(canvas)
+
+    assert np.all(np.abs(canvas[:200, :100].astype(int) - 178) <= 1)
+    assert np.all(canvas[200:, :] == 100)
+    assert np.all(canvas[:, 100:] == 100)
+
+
+def test_layout_without_static_items_has_no_layers():
+    layers = _build(_layout(LayoutVideoItem(id="video", kind="video")))
+    assert layers.layers == (None, None)
+
+
+def test_parse_color_hex_returns_bgr():
+    assert parse_color_hex("#102030") == (0x30, 0x20, 0x10)
+    assert parse_color_hex("#abc") == (0xCC, 0xBB, 0xAA)
+    assert parse_color_hex("nope", (1, 2, 3)) == (1, 2, 3)
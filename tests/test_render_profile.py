@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.render import render_vertical_with_captions
+from server.steps.rendering import RenderProfiler, StageTimer, append_render_metrics, load_render_metrics
+
+
+def test_stage_timer_histogram_and_quantiles() -> None:
+    timer = StageTimer()
+    for elapsed_us in (3, 3, 3, 100, 5000):
+        timer.add(elapsed_us * 1000)
+
+    summary = timer.summary()
+
+    assert summary["count"] == 5
+    assert summary["max_ms"] == 5.0
+    assert summary["p50_ms"] == 0.004
+    assert summary["p95_ms"] == 8.192
+    assert summary["histogram"] == [[0.004, 3], [0.128, 1], [8.192, 1]]
+
+
+def test_render_records_stage_timings(tmp_path: Path) -> None:
+    src_path = tmp_path / "src.mp4"
+    writer = cv2.VideoWriter(str(src_path), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 48))
+    for i in range(8):
+        writer.write(np.full((48, 64, 3), (i * 20, 80, 120), dtype=np.uint8))
+    writer.release()
+
+    profiler = RenderProfiler()
+    render_vertical_with_captions(
+        src_path,
+        [(0.0, 0.8, "profiled")],
+        tmp_path / "out.mp4",
+        frame_width=90,
+        frame_height=160,
+        mux_audio=False,
+        backend="opencv",
+        thumbnails=False,
+        profiler=profiler,
+    )
+
+    summary = profiler.summary()
+    assert summary["frames"] == 8
+    for stage in ("decode", "background", "video", "captions", "write"):
+        assert summary["stages"][stage]["count"] >= 8
+    assert summary["stages"]["finalize"]["count"] == 1
+
+    metrics = tmp_path / "render_metrics.jsonl"
+    append_render_metrics(metrics, {"clip": "a", **summary})
+    append_render_metrics(metrics, {"clip": "b", **summary})
+    assert [record["clip"] for record in load_render_metrics(metrics)] == ["a", "b"]
+
+
+def test_pipeline_render_writes_metrics_without_observer(tmp_path: Path) -> None:
+    from threading import Lock
+
+    from helpers.logging import run_step
+    from pipeline import _run_profiled_render
+
+    def run_pipeline_step(title, func, *, step_key, completed_data=None):
+        return run_step(title, func, step_id=step_key, observer=None, completed_data=completed_data)
+
+    profiler = RenderProfiler()
+    output = tmp_path / "short.mp4"
+    metrics = tmp_path / "render_metrics.jsonl"
+
+    result = _run_profiled_render(
+        run_pipeline_step,
+        "Render",
+        lambda: output,
+        step_key="step_7_render_1",
+        profiler=profiler,
+        metrics_path=metrics,
+        record={"clip": "clip-1", "proxy": False},
+        lock=Lock(),
+    )
+
+    assert result == output
+    [record] = load_render_metrics(metrics)
+    assert (record["clip"], record["step"], record["proxy"]) == ("clip-1", "step_7_render_1", False)
+    assert "wall_seconds" in record
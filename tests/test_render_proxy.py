@@ -0,0 +1,59 @@
+import json
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.render import (
+    RENDER_STATE_SUFFIX,
+    is_proxy_render,
+    promote_proxy_render,
+    render_vertical_with_captions,
+)
+
+
+def _frame_size(path: Path) -> tuple[int, int]:
+    cap = cv2.VideoCapture(str(path))
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    cap.release()
+    return size
+
+
+def test_proxy_render_can_be_promoted(tmp_path: Path) -> None:
+    src_path = tmp_path / "src.mp4"
+    writer = cv2.VideoWriter(str(src_path), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 64))
+    for _ in range(10):
+        writer.write(np.random.randint(0, 256, (64, 64, 3), dtype=np.uint8))
+    writer.release()
+    srt_path = tmp_path / "clip.srt"
+    srt_path.write_text("1\n00:00:00,000 --> 00:00:00,800\nhello proxy\n", encoding="utf-8")
+
+    out_path = tmp_path / "short.mp4"
+    render_vertical_with_captions(
+        src_path,
+        srt_path,
+        out_path,
+        frame_width=180,
+        frame_height=320,
+        mux_audio=False,
+        source_start=0.2,
+        proxy=True,
+    )
+
+    assert _frame_size(out_path) == (60, 106)
+    assert is_proxy_render(out_path)
+    state = json.loads(out_path.with_suffix(RENDER_STATE_SUFFIX).read_text(encoding="utf-8"))
+    assert state["captions"] == str(srt_path)
+    assert state["source_start"] == 0.2
+
+    promote_proxy_render(out_path)
+
+    assert _frame_size(out_path) == (180, 320)
+    assert not is_proxy_render(out_path)
+    assert not out_path.with_suffix(RENDER_STATE_SUFFIX).exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clip.srt", "short.mp4", "src.mp4"]
@@ -0,0 +1,88 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.rendering.stages import run_render_stages
+
+
+def _reader(count: int):
+    produced = []
+
+    def read(buffer):
+        if len(produced) >= count:
+            return None
+        frame = buffer if buffer is not None else np.zeros((2, 2, 3), dtype=np.uint8)
+        frame[:] = len(produced) % 256
+        produced.append(len(produced))
+        return frame
+
+    return read, produced
+
+
+def test_stages_preserve_order_and_recycle_buffers():
+    read, produced = _reader(50)
+    seen_buffers = set()
+    written = []
+
+    def compose(index, frame):
+        seen_buffers.add(id(frame))
+        return np.full((1,), frame[0, 0, 0] + index, dtype=np.int64)
+
+    count = run_render_stages(read, compose, lambda canvas: written.append(int(canvas[0])), queue_size=2)
+
+    assert count == 50
+    assert written == [2 * i for i in range(50)]
+    # Decode buffers come from a small recycled ring
+    assert len(seen_buffers) <= 4
+
+
+def test_slow_writer_applies_backpressure():
+    read, produced = _reader(40)
+    written = []
+    max_ahead = 0
+
+    def write(canvas):
+        nonlocal max_ahead
+        time.sleep(0.001)
+        max_ahead = max(max_ahead, len(produced) - len(written))
+        written.append(canvas)
+
+    run_render_stages(read, lambda index, frame: frame, write, queue_size=3)
+
+    assert len(written) == 40
+    # reader slot + decode queue + compose + encode queue + writer
+    assert max_ahead <= 3 + 3 + 3
+
+
+@pytest.mark.parametrize("stage", ["read", "compose", "write"])
+def test_stage_errors_propagate(stage):
+    read, _ = _reader(1000)
+
+    def failing_read(buffer):
+        if stage == "read" and failing_read.calls == 5:
+            raise ValueError("read failed")
+        failing_read.calls += 1
+        return read(buffer)
+
+    failing_read.calls = 0
+
+    def compose(index, frame):
+        if stage == "compose" and index == 5:
+            raise ValueError("compose failed")
+        return frame
+
+    def write(canvas):
+        if stage == "write":
+            raise ValueError("write failed")
+
+    with pytest.raises(ValueError, match=f"{stage} failed"):
+        run_render_stages(failing_read, compose, write, queue_size=2)
+    assert not any(t.name.startswith("render-") for t in threading.enumerate())
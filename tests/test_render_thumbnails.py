@@ -0,0 +1,111 @@
+import json
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.render import render_vertical_with_captions
+from server.steps.rendering import load_sprite_index, thumbnail_paths
+
+
+def _write_source(path: Path, frames: int, fps: float = 10.0) -> None:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), (i * 10, 80, 200 - i * 5), dtype=np.uint8))
+    writer.release()
+
+
+def test_render_writes_poster_and_sprite_sheet(tmp_path: Path) -> None:
+    src_path = tmp_path / "src.mp4"
+    _write_source(src_path, 25)
+    output = tmp_path / "short.mp4"
+
+    render_vertical_with_captions(
+        src_path,
+        [(0.0, 2.5, "thumbs")],
+        output,
+        frame_width=90,
+        frame_height=160,
+        mux_audio=False,
+        backend="opencv",
+        thumbnails=True,
+    )
+
+    paths = thumbnail_paths(output)
+    index = load_sprite_index(output)
+    assert index is not None
+    assert index["poster"] == paths.poster.name
+    assert [tile["time"] for tile in index["tiles"]] == [0.0, 1.0, 2.0]
+    assert index["poster_time"] == 1.2
+    assert (index["tile_width"], index["tile_height"]) == (90, 160)
+
+    sheet = cv2.imread(str(paths.sprite))
+    assert sheet.shape == (index["rows"] * 160, index["columns"] * 90, 3)
+    poster = cv2.imread(str(paths.poster))
+    assert poster.shape == (160, 90, 3)
+
+
+def test_render_without_thumbnails_drops_stale_files(tmp_path: Path) -> None:
+    src_path = tmp_path / "src.mp4"
+    _write_source(src_path, 5)
+    output = tmp_path / "short.mp4"
+    for path in thumbnail_paths(output).all():
+        path.write_text(json.dumps({"version": 1}), encoding="utf-8")
+
+    render_vertical_with_captions(
+        src_path,
+        [(0.0, 0.5, "none")],
+        output,
+        frame_width=90,
+        frame_height=160,
+        mux_audio=False,
+        backend="opencv",
+        thumbnails=False,
+    )
+
+    assert load_sprite_index(output) is None
+    assert not any(path.exists() for path in thumbnail_paths(output).all())
+
+
+def test_full_range_preview_is_served_from_the_render(monkeypatch, tmp_path: Path) -> None:
+    import server.app
+
+    src_path = tmp_path / "src.mp4"
+    _write_source(src_path, 25)
+    output = tmp_path / "shorts" / "short.mp4"
+    output.parent.mkdir()
+    render_vertical_with_captions(
+        src_path,
+        [(0.0, 2.5, "preview")],
+        output,
+        frame_width=90,
+        frame_height=160,
+        mux_audio=False,
+        backend="opencv",
+        thumbnails=True,
+    )
+
+    cuts = []
+
+    def fake_save_clip(source, target, *, start, end, **_):
+        cuts.append((start, end))
+        Path(target).write_bytes(b"cut")
+        return True
+
+    monkeypatch.setattr(server.app, "save_clip", fake_save_clip)
+
+    full = server.app._generate_preview_clip(
+        project_dir=tmp_path, short_path=output, start_offset=0.0, end_offset=2.5
+    )
+    assert full == output.resolve()
+    assert cuts == []
+
+    server.app._generate_preview_clip(
+        project_dir=tmp_path, short_path=output, start_offset=0.5, end_offset=2.0
+    )
+    assert cuts == [(0.5, 2.0)]
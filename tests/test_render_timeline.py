@@ -0,0 +1,80 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.rendering.timeline import (
+    CaptionEntry,
+    CaptionTimeline,
+    CaptionWord,
+    assign_words_to_entries,
+    ensure_entry_words,
+)
+
+
+def _naive_lookup(entries, t, tol):
+    for idx, entry in enumerate(entries):
+        if (entry.start - tol) <= t <= (entry.end + tol):
+            words = [w for w in ensure_entry_words(entry) if w.text]
+            highlight = None
+            for w_idx, word in enumerate(words):
+                if (word.start - tol) <= t <= (word.end + tol):
+                    highlight = w_idx
+                    break
+            if highlight is None and words:
+                highlight = 0 if t < words[0].start else len(words) - 1
+            return idx, [w.text for w in words], highlight
+    return None
+
+
+def _random_captions(seed: int):
+    rng = random.Random(seed)
+    words = []
+    t = 0.0
+    for i in range(400):
+        t += rng.uniform(0.0, 0.4)
+        words.append(CaptionWord(start=t, end=t + rng.uniform(0.05, 0.6), text=f"w{i}"))
+    entries = []
+    t = 0.0
+    while t < words[-1].end:
+        start = t + rng.uniform(-0.2, 0.5)
+        end = start + rng.uniform(0.3, 3.0)
+        entries.append(CaptionEntry(start=start, end=end, text="fallback text here", words=[]))
+        t = end
+    entries.sort(key=lambda e: e.start)
+    return entries, words
+
+
+def test_assign_words_matches_overlap_filter():
+    entries, words = _random_captions(1)
+    assign_words_to_entries(entries, words)
+    for entry in entries:
+        expected = [w.text for w in words if not (w.end <= entry.start or w.start >= entry.end)]
+        assert [w.text for w in entry.words] == expected
+
+
+def test_timeline_matches_linear_scan_for_forward_playback():
+    entries, words = _random_captions(2)
+    assign_words_to_entries(entries, words)
+    timeline = CaptionTimeline(entries, tolerance=1 / 60)
+    step = 1 / 30
+    for frame in range(int(entries[-1].end / step) + 30):
+        t = (frame + 0.5) * step
+        assert timeline.lookup(t) == _naive_lookup(entries, t, 1 / 60), t
+
+
+def test_timeline_handles_seeking_backwards_and_empty_entries():
+    entries = [
+        CaptionEntry(start=0.0, end=1.0, text="one two", words=[]),
+        CaptionEntry(start=2.0, end=3.0, text="   ", words=[]),
+    ]
+    timeline = CaptionTimeline(entries)
+
+    assert timeline.lookup(0.9) == (0, ["one", "two"], 1)
+    assert timeline.lookup(0.1) == (0, ["one", "two"], 0)
+    assert timeline.lookup(1.5) is None
+    assert timeline.lookup(2.5) == (1, [], None)
+    assert CaptionTimeline([]).lookup(1.0) is None
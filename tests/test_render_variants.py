@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.render import RenderVariant, render_vertical_with_captions, render_variants_with_captions
+
+
+def _read_frames(path: Path) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_variants_match_separate_renders(tmp_path: Path) -> None:
+    src_path = tmp_path / "src.mp4"
+    writer = cv2.VideoWriter(str(src_path), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 48))
+    for i in range(12):
+        writer.write(np.full((48, 64, 3), (i * 20, 80, 200 - i * 10), dtype=np.uint8))
+    writer.release()
+    captions = [(0.0, 0.6, "one pass"), (0.6, 1.2, "many outputs")]
+
+    sizes = [(90, 160), (120, 120), (160, 90)]
+    outputs = render_variants_with_captions(
+        src_path,
+        captions,
+        [RenderVariant(tmp_path / f"out_{w}x{h}.mp4", frame_width=w, frame_height=h) for w, h in sizes],
+        mux_audio=False,
+    )
+
+    assert outputs == [tmp_path / f"out_{w}x{h}.mp4" for w, h in sizes]
+    for (w, h), output in zip(sizes, outputs):
+        single = render_vertical_with_captions(
+            src_path,
+            captions,
+            tmp_path / f"single_{w}x{h}.mp4",
+            frame_width=w,
+            frame_height=h,
+            mux_audio=False,
+            backend="opencv",
+        )
+        frames = _read_frames(output)
+        expected = _read_frames(single)
+        assert len(frames) == len(expected) == 12
+        assert frames[0].shape == (h, w, 3)
+        assert all(np.array_equal(a, b) for a, b in zip(frames, expected))
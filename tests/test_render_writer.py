@@ -0,0 +1,67 @@
+import shutil
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.rendering.writer import FFmpegPipeWriter, open_ffmpeg_writer
+
+
+def test_pipe_writer_command_muxes_audio_in_single_pass(tmp_path: Path) -> None:
+    writer = FFmpegPipeWriter.__new__(FFmpegPipeWriter)
+    writer.output_path = tmp_path / "out.mp4"
+    writer.fps = 30.0
+    writer.size = (160, 280)
+    writer.audio_source = tmp_path / "clip.mp4"
+    writer.audio_start = None
+    writer.audio_duration = None
+    writer.ffmpeg_bin = "ffmpeg"
+
+    cmd = writer.build_command()
+
+    assert cmd[cmd.index("-f") + 1] == "rawvideo"
+    assert cmd[cmd.index("-s") + 1] == "160x280"
+    assert cmd.count("-i") == 2
+    assert "1:a:0?" in cmd
+    assert cmd.count("-c:v") == 1
+    assert cmd[-1] == str(tmp_path / "out.mp4")
+
+
+def test_pipe_writer_command_seeks_audio_range(tmp_path: Path) -> None:
+    writer = FFmpegPipeWriter.__new__(FFmpegPipeWriter)
+    writer.output_path = tmp_path / "out.mp4"
+    writer.fps = 30.0
+    writer.size = (160, 280)
+    writer.audio_source = tmp_path / "source.mp4"
+    writer.audio_start = 12.5
+    writer.audio_duration = 30.0
+    writer.ffmpeg_bin = "ffmpeg"
+
+    cmd = writer.build_command()
+
+    audio_input = cmd.index(str(tmp_path / "source.mp4"))
+    assert cmd[audio_input - 5:audio_input] == ["-ss", "12.500", "-t", "30.000", "-i"]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_pipe_writer_encodes_all_frames(tmp_path: Path) -> None:
+    out_path = tmp_path / "out.mp4"
+    writer = open_ffmpeg_writer(out_path, 12.0, (64, 48))
+    assert writer is not None
+    for value in range(6):
+        writer.write(np.full((48, 64, 3), value * 40, dtype=np.uint8))
+    writer.release()
+
+    cap = cv2.VideoCapture(str(out_path))
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+
+    assert frames == 6
+    assert abs(fps - 12.0) < 0.1
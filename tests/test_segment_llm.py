@@ -77,7 +77,7 @@ def test_refine_segments_ping_accepts_non_json(monkeypatch) -> None:
 
     calls = {"ping": 0}
 
-    def fake_ping(model, prompt, options=None, timeout=None):
+    def fake_ping(model, prompt, options=None, timeout=None, cache=True):
         calls["ping"] += 1
         return "not json"
 
@@ -12,6 +12,8 @@ sys.path.insert(0, str(ROOT / "server"))
 
 from server.steps.silence import (
     detect_silences,
+    detect_silences_ffmpeg,
+    detect_silences_multi,
     snap_start_to_silence,
     snap_end_to_silence,
 )
@@ -57,6 +59,47 @@ def test_detect_silences(tmp_path: Path) -> None:
     assert any(0.9 < s < 1.1 and 1.3 < e < 1.6 for s, e in silences)
 
 
+def _make_pcm(path: Path) -> None:
+    """Tones and noise of varying level and length as a raw PCM cache."""
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    parts = []
+    for _ in range(60):
+        n = int(rng.uniform(0.02, 1.5) * 16000)
+        if rng.random() < 0.5:
+            t = np.arange(n) / 16000
+            parts.append(np.sin(2 * np.pi * rng.uniform(100, 900) * t) * rng.uniform(0.05, 0.8))
+        else:
+            parts.append(rng.normal(0, rng.choice([0.001, 0.005, 0.02]), n))
+    (np.clip(np.concatenate(parts), -1, 1) * 32767).astype("<i2").tofile(path)
+
+
+@pytest.mark.parametrize("noise,min_duration", [("-30dB", 0.075), ("-40dB", 0.3), ("0.01", 0.5)])
+def test_detect_silences_matches_ffmpeg(tmp_path: Path, noise: str, min_duration: float) -> None:
+    audio = tmp_path / "test.pcm"
+    _make_pcm(audio)
+    native = detect_silences(audio, noise=noise, min_duration=min_duration)
+    reference = detect_silences_ffmpeg(audio, noise=noise, min_duration=min_duration)
+    assert native
+    assert len(native) == len(reference)
+    for (s, e), (rs, re) in zip(native, reference):
+        assert s == pytest.approx(rs, abs=1e-3)
+        assert e == pytest.approx(re, abs=1e-3)
+
+
+def test_detect_silences_multi_shares_one_pass(tmp_path: Path) -> None:
+    audio = tmp_path / "test.pcm"
+    _make_pcm(audio)
+    thresholds = [("-30dB", 0.075), ("-30dB", 0.3), ("-40dB", 0.3)]
+    results = detect_silences_multi(audio, thresholds)
+    for noise, min_duration in thresholds:
+        assert results[(noise, min_duration)] == detect_silences(
+            audio, noise=noise, min_duration=min_duration
+        )
+    assert len(results[("-30dB", 0.3)]) <= len(results[("-30dB", 0.075)])
+
+
 def test_snap_helpers() -> None:
     silences = [(0.0, 1.0), (5.0, 6.0)]
     # ``snap_start_to_silence`` should extend to the beginning of the previous
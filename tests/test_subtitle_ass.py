@@ -0,0 +1,84 @@
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.layouts import PixelRect
+from server.steps.rendering import CaptionEntry, CaptionWord
+from server.steps.subtitle import write_ass_subtitles
+
+
+def _write(tmp_path: Path, entries, **kwargs) -> str:
+    path = write_ass_subtitles(
+        entries,
+        tmp_path / "caps.ass",
+        width=1080,
+        height=1920,
+        caption_rect=PixelRect(100, 1400, 880, 300),
+        **kwargs,
+    )
+    return path.read_text(encoding="utf-8")
+
+
+def _dialogues(text: str):
+    return [line for line in text.splitlines() if line.startswith("Dialogue:")]
+
+
+def test_ass_style_uses_output_resolution_and_colors(tmp_path: Path) -> None:
+    text = _write(
+        tmp_path,
+        [CaptionEntry(1.0, 2.5, "hi {there}", words=[])],
+        fill_bgr=(255, 255, 255),
+        highlight_bgr=(85, 255, 127),
+        outline_bgr=(0, 0, 0),
+    )
+    assert "PlayResX: 1080" in text and "PlayResY: 1920" in text
+    assert re.search(r"^Style: Caption,DejaVu Sans,\d+,&H00FFFFFF,&H0055FF7F,&H00000000,", text, re.M)
+    (dialogue,) = _dialogues(text)
+    assert dialogue.startswith("Dialogue: 0,0:00:01.00,0:00:02.50,Caption,,0,0,0,,{\\an8\\pos(")
+    assert dialogue.endswith("(there)")
+
+
+def test_ass_highlights_one_word_at_a_time(tmp_path: Path) -> None:
+    words = [
+        CaptionWord(0.0, 0.5, "one"),
+        CaptionWord(0.5, 1.0, "two"),
+        CaptionWord(1.2, 2.0, "three"),
+    ]
+    text = _write(
+        tmp_path,
+        [CaptionEntry(0.0, 2.0, "one two three", words=words)],
+        fill_bgr=(255, 255, 255),
+        highlight_bgr=(0, 255, 0),
+    )
+    (dialogue,) = _dialogues(text)
+    blocks = re.findall(r"\{\\fsp0([^}]*)\}(\w+)", dialogue)
+    assert [word for _, word in blocks] == ["one", "two", "three"]
+    one, two, three = (tags for tags, _ in blocks)
+    assert one == "\\1c&H00FF00&\\t(500,500,\\1c&HFFFFFF&)\\t(1000,1000,\\1c&HFFFFFF&)"
+    assert "\\t(500,500,\\1c&H00FF00&)\\t(1000,1000,\\1c&HFFFFFF&)" in two
+    # Between words the last word stays highlighted, as in the OpenCV renderer
+    assert "\\t(1000,1000,\\1c&H00FF00&)" in three
+
+
+def test_ass_splits_long_entries_and_hides_overlaps(tmp_path: Path) -> None:
+    long_text = " ".join(f"word{i}" for i in range(30))
+    text = _write(
+        tmp_path,
+        [
+            CaptionEntry(0.0, 6.0, long_text, words=[]),
+            CaptionEntry(5.0, 8.0, "late entry", words=[]),
+        ],
+        max_lines=1,
+    )
+    dialogues = _dialogues(text)
+    assert len(dialogues) > 2
+    times = [tuple(line.split(",")[1:3]) for line in dialogues]
+    assert times[0][0] == "0:00:00.00"
+    assert dialogues[-1].endswith("entry")
+    # Only one caption is visible at a time, as in the OpenCV renderer
+    assert all(prev[1] <= cur[0] for prev, cur in zip(times, times[1:]))
+    assert times[-1][1] == "0:00:08.00"
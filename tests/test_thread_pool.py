@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+
+import pytest
+
+from server.common.thread_pool import imap_bounded, process_as_completed
+
+
+def test_process_as_completed_reports_out_of_order() -> None:
+    finished: list[int] = []
+
+    def _work(index: int, delay: float) -> int:
+        time.sleep(delay)
+        return index * 10
+
+    results = process_as_completed(
+        [0.2, 0.0, 0.1],
+        _work,
+        max_workers=3,
+        on_result=lambda index, _item, _result: finished.append(index),
+    )
+
+    assert results == [10, 20, 30]
+    assert finished == [2, 3, 1]
+
+
+def test_process_as_completed_cancels_pending_on_error() -> None:
+    started: list[int] = []
+    lock = threading.Lock()
+
+    def _work(index: int, item: str) -> str:
+        with lock:
+            started.append(index)
+        if index == 1:
+            raise RuntimeError("boom")
+        time.sleep(0.05)
+        return item
+
+    with pytest.raises(RuntimeError):
+        process_as_completed(list("abcdef"), _work, max_workers=1)
+
+    assert started == [1]
+
+
+def test_process_as_completed_propagates_context() -> None:
+    marker: ContextVar[str | None] = ContextVar("marker", default=None)
+    marker.set("pipeline")
+
+    results = process_as_completed([1, 2], lambda _i, _item: marker.get(), max_workers=2)
+
+    assert results == ["pipeline", "pipeline"]
+
+
+def test_imap_bounded_yields_in_order_with_overlap() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _work(index: int, delay: float) -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(delay)
+        with lock:
+            active -= 1
+        return index
+
+    delays = [0.05, 0.0, 0.03, 0.0, 0.02, 0.0]
+    results = [(i, r) for i, _item, r in imap_bounded(iter(delays), _work, max_workers=3)]
+
+    assert results == [(i, i) for i in range(1, 7)]
+    assert 1 < peak <= 3
+
+
+def test_imap_bounded_pulls_items_lazily() -> None:
+    pulled: list[int] = []
+
+    def _source():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    stream = imap_bounded(_source(), lambda _i, n: n, max_workers=2)
+    assert next(stream)[2] == 0
+    assert len(pulled) <= 4
+    stream.close()
@@ -0,0 +1,80 @@
+"""The snapping helpers give the same answers for lists and TimelineIndex."""
+
+from pathlib import Path
+import random
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.candidates.helpers import (
+    _extend_to_quote_end,
+    _snap_end_to_segment_end,
+    _snap_end_to_sentence_end,
+    _snap_start_to_segment_start,
+    _snap_start_to_sentence_start,
+    snap_end_to_dialog_end,
+    snap_start_to_dialog_start,
+    snap_to_silence,
+    snap_to_word_boundaries,
+)
+from server.steps.silence import snap_end_to_silence, snap_start_to_silence
+from server.steps.timeline_index import TimelineIndex
+
+
+def _intervals(rng: random.Random, count: int, *, overlap: bool = False):
+    t = 0.0
+    out = []
+    for _ in range(count):
+        t += rng.uniform(0.0, 2.0)
+        length = rng.uniform(0.1, 6.0 if overlap else 1.5)
+        out.append((round(t, 2), round(t + length, 2)))
+        if not overlap:
+            t += length
+    return out
+
+
+def test_index_queries_match_linear_scans() -> None:
+    rng = random.Random(3)
+    silences = _intervals(rng, 300)
+    dialog = _intervals(rng, 200, overlap=True)
+    texts = ["ok", "and then", "So.", "ha"]
+    items = [(s, e, rng.choice(texts)) for s, e in _intervals(rng, 400)]
+    words = [{"start": s, "end": e, "text": "w"} for s, e in _intervals(rng, 800)]
+    indexes = {
+        "silences": TimelineIndex(silences),
+        "dialog": TimelineIndex(dialog),
+        "items": TimelineIndex(items),
+        "words": TimelineIndex(words),
+    }
+    horizon = max(e for _, e in silences + dialog)
+    for _ in range(500):
+        t = rng.uniform(-1.0, horizon + 1.0)
+        u = t + rng.uniform(0.0, 40.0)
+        assert snap_start_to_silence(t, indexes["silences"]) == snap_start_to_silence(t, silences)
+        assert snap_end_to_silence(t, indexes["silences"]) == snap_end_to_silence(t, silences)
+        assert snap_to_silence(t, u, indexes["silences"]) == snap_to_silence(t, u, silences)
+        assert snap_start_to_dialog_start(t, indexes["dialog"]) == snap_start_to_dialog_start(t, dialog)
+        assert snap_end_to_dialog_end(t, indexes["dialog"]) == snap_end_to_dialog_end(t, dialog)
+        assert _snap_start_to_segment_start(t, indexes["items"]) == _snap_start_to_segment_start(t, items)
+        assert _snap_end_to_segment_end(t, indexes["items"], max_extension=10.0) == _snap_end_to_segment_end(
+            t, items, max_extension=10.0
+        )
+        assert _snap_start_to_sentence_start(t, indexes["items"]) == _snap_start_to_sentence_start(t, items)
+        assert _snap_end_to_sentence_end(t, indexes["items"]) == _snap_end_to_sentence_end(t, items)
+        assert _extend_to_quote_end(t, "ha", indexes["items"]) == _extend_to_quote_end(t, "ha", items)
+        assert snap_to_word_boundaries(t, u, indexes["words"]) == snap_to_word_boundaries(t, u, words)
+
+
+def test_index_sorts_and_handles_empty_input() -> None:
+    index = TimelineIndex([(5.0, 6.0), (1.0, 2.0)])
+    assert index.items == [(1.0, 2.0), (5.0, 6.0)]
+    assert index.previous_start(5.5) == 5.0
+    assert index.next_end(2.5) == 6.0
+    assert index.containing(3.0) is None
+    empty = TimelineIndex([])
+    assert not empty
+    assert empty.containing(1.0) is None
+    assert snap_start_to_silence(1.0, empty) == 1.0
+    assert snap_end_to_silence(1.0, empty) == 1.0
@@ -73,3 +73,148 @@ def test_write_transcript_normalizes_quotes(tmp_path):
     assert json_data["segments"][0]["text"] == "It's fine"
     assert json_data["segments"][0]["words"] == []
 
+
+
+def test_transcript_writer_appends_incrementally(tmp_path):
+    from server.helpers.transcript import TranscriptWriter, write_transcript_txt
+
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": "Hello "},
+        {"start": 1.0, "end": 2.5, "text": "world!"},
+    ]
+    out = tmp_path / "stream.txt"
+    writer = TranscriptWriter(out)
+    writer.append(segments[0])
+    assert out.read_text(encoding="utf-8") == "[0.00 -> 1.00] Hello\n"
+    writer.append(segments[1])
+    writer.close({"start_time": 1.0, "stop_time": 2.0, "total_time": 1.0})
+
+    expected = tmp_path / "batch.txt"
+    write_transcript_txt(
+        {"segments": segments, "timing": {"start_time": 1.0, "stop_time": 2.0, "total_time": 1.0}},
+        str(expected),
+    )
+    assert out.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+    assert out.with_suffix(".json").read_text(encoding="utf-8") == expected.with_suffix(
+        ".json"
+    ).read_text(encoding="utf-8")
+
+
+def test_transcribe_audio_reports_segments_as_they_finish():
+    seen = []
+    result = transcribe.transcribe_audio("dummy", model_size="fake", on_segment=seen.append)
+    assert seen == result["segments"]
+
+
+def test_transcript_stream_wakes_consumers():
+    import threading
+    from server.helpers.transcript import TranscriptStream
+
+    stream = TranscriptStream()
+    collected = []
+    consumer = threading.Thread(target=lambda: collected.extend(seg["text"] for seg in stream))
+    consumer.start()
+
+    stream.publish({"start": 0.0, "end": 1.0, "text": "one"})
+    assert stream.wait_until(1.0, timeout=1)
+    assert not stream.wait_until(5.0, timeout=0.01)
+    stream.publish({"start": 1.0, "end": 5.0, "text": "two"})
+    assert stream.wait_until(5.0, timeout=1)
+    stream.close()
+    consumer.join(timeout=1)
+
+    assert collected == ["one", "two"]
+    assert stream.items == [(0.0, 1.0, "one"), (1.0, 5.0, "two")]
+    assert not stream.wait_until(10.0)
+
+
+
+def test_plan_shards_cuts_inside_nearby_silences():
+    from server.steps.transcribe_sharded import plan_shards
+
+    silences = [(95.0, 97.0), (230.0, 232.0), (310.0, 311.0)]
+    shards = plan_shards(400.0, silences, shard_seconds=100.0)
+
+    # Cuts near 100 and 300 move to silence midpoints; 200 has none nearby
+    assert shards == [(0.0, 96.0), (96.0, 200.0), (200.0, 310.5), (310.5, 400.0)]
+
+
+def test_plan_shards_uses_at_least_min_shards():
+    from server.steps.transcribe_sharded import plan_shards
+
+    assert len(plan_shards(100.0, [], shard_seconds=600.0, min_shards=4)) == 4
+    assert plan_shards(0.0, []) == []
+
+
+def test_transcribe_audio_falls_back_for_short_audio(monkeypatch):
+    from server.steps import transcribe_sharded
+
+    monkeypatch.setattr(transcribe_sharded, "probe_media_duration", lambda path: 30.0)
+    result = transcribe.transcribe_audio("dummy", model_size="fake", workers=4)
+
+    assert result["text"] == "Hello world!"
+
+
+def test_sharded_transcription_hands_its_silences_on(monkeypatch):
+    from server.steps import transcribe_sharded
+
+    monkeypatch.setattr(transcribe_sharded, "probe_media_duration", lambda path: 3600.0)
+    monkeypatch.setattr(transcribe_sharded, "detect_silences", lambda path: [(10.0, 11.0)])
+    # A single shard makes the caller transcribe in-process
+    monkeypatch.setattr(transcribe_sharded, "plan_shards", lambda *a, **k: [(0.0, 3600.0)])
+    found = []
+
+    result = transcribe.transcribe_audio("dummy", model_size="fake", workers=4, on_silences=found.append)
+
+    assert result["text"] == "Hello world!"
+    assert found == [[(10.0, 11.0)]]
+
+
+def test_plan_refine_ranges_widens_to_segments_and_merges():
+    from server.steps.transcribe_refine import plan_refine_ranges
+
+    segments = [
+        {"start": 0.0, "end": 4.0},
+        {"start": 4.0, "end": 9.0},
+        {"start": 9.0, "end": 15.0},
+        {"start": 40.0, "end": 48.0},
+    ]
+    ranges = plan_refine_ranges(segments, [(6.0, 8.0), (10.0, 12.0), (42.0, 44.0)], padding=1.0)
+    assert ranges == [(4.0, 15.0), (40.0, 48.0)]
+    assert plan_refine_ranges(segments, [(42.0, 44.0)], padding=1.0, done=[(40.0, 48.0)]) == []
+
+
+def test_splice_segments_replaces_overlapping_fast_segments():
+    from server.steps.transcribe_refine import splice_segments
+
+    fast = [
+        {"start": 0.0, "end": 4.0, "text": "a"},
+        {"start": 4.0, "end": 9.0, "text": "b"},
+        {"start": 9.0, "end": 15.0, "text": "c"},
+    ]
+    refined = [((4.0, 9.0), [{"start": 4.2, "end": 6.0, "text": "B1"}, {"start": 6.0, "end": 8.8, "text": "B2"}])]
+    assert [seg["text"] for seg in splice_segments(fast, refined)] == ["a", "B1", "B2", "c"]
+
+
+def test_refine_skips_transcripts_not_from_the_fast_pass(tmp_path):
+    from server.helpers.transcript import write_transcript_txt
+    from server.steps.transcribe_refine import refine_transcript_ranges
+
+    out = tmp_path / "t.txt"
+    write_transcript_txt({"segments": [{"start": 0.0, "end": 1.0, "text": "hi"}], "timing": {}}, str(out))
+    assert refine_transcript_ranges(out, tmp_path / "a.mp3", [(0.0, 1.0)]) == []
+
+
+def test_transcript_stream_wait_past_waits_for_later_starts():
+    from server.helpers.transcript import TranscriptStream
+
+    stream = TranscriptStream()
+    stream.publish({"start": 0.0, "end": 30.0, "text": "long"})
+    # Covered by the long segment, but a segment starting at 5 may still come
+    assert stream.wait_until(10.0, timeout=0.01)
+    assert not stream.wait_past(10.0, timeout=0.01)
+    stream.publish({"start": 5.0, "end": 6.0, "text": "inside"})
+    stream.publish({"start": 12.0, "end": 14.0, "text": "after"})
+    assert stream.wait_past(10.0, timeout=0.01)
+    stream.close()
+    assert not stream.wait_past(100.0)
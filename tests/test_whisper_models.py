@@ -0,0 +1,91 @@
+"""Tests for the shared Whisper model registry."""
+
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.helpers.whisper_models import WhisperModelRegistry
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(**kwargs):
+    loads = []
+
+    def loader(size, device, compute_type):
+        loads.append((size, device, compute_type))
+        return object()
+
+    kwargs.setdefault("idle_ttl", 0)
+    kwargs.setdefault("max_models", 0)
+    kwargs.setdefault("memory_cap_mb", 0)
+    return WhisperModelRegistry(loader=loader, **kwargs), loads
+
+
+def test_lease_reuses_loaded_model() -> None:
+    registry, loads = _registry()
+
+    with registry.lease("small", "cpu", "int8") as first:
+        pass
+    with registry.lease("small", "cpu", "int8") as second:
+        pass
+    with registry.lease("small", "cpu", "float32"):
+        pass
+
+    assert first is second
+    assert loads == [("small", "cpu", "int8"), ("small", "cpu", "float32")]
+
+
+def test_concurrent_leases_load_once() -> None:
+    registry, loads = _registry()
+    barrier = threading.Barrier(4)
+    models = []
+
+    def worker() -> None:
+        barrier.wait()
+        with registry.lease("base", "cpu", "int8") as model:
+            models.append(model)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len({id(model) for model in models}) == 1
+
+
+def test_idle_models_expire_but_warm_ones_stay() -> None:
+    clock = _Clock()
+    registry, _ = _registry(idle_ttl=60, clock=clock)
+    registry.warm("large", "cpu", "int8")
+    with registry.lease("small", "cpu", "int8"):
+        clock.now = 120
+        # Leased models are never evicted
+        assert registry.evict_idle() == 0
+
+    clock.now = 200
+    assert registry.evict_idle() == 1
+    assert registry.loaded() == [("large", "cpu", "int8")]
+
+
+def test_least_recently_used_model_is_evicted_over_cap() -> None:
+    clock = _Clock()
+    registry, _ = _registry(max_models=2, clock=clock)
+    for size in ("tiny", "base", "small"):
+        clock.now += 1
+        with registry.lease(size, "cpu", "int8"):
+            pass
+
+    assert registry.loaded() == [("base", "cpu", "int8"), ("small", "cpu", "int8")]
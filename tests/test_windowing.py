@@ -0,0 +1,157 @@
+"""TranscriptWindows gives the same windows and context as full scans."""
+
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "server"))
+
+from server.steps.candidates.windowing import TranscriptWindows
+
+
+def _items(rng: random.Random, count: int):
+    t = 0.0
+    out = []
+    for i in range(count):
+        t += rng.uniform(0.0, 3.0)
+        # Some segments run past the next ones
+        length = rng.uniform(0.2, 25.0 if i % 7 == 0 else 4.0)
+        out.append((round(t, 2), round(t + length, 2), f"line {i}"))
+    return out
+
+
+def _scan_windows(items, window, overlap):
+    windows = []
+    t = items[0][0]
+    while t < items[-1][1]:
+        win = [it for it in items if it[1] > t and it[0] < t + window]
+        if win:
+            windows.append((t, t + window, win))
+        t += window - overlap
+    return windows
+
+
+def test_windows_and_context_match_full_scans() -> None:
+    rng = random.Random(5)
+    items = _items(rng, 500)
+    timeline = TranscriptWindows(items)
+
+    assert list(timeline.windows(60.0, 15.0)) == _scan_windows(items, 60.0, 15.0)
+
+    for _ in range(200):
+        a = rng.uniform(-10.0, 800.0)
+        b = a + rng.uniform(0.0, 120.0)
+        expected = [it for it in items if it[1] > a and it[0] < b]
+        assert timeline.overlapping(a, b) == expected
+        assert timeline.text(a, b) == "\n".join(
+            f"[{s:.2f}-{e:.2f}] {t}" for s, e, t in expected
+        )
+
+
+def test_sync_appends_only_new_items() -> None:
+    items = _items(random.Random(8), 50)
+    growing = items[:20]
+    timeline = TranscriptWindows()
+    timeline.sync(growing)
+    growing.extend(items[20:])
+    timeline.sync(growing)
+
+    assert timeline.items == items
+    assert timeline.text(0.0, 1e9) == TranscriptWindows(items).text(0.0, 1e9)
+    assert list(TranscriptWindows().windows(60.0, 15.0)) == []
+
+
+def _publish_from_thread(items, *, duration=None):
+    import threading
+    import time
+
+    from server.helpers.transcript import TranscriptStream
+
+    stream = TranscriptStream(duration=duration)
+
+    def produce() -> None:
+        for i, (s, e, t) in enumerate(items):
+            stream.publish({"start": s, "end": e, "text": t})
+            if i % 50 == 0:
+                time.sleep(0.005)
+        stream.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    return stream, producer
+
+
+def test_stream_windows_match_window_items() -> None:
+    from server.steps.candidates.tone import _stream_windows, _window_items
+
+    items = _items(random.Random(11), 400)
+    stream, producer = _publish_from_thread(items)
+    timeline = TranscriptWindows()
+
+    streamed = list(_stream_windows(stream, window=60.0, overlap=15.0, context=9.0, timeline=timeline))
+    producer.join(timeout=5)
+
+    assert streamed == _window_items(items, 60.0, 15.0)
+    assert timeline.items == items
+
+
+def test_find_candidates_from_stream_matches_transcript_file(monkeypatch, tmp_path) -> None:
+    import threading
+
+    from server.steps.candidates import tone as tone_module
+
+    items = _items(random.Random(12), 300)
+    transcript = tmp_path / "t.txt"
+    transcript.write_text("".join(f"[{s:.2f} -> {e:.2f}] {t}\n" for s, e, t in items), encoding="utf-8")
+
+    lock = threading.Lock()
+    prompts: list[str] = []
+
+    def fake_llm(**kwargs):
+        with lock:
+            prompts.append(kwargs["prompt"])
+        return [{"start": 1.0, "end": 30.0, "rating": 9.0, "reason": "r", "quote": str(len(kwargs["prompt"]))}]
+
+    monkeypatch.setattr("server.steps.candidates.local_llm_call_json", fake_llm)
+    monkeypatch.setattr(tone_module, "_filter_promotional_candidates", lambda c, _i: c)
+    monkeypatch.setattr(tone_module, "_merge_adjacent_candidates", lambda c, *_, **__: c)
+    monkeypatch.setattr(tone_module, "chain_into_sweet_spot", lambda c: c)
+    monkeypatch.setattr(tone_module, "_enforce_non_overlap", lambda c, _i, strategy, **__: c)
+
+    _, _, from_file = tone_module.find_candidates_by_tone(
+        transcript, tone=tone_module.Tone.FUNNY, return_all_stages=True
+    )
+    file_prompts = sorted(prompts)
+    prompts.clear()
+
+    progress: list[tuple[int, int]] = []
+    stream, producer = _publish_from_thread(items, duration=items[-1][1])
+    _, _, from_stream = tone_module.find_candidates_by_tone(
+        tmp_path / "unused.txt",
+        tone=tone_module.Tone.FUNNY,
+        return_all_stages=True,
+        transcript_stream=stream,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+    producer.join(timeout=5)
+
+    assert sorted(prompts) == file_prompts
+    assert [c.quote for c in from_stream] == [c.quote for c in from_file]
+    assert progress[-1][0] == progress[-1][1] == len(file_prompts)
+
+
+def test_out_of_order_items_are_sorted() -> None:
+    items = _items(random.Random(9), 200)
+    shuffled = items[:]
+    random.Random(10).shuffle(shuffled)
+
+    assert list(TranscriptWindows(shuffled).windows(60.0, 15.0)) == _scan_windows(items, 60.0, 15.0)
+    assert TranscriptWindows(shuffled).text(0.0, 1e9) == TranscriptWindows(items).text(0.0, 1e9)
+
+    timeline = TranscriptWindows(items[:10])
+    with pytest.raises(ValueError):
+        timeline.extend([items[0]])